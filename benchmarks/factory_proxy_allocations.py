@@ -0,0 +1,66 @@
+"""
+Compares the generic `*args, **kwargs` factory proxy with the signature-specialized one.
+
+Run: python benchmarks/factory_proxy_allocations.py
+"""
+
+import tracemalloc
+from time import perf_counter
+from typing import Any, Callable, Tuple
+
+from galo_ioc import FactoryContainerImpl, add_factory, call_factory, get_factory
+
+CALL_COUNT = 200000
+
+
+class SumFactory:
+    def __call__(self, a: int, b: int, *, c: int) -> int:
+        raise NotImplementedError()
+
+
+class SumFactoryImpl(SumFactory):
+    def __call__(self, a: int, b: int, *, c: int) -> int:
+        return a + b + c
+
+
+def get_generic_factory(factory_type: Any) -> Any:
+    class Factory(factory_type):  # type: ignore
+        def __call__(self, *args: Any, **kwargs: Any) -> Any:
+            return call_factory(factory_type, None, args, kwargs)
+
+    return Factory()
+
+
+def measure(factory: Callable[..., int]) -> Tuple[float, int]:
+    tracemalloc.start()
+    factory(0, 0, c=0)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for i in range(CALL_COUNT):
+        factory(i, i, c=i)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = perf_counter()
+    for i in range(CALL_COUNT):
+        factory(i, i, c=i)
+    duration = perf_counter() - start
+    return duration, peak - current
+
+
+def main() -> None:
+    with FactoryContainerImpl():
+        add_factory(SumFactory, SumFactoryImpl())
+        for name, factory in [
+            ("generic", get_generic_factory(SumFactory)),
+            ("specialized", get_factory(SumFactory)),
+        ]:
+            duration, transient_memory = measure(factory)
+            print(
+                f"{name:>12}: {duration / CALL_COUNT * 1e9:6.0f} ns/call, "
+                f"peak transient memory {transient_memory} B"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Compares exact and subclass factory lookups in a container with subclass resolution enabled.
+
+Run: python benchmarks/subclass_resolution.py
+"""
+
+from timeit import timeit
+
+from galo_ioc import FactoryContainerImpl, add_factory, get_factory
+
+CALL_COUNT = 200000
+
+
+class NumberFactory:
+    def __call__(self) -> int:
+        raise NotImplementedError()
+
+
+class SpecificNumberFactory(NumberFactory):
+    def __call__(self) -> int:
+        raise NotImplementedError()
+
+
+class SpecificNumberFactoryImpl(SpecificNumberFactory):
+    def __call__(self) -> int:
+        return 1
+
+
+def main() -> None:
+    with FactoryContainerImpl(resolve_subclasses=True):
+        add_factory(SpecificNumberFactory, SpecificNumberFactoryImpl())
+        for name, factory in [
+            ("exact", get_factory(SpecificNumberFactory)),
+            ("subclass", get_factory(NumberFactory)),
+        ]:
+            duration = timeit(factory, number=CALL_COUNT)
+            print(f"{name:>8}: {duration / CALL_COUNT * 1e9:6.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import os
+from asyncio import FIRST_COMPLETED, Future, ensure_future, get_running_loop, wait
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+)
+
+from congratulations_app.congratulations_services import (
+    AsyncCongratulationsService,
+    AsyncCongratulationsServiceFactory,
+    CongratulationFailure,
+    CongratulationsService,
+    CongratulationsServiceFactory,
+)
+from congratulations_app.messengers import (
+    AsyncMessenger,
+    AsyncMessengerFactory,
+    Message,
+    Messenger,
+    MessengerFactory,
+)
+from galo_ioc import add_exit_callback, add_factory, get_factory
+
+__all__ = [
+    "run_in_executor",
+    "iterate_batches",
+    "ThreadPoolAsyncMessenger",
+    "ThreadPoolAsyncCongratulationsService",
+    "load",
+]
+
+
+async def run_in_executor(executor: Executor, function: Callable[..., Any], *args: Any) -> Any:
+    context = copy_context()
+    return await get_running_loop().run_in_executor(executor, partial(context.run, function, *args))
+
+
+async def iterate_batches(
+    items: Union[Iterable[str], AsyncIterable[str]],
+    batch_size: int,
+) -> AsyncIterator[List[str]]:
+    if isinstance(items, AsyncIterable):
+        batch: List[str] = []
+        async for item in items:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+        return
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+class ThreadPoolAsyncMessenger(AsyncMessenger):
+    def __init__(self, wrappee: Messenger, executor: Executor) -> None:
+        self.__wrappee = wrappee
+        self.__executor = executor
+
+    async def send_message(self, name: str, message: str) -> None:
+        await run_in_executor(self.__executor, self.__wrappee.send_message, name, message)
+
+    async def send_messages(self, messages: Sequence[Message]) -> List[Optional[Exception]]:
+        return await run_in_executor(self.__executor, self.__wrappee.send_messages, messages)
+
+
+class ThreadPoolAsyncCongratulationsService(AsyncCongratulationsService):
+    def __init__(
+        self,
+        wrappee: CongratulationsService,
+        executor: Executor,
+        batch_size: int = 100,
+        max_concurrency: int = 8,
+    ) -> None:
+        self.__wrappee = wrappee
+        self.__executor = executor
+        self.__batch_size = batch_size
+        self.__max_concurrency = max_concurrency
+
+    async def happy_birthday(self, name: str) -> None:
+        await run_in_executor(self.__executor, self.__wrappee.happy_birthday, name)
+
+    async def happy_birthday_many(
+        self,
+        names: Union[Iterable[str], AsyncIterable[str]],
+    ) -> List[CongratulationFailure]:
+        failures: List[CongratulationFailure] = []
+        pending: Set["Future[List[CongratulationFailure]]"] = set()
+        try:
+            async for batch in iterate_batches(names, self.__batch_size):
+                if len(pending) >= self.__max_concurrency:
+                    done, pending = await wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        failures.extend(future.result())
+                pending.add(ensure_future(self.__happy_birthday_batch(batch)))
+            for future in pending:
+                failures.extend(await future)
+        finally:
+            for future in pending:
+                future.cancel()
+        return failures
+
+    async def __happy_birthday_batch(self, names: List[str]) -> List[CongratulationFailure]:
+        try:
+            return await run_in_executor(self.__executor, self.__wrappee.happy_birthday_many, names)
+        except Exception as e:
+            return [CongratulationFailure(name, e) for name in names]
+
+
+def load() -> None:
+    class ThreadPoolAsyncMessengerFactory(AsyncMessengerFactory):
+        def __call__(self) -> AsyncMessenger:
+            return ThreadPoolAsyncMessenger(messenger_factory(), executor)
+
+    class ThreadPoolAsyncCongratulationsServiceFactory(AsyncCongratulationsServiceFactory):
+        def __call__(self) -> AsyncCongratulationsService:
+            return ThreadPoolAsyncCongratulationsService(
+                service_factory(), executor, batch_size, max_concurrency
+            )
+
+    max_workers = int(os.getenv("ASYNC_ADAPTERS_MAX_WORKERS", "8"))
+    batch_size = int(os.getenv("ASYNC_ADAPTERS_BATCH_SIZE", "100"))
+    max_concurrency = int(os.getenv("ASYNC_ADAPTERS_MAX_CONCURRENCY", str(max_workers)))
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="async-adapter")
+    messenger_factory = get_factory(MessengerFactory)
+    service_factory = get_factory(CongratulationsServiceFactory)
+    add_factory(AsyncMessengerFactory, ThreadPoolAsyncMessengerFactory())
+    add_factory(AsyncCongratulationsServiceFactory, ThreadPoolAsyncCongratulationsServiceFactory())
+    add_exit_callback(executor.shutdown)
@@ -1,14 +1,71 @@
+from itertools import islice
+from typing import AsyncIterable, Callable, Iterable, List, NamedTuple, Union
+
+from congratulations_app.messengers import Messenger
+
 __all__ = [
+    "CongratulationFailure",
+    "send_congratulations",
     "CongratulationsService",
     "CongratulationsServiceFactory",
+    "AsyncCongratulationsService",
+    "AsyncCongratulationsServiceFactory",
 ]
 
 
+class CongratulationFailure(NamedTuple):
+    name: str
+    exception: Exception
+
+
+def send_congratulations(
+    messenger: Messenger,
+    names: Iterable[str],
+    create_message: Callable[[str], str],
+    batch_size: int = 100,
+) -> List[CongratulationFailure]:
+    failures: List[CongratulationFailure] = []
+    iterator = iter(names)
+    while True:
+        messages = [(name, create_message(name)) for name in islice(iterator, batch_size)]
+        if not messages:
+            return failures
+        exceptions = messenger.send_messages(messages)
+        for (name, _), exception in zip(messages, exceptions):
+            if exception is not None:
+                failures.append(CongratulationFailure(name, exception))
+
+
 class CongratulationsService:
     def happy_birthday(self, name: str) -> None:
         raise NotImplementedError()
 
+    def happy_birthday_many(self, names: Iterable[str]) -> List[CongratulationFailure]:
+        failures: List[CongratulationFailure] = []
+        for name in names:
+            try:
+                self.happy_birthday(name)
+            except Exception as e:
+                failures.append(CongratulationFailure(name, e))
+        return failures
+
 
 class CongratulationsServiceFactory:
     def __call__(self) -> CongratulationsService:
         raise NotImplementedError()
+
+
+class AsyncCongratulationsService:
+    async def happy_birthday(self, name: str) -> None:
+        raise NotImplementedError()
+
+    async def happy_birthday_many(
+        self,
+        names: Union[Iterable[str], AsyncIterable[str]],
+    ) -> List[CongratulationFailure]:
+        raise NotImplementedError()
+
+
+class AsyncCongratulationsServiceFactory:
+    def __call__(self) -> AsyncCongratulationsService:
+        raise NotImplementedError()
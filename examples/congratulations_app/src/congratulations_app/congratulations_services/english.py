@@ -1,6 +1,10 @@
+from typing import Iterable, List
+
 from congratulations_app.congratulations_services import (
+    CongratulationFailure,
     CongratulationsService,
     CongratulationsServiceFactory,
+    send_congratulations,
 )
 from congratulations_app.messengers import Messenger, MessengerFactory
 from galo_ioc import add_factory, get_factory
@@ -18,6 +22,11 @@ class EnglishCongratulationsService(CongratulationsService):
     def happy_birthday(self, name: str) -> None:
         self.__messenger.send_message(name, f"Happy birthday, {name}!")
 
+    def happy_birthday_many(self, names: Iterable[str]) -> List[CongratulationFailure]:
+        return send_congratulations(
+            self.__messenger, names, lambda name: f"Happy birthday, {name}!"
+        )
+
 
 def load() -> None:
     class EnglishCongratulationsServiceFactory(CongratulationsServiceFactory):
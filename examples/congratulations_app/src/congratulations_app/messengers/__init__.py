@@ -1,14 +1,46 @@
+from typing import List, Optional, Sequence, Tuple
+
 __all__ = [
+    "Message",
     "Messenger",
     "MessengerFactory",
+    "AsyncMessenger",
+    "AsyncMessengerFactory",
 ]
 
 
+Message = Tuple[str, str]
+
+
 class Messenger:
     def send_message(self, name: str, message: str) -> None:
         raise NotImplementedError()
 
+    def send_messages(self, messages: Sequence[Message]) -> List[Optional[Exception]]:
+        results: List[Optional[Exception]] = []
+        for name, message in messages:
+            try:
+                self.send_message(name, message)
+            except Exception as e:
+                results.append(e)
+            else:
+                results.append(None)
+        return results
+
 
 class MessengerFactory:
     def __call__(self) -> Messenger:
         raise NotImplementedError()
+
+
+class AsyncMessenger:
+    async def send_message(self, name: str, message: str) -> None:
+        raise NotImplementedError()
+
+    async def send_messages(self, messages: Sequence[Message]) -> List[Optional[Exception]]:
+        raise NotImplementedError()
+
+
+class AsyncMessengerFactory:
+    def __call__(self) -> AsyncMessenger:
+        raise NotImplementedError()
@@ -0,0 +1,76 @@
+import os
+from threading import Lock
+from time import monotonic, sleep
+from typing import List, Optional, Sequence
+
+from congratulations_app.messengers import Message, Messenger, MessengerFactory
+from galo_ioc import Factory, FactoryType, add_factory_decorator
+
+__all__ = [
+    "TokenBucket",
+    "RateLimitedMessenger",
+    "load",
+]
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.__rate = rate
+        self.__capacity = capacity
+        self.__tokens = capacity
+        self.__updated_at = monotonic()
+        self.__lock = Lock()
+
+    def acquire(self, count: float = 1.0) -> None:
+        with self.__lock:
+            now = monotonic()
+            self.__tokens = min(
+                self.__capacity, self.__tokens + (now - self.__updated_at) * self.__rate
+            )
+            self.__updated_at = now
+            self.__tokens -= count
+            delay = -self.__tokens / self.__rate
+        if delay > 0.0:
+            sleep(delay)
+
+
+class RateLimitedMessenger(Messenger):
+    def __init__(self, wrappee: Messenger, token_bucket: TokenBucket) -> None:
+        self.__wrappee = wrappee
+        self.__token_bucket = token_bucket
+
+    def send_message(self, name: str, message: str) -> None:
+        self.__token_bucket.acquire()
+        self.__wrappee.send_message(name, message)
+
+    def send_messages(self, messages: Sequence[Message]) -> List[Optional[Exception]]:
+        self.__token_bucket.acquire(len(messages))
+        return self.__wrappee.send_messages(messages)
+
+
+def load() -> None:
+    def factory_decorator(
+        factory_type: FactoryType,
+        id: Optional[str],
+        factory: Factory,
+    ) -> Factory:
+        if not issubclass(factory_type, MessengerFactory):
+            return factory
+
+        suffix = "" if id is None else f"_{id.upper()}"
+        rate = float(os.getenv(f"MESSENGER_RATE_LIMIT{suffix}", default_rate))
+        capacity = float(os.getenv(f"MESSENGER_RATE_LIMIT_BURST{suffix}", str(rate)))
+        if rate <= 0.0:
+            raise ValueError(f"Invalid messenger rate limit: id={id!r}, rate={rate!r}.")
+        if capacity < 1.0:
+            raise ValueError(f"Invalid messenger burst size: id={id!r}, capacity={capacity!r}.")
+        token_bucket = TokenBucket(rate, capacity)
+
+        class RateLimitedMessengerFactory(MessengerFactory):
+            def __call__(self) -> Messenger:
+                return RateLimitedMessenger(factory(), token_bucket)
+
+        return RateLimitedMessengerFactory()
+
+    default_rate = os.getenv("MESSENGER_RATE_LIMIT", "100")
+    add_factory_decorator(factory_decorator)
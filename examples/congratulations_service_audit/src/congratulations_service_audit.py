@@ -1,7 +1,15 @@
+import atexit
+import logging
+import os
 from logging import Logger
-from typing import Dict, Optional
+from queue import Empty, Full, Queue
+from threading import Lock, Thread
+from time import monotonic, time
+from typing import Iterable, Iterator, List, Optional, Tuple
+from weakref import ReferenceType, WeakKeyDictionary, ref
 
 from congratulations_app.congratulations_services import (
+    CongratulationFailure,
     CongratulationsService,
     CongratulationsServiceFactory,
 )
@@ -9,19 +17,116 @@ from galo_ioc import Factory, FactoryType, add_factory_decorator, get_factory
 from loggers import LoggerFactory
 
 __all__ = [
+    "AuditWriter",
     "load",
 ]
 
 
+AuditRecord = Tuple[float, str]
+
+
+class AuditWriter:
+    def __init__(
+        self,
+        logger: Logger,
+        max_queue_size: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        enqueue_timeout: float = 0.0,
+    ) -> None:
+        self.__logger = logger
+        self.__batch_size = batch_size
+        self.__flush_interval = flush_interval
+        self.__enqueue_timeout = enqueue_timeout
+        self.__queue: "Queue[Optional[AuditRecord]]" = Queue(max_queue_size)
+        self.__lock = Lock()
+        self.__written_count = 0
+        self.__dropped_count = 0
+        self.__thread = Thread(target=self.__run, name="audit-writer", daemon=True)
+        self.__thread.start()
+
+    @property
+    def written_count(self) -> int:
+        return self.__written_count
+
+    @property
+    def dropped_count(self) -> int:
+        return self.__dropped_count
+
+    def write(self, message: str) -> None:
+        if not self.__logger.isEnabledFor(logging.DEBUG):
+            return
+        try:
+            if self.__enqueue_timeout > 0.0:
+                self.__queue.put((time(), message), timeout=self.__enqueue_timeout)
+            else:
+                self.__queue.put_nowait((time(), message))
+        except Full:
+            with self.__lock:
+                self.__dropped_count += 1
+
+    def close(self) -> None:
+        if not self.__thread.is_alive():
+            return
+        self.__queue.put(None)
+        self.__thread.join()
+
+    def __run(self) -> None:
+        batch: List[AuditRecord] = []
+        deadline = monotonic() + self.__flush_interval
+        while True:
+            timeout = deadline - monotonic()
+            if timeout > 0.0:
+                try:
+                    record = self.__queue.get(timeout=timeout)
+                except Empty:
+                    pass
+                else:
+                    if record is None:
+                        self.__flush(batch)
+                        return
+                    batch.append(record)
+                    if len(batch) < self.__batch_size:
+                        continue
+            self.__flush(batch)
+            batch = []
+            deadline = monotonic() + self.__flush_interval
+
+    def __flush(self, batch: List[AuditRecord]) -> None:
+        for created, message in batch:
+            record = self.__logger.makeRecord(
+                self.__logger.name,
+                logging.DEBUG,
+                __file__,
+                0,
+                message,
+                (),
+                None,
+                "happy_birthday",
+            )
+            record.created = created
+            record.msecs = (created - int(created)) * 1000
+            self.__logger.handle(record)
+        self.__written_count += len(batch)
+
+
 class CongratulationsServiceWrapper(CongratulationsService):
-    def __init__(self, wrappee: CongratulationsService, logger: Logger) -> None:
+    def __init__(self, wrappee: CongratulationsService, audit_writer: AuditWriter) -> None:
         self.__wrappee = wrappee
-        self.__logger = logger
+        self.__audit_writer = audit_writer
 
     def happy_birthday(self, name: str) -> None:
-        self.__logger.debug(f"name={name!r}")
+        self.__audit_writer.write(f"name={name!r}")
         return self.__wrappee.happy_birthday(name)
 
+    def happy_birthday_many(self, names: Iterable[str]) -> List[CongratulationFailure]:
+        return self.__wrappee.happy_birthday_many(self.__audit_names(names))
+
+    def __audit_names(self, names: Iterable[str]) -> Iterator[str]:
+        for name in names:
+            self.__audit_writer.write(f"name={name!r}")
+            yield name
+
 
 def load() -> None:
     def factory_decorator(
@@ -35,15 +140,26 @@ def load() -> None:
         class CongratulationsServiceFactoryWrapper(CongratulationsServiceFactory):
             def __call__(self) -> CongratulationsService:
                 wrappee = factory()
-                try:
-                    return wrappers[wrappee]
-                except KeyError:
-                    wrappers[wrappee] = CongratulationsServiceWrapper(wrappee, logger)
-                    return wrappers[wrappee]
+                wrapper_ref = wrapper_refs.get(wrappee)
+                wrapper = None if wrapper_ref is None else wrapper_ref()
+                if wrapper is None:
+                    wrapper = CongratulationsServiceWrapper(wrappee, audit_writer)
+                    wrapper_refs[wrappee] = ref(wrapper)
+                return wrapper
 
-        wrappers: Dict[CongratulationsService, CongratulationsServiceWrapper] = {}
+        wrapper_refs: WeakKeyDictionary[
+            CongratulationsService, ReferenceType[CongratulationsServiceWrapper]
+        ] = WeakKeyDictionary()
         return CongratulationsServiceFactoryWrapper()
 
     logger_factory = get_factory(LoggerFactory)
     logger = logger_factory("congratulations_service_audit")
+    audit_writer = AuditWriter(
+        logger,
+        max_queue_size=int(os.getenv("AUDIT_MAX_QUEUE_SIZE", "10000")),
+        batch_size=int(os.getenv("AUDIT_BATCH_SIZE", "100")),
+        flush_interval=float(os.getenv("AUDIT_FLUSH_INTERVAL", "1")),
+        enqueue_timeout=float(os.getenv("AUDIT_ENQUEUE_TIMEOUT", "0")),
+    )
+    atexit.register(audit_writer.close)
     add_factory_decorator(factory_decorator)
@@ -0,0 +1,67 @@
+"""
+Simulates bursts of acquires against AdaptiveConnectionPool wrapping a fake pool.
+
+Run: python benchmarks/adaptive_connection_pool.py
+"""
+
+from asyncio import Semaphore, gather, run, sleep
+from contextlib import asynccontextmanager
+from statistics import quantiles
+from time import perf_counter
+from typing import AsyncIterator, List
+
+from fastapi_integration.databases.postgresql import ConnectionPoolSaturatedException
+from fastapi_integration.databases.postgresql.adaptive import AdaptiveConnectionPool
+
+MIN_SIZE = 4
+MAX_SIZE = 16
+QUERY_LATENCY = 0.005
+BURST_SIZES = [10, 100, 1000, 5000, 10, 10]
+
+
+class FakePool:
+    def __init__(self) -> None:
+        self.__semaphore = Semaphore(MAX_SIZE)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[object]:
+        async with self.__semaphore:
+            yield object()
+
+
+async def main() -> None:
+    connection_pool = AdaptiveConnectionPool(
+        FakePool(),
+        min_size=MIN_SIZE,
+        max_size=MAX_SIZE,
+        acquire_timeout=0.5,
+        max_waiter_count=2000,
+        shrink_interval=0.1,
+        grow_wait_time=0.002,
+    )
+
+    async def query(latencies: List[float]) -> None:
+        start = perf_counter()
+        try:
+            async with connection_pool.acquire():
+                await sleep(QUERY_LATENCY)
+        except ConnectionPoolSaturatedException:
+            return
+        latencies.append(perf_counter() - start)
+
+    for burst_size in BURST_SIZES:
+        latencies: List[float] = []
+        await gather(*(query(latencies) for _ in range(burst_size)))
+        saturation = connection_pool.get_saturation()
+        percentiles = quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+        print(
+            f"burst={burst_size}: served={len(latencies)}, "
+            f"p50={percentiles[49] * 1e3:.1f} ms, p99={percentiles[98] * 1e3:.1f} ms, "
+            f"limit={saturation.limit}, peak={saturation.peak_used_count}, "
+            f"shed={saturation.shed_count}, timeouts={saturation.timeout_count}"
+        )
+        await sleep(0.2)
+
+
+if __name__ == "__main__":
+    run(main())
@@ -0,0 +1,75 @@
+"""
+Measures group-committed writes and restart time of DurableInMemoryUserRepository.
+
+Run: python benchmarks/durable_user_repository.py
+"""
+
+from asyncio import gather, run
+from datetime import datetime, timedelta
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from uuid import uuid4
+
+from fastapi_integration.users.models import UserToCreate
+from fastapi_integration.users.repositories.durable import (
+    open_durable_user_repository,
+    write_snapshot,
+)
+from fastapi_integration.users.repositories.in_memory import UserRecord
+
+SNAPSHOT_USER_COUNT = 1_000_000
+LOG_USER_COUNT = 10_000
+CONCURRENCY = 1000
+
+
+async def main() -> None:
+    with TemporaryDirectory() as directory:
+        now = datetime.now()
+        records = [
+            UserRecord(
+                id=uuid4(),
+                created_at=now + timedelta(microseconds=i),
+                updated_at=now + timedelta(microseconds=i),
+                login=f"user-{i}",
+                password=f"$scrypt$16384$8$1${uuid4().hex}${uuid4().hex}{uuid4().hex}",
+                role="employee",
+            )
+            for i in range(SNAPSHOT_USER_COUNT)
+        ]
+        start = perf_counter()
+        write_snapshot(directory, 0, records)
+        print(f"snapshot of {SNAPSHOT_USER_COUNT} users written in {perf_counter() - start:.2f} s")
+        del records
+
+        for fsync in (False, True):
+            start = perf_counter()
+            repository = open_durable_user_repository(directory, fsync=fsync)
+            print(f"fsync={fsync}: restarted in {perf_counter() - start:.2f} s")
+            start = perf_counter()
+            for offset in range(0, LOG_USER_COUNT, CONCURRENCY):
+                await gather(
+                    *(
+                        repository.create(
+                            UserToCreate(
+                                login=f"new-user-{fsync}-{i}",
+                                password="password",
+                                role="employee",
+                            )
+                        )
+                        for i in range(offset, offset + CONCURRENCY)
+                    )
+                )
+            print(f"fsync={fsync}: {LOG_USER_COUNT / (perf_counter() - start):.0f} creates/s")
+
+        start = perf_counter()
+        for _ in range(LOG_USER_COUNT):
+            await repository.get_by_login("user-123456")
+        print(f"get_by_login: {(perf_counter() - start) / LOG_USER_COUNT * 1e6:.2f} us")
+
+        start = perf_counter()
+        await repository.close()
+        print(f"closed with a fresh snapshot in {perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    run(main())
@@ -0,0 +1,97 @@
+"""
+Measures memory per user and read throughput of InMemoryUserRepository against storing
+a PrivateUser per user and converting it on every read.
+
+Run: python benchmarks/in_memory_user_repository.py
+"""
+
+import tracemalloc
+from asyncio import run
+from datetime import datetime, timedelta
+from random import choice
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple, TypeVar
+from uuid import UUID, uuid4
+
+from fastapi_integration.users.models import PrivateUser, convert_private_user_to_user
+from fastapi_integration.users.repositories.in_memory import (
+    InMemoryUserRepository,
+    UserRecord,
+)
+
+USER_COUNT = 100_000
+READ_COUNT = 100_000
+ROLES = ["admin", "employee"]
+
+T = TypeVar("T")
+
+
+def measure_memory(create: Callable[[], T]) -> T:
+    tracemalloc.start()
+    result = create()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  memory per user: {size / USER_COUNT:.0f} B")
+    return result
+
+
+Row = Tuple[UUID, datetime, datetime, str, str, str]
+
+
+def create_rows() -> List[Row]:
+    now = datetime.now()
+    return [
+        (
+            uuid4(),
+            now + timedelta(microseconds=i),
+            now + timedelta(microseconds=i),
+            f"user-{i}",
+            f"$scrypt$16384$8$1${uuid4().hex}${uuid4().hex}",
+            choice(ROLES).encode().decode(),
+        )
+        for i in range(USER_COUNT)
+    ]
+
+
+def create_private_users(rows: List[Row]) -> Dict[UUID, PrivateUser]:
+    id_to_private_user = {}
+    login_to_private_user = {}
+    for id, created_at, updated_at, login, password, role in rows:
+        private_user = PrivateUser(
+            id=id,
+            created_at=created_at,
+            updated_at=updated_at,
+            login=login,
+            password=password,
+            role=role,
+        )
+        id_to_private_user[id] = login_to_private_user[login] = private_user
+    return id_to_private_user
+
+
+async def main() -> None:
+    print("PrivateUser per user, converted on every read:")
+    id_to_private_user = measure_memory(lambda: create_private_users(create_rows()))
+    ids = list(id_to_private_user)
+    ids = [choice(ids) for _ in range(READ_COUNT)]
+    start = perf_counter()
+    for id in ids:
+        convert_private_user_to_user(id_to_private_user[id])
+    print(f"  get_by_id: {READ_COUNT / (perf_counter() - start):.0f} reads/s")
+    del id_to_private_user
+
+    print("InMemoryUserRepository:")
+    repository = measure_memory(
+        lambda: InMemoryUserRepository(UserRecord(*row) for row in create_rows())
+    )
+    records = repository.get_records()
+    ids = [choice(records).id for _ in range(READ_COUNT)]
+    for name in ("cold", "warm"):
+        start = perf_counter()
+        for id in ids:
+            await repository.get_by_id(id)
+        print(f"  get_by_id ({name}): {READ_COUNT / (perf_counter() - start):.0f} reads/s")
+
+
+if __name__ == "__main__":
+    run(main())
@@ -0,0 +1,133 @@
+"""
+Compares throughput of the user endpoints with the standard and orjson JSON renderers.
+
+Run: python benchmarks/json_renderers.py
+"""
+
+from asyncio import Event, run
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from time import perf_counter
+from types import ModuleType
+from typing import Any, Awaitable, Callable, Dict, List
+from uuid import uuid4
+
+from fastapi import FastAPI
+from fastapi_integration.app import AppFactory
+from fastapi_integration.app import instance as app_instance
+from fastapi_integration.current_user_resolvers import CurrentUserResolverFactory
+from fastapi_integration.json_renderers import orjson as orjson_renderer
+from fastapi_integration.json_renderers import standard as standard_renderer
+from fastapi_integration.password_hashers.kdf import KdfPasswordHasher
+from fastapi_integration.users import routes as user_routes
+from fastapi_integration.users.models import User
+from fastapi_integration.users.repositories.in_memory import (
+    InMemoryUserRepository,
+    UserRecord,
+)
+from fastapi_integration.users.services import UserService, UserServiceFactory
+from fastapi_integration.users.services.impl import UserServiceImpl
+from galo_ioc import FactoryContainerImpl, add_factory, get_factory
+
+USER_COUNT = 10_000
+REQUEST_COUNT = 2000
+PAGE_SIZE = 1000
+
+
+async def request(app: FastAPI, path: str, query_string: bytes = b"") -> bytes:
+    async def receive() -> Dict[str, Any]:
+        if not requested:
+            requested.append(True)
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await completed.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message
+        elif message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                completed.set()
+
+    requested: List[bool] = []
+    completed = Event()
+    body: List[bytes] = []
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query_string,
+        "root_path": "",
+        "headers": [],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def measure(name: str, count: int, send_request: Callable[[], Awaitable[bytes]]) -> None:
+    start = perf_counter()
+    for _ in range(count):
+        await send_request()
+    print(f"  {name}: {count / (perf_counter() - start):.0f} requests/s")
+
+
+async def main() -> None:
+    now = datetime.now()
+    records = [
+        UserRecord(
+            id=uuid4(),
+            created_at=now + timedelta(microseconds=i),
+            updated_at=now + timedelta(microseconds=i),
+            login=f"user-{i}",
+            password="password",
+            role="employee",
+        )
+        for i in range(USER_COUNT)
+    ]
+    current_user = records[0].get_user()
+    executor = ThreadPoolExecutor(1)
+
+    async def resolve_current_user() -> User:
+        return current_user
+
+    class CurrentUserResolverFactoryImpl(CurrentUserResolverFactory):
+        def __call__(self) -> Callable[..., Awaitable[User]]:
+            return resolve_current_user
+
+    class UserServiceFactoryImpl(UserServiceFactory):
+        def __call__(self) -> UserService:
+            return service
+
+    service = UserServiceImpl(InMemoryUserRepository(records), KdfPasswordHasher(executor))
+    renderer_modules: List[ModuleType] = [standard_renderer, orjson_renderer]
+    for renderer_module in renderer_modules:
+        with FactoryContainerImpl():
+            app_instance.load()
+            add_factory(CurrentUserResolverFactory, CurrentUserResolverFactoryImpl())
+            add_factory(UserServiceFactory, UserServiceFactoryImpl())
+            renderer_module.load()
+            user_routes.load()
+            app = get_factory(AppFactory)()
+
+        print(f"{renderer_module.__name__}:")
+        path = f"/users/{records[1].id}"
+        await measure("GET /users/{id}", REQUEST_COUNT, lambda: request(app, path))
+        await measure("GET /whoami", REQUEST_COUNT, lambda: request(app, "/whoami"))
+        query_string = f"batch_size={PAGE_SIZE}".encode()
+        await measure(
+            f"GET /users ({USER_COUNT} users)",
+            REQUEST_COUNT // 100,
+            lambda: request(app, "/users", query_string),
+        )
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    run(main())
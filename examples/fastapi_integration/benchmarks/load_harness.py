@@ -0,0 +1,490 @@
+"""
+Boots fastapi_integration in-process with a module list, drives mixed traffic against it and
+reports RPS, latencies and the share of sampled time spent in each plugin.
+
+External services are replaced with local stand-ins: PostgreSQL with an in-memory statement
+executor and the Secret Corporation messenger with a silent one, both with configurable
+latency.
+
+Run: python benchmarks/load_harness.py --module-names-path module_names.txt --concurrency 50
+"""
+
+import os
+import sys
+import time
+from argparse import ArgumentParser, Namespace
+from asyncio import Event, Semaphore, gather, run, sleep
+from base64 import b64encode
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from importlib import import_module
+from inspect import isfunction
+from random import Random
+from statistics import quantiles
+from tempfile import TemporaryDirectory
+from threading import Event as ThreadEvent
+from threading import Thread, get_ident
+from time import perf_counter
+from types import CodeType, FrameType
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+from uuid import UUID, uuid4
+
+from asyncpg.exceptions import UniqueViolationError
+from congratulations_app.messengers import Messenger, MessengerFactory
+from congratulations_app.startup_utils import read_module_names
+from fastapi import FastAPI
+from fastapi_integration.app import AppFactory
+from fastapi_integration.databases.postgresql import (
+    ConnectionPoolFactory,
+    DatabaseMetrics,
+    DatabaseMetricsFactory,
+    StatementExecutor,
+    StatementExecutorFactory,
+)
+from fastapi_integration.databases.postgresql.impl import DatabaseMetricsImpl
+from fastapi_integration.users.repositories.in_memory import default_users
+from galo_ioc import FactoryContainerImpl, add_factory, get_factory
+
+Row = Dict[str, Any]
+Headers = List[Tuple[bytes, bytes]]
+Response = Tuple[int, bytes]
+
+DEFAULT_MIX = (
+    "login=5,whoami=30,get_user=25,create_user=10,update_user=10,delete_user=10,happy_birthday=10"
+)
+POSTGRESQL_MODULE_NAME = "fastapi_integration.databases.postgresql.impl"
+MESSENGER_MODULE_NAME = "secret_corporation_plugin.messengers.secret_corporation"
+STAND_INS = "stand-ins for external services"
+FRAMEWORK = "framework and load generator"
+IDLE = "idle"
+WAITING_MODULE_NAMES = {"queue", "selectors", "threading"}
+
+
+class StandInConnectionPool:
+    def __init__(self, size: int) -> None:
+        self.__semaphore = Semaphore(size)
+
+    def __await__(self) -> Any:
+        yield from sleep(0).__await__()
+        return self
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[object]:
+        async with self.__semaphore:
+            yield object()
+
+    async def close(self) -> None:
+        pass
+
+
+class StandInStatementExecutor(StatementExecutor):
+    def __init__(
+        self,
+        connection_pool_factory: ConnectionPoolFactory,
+        metrics: DatabaseMetricsImpl,
+        latency: float,
+    ) -> None:
+        self.__connection_pool_factory = connection_pool_factory
+        self.__metrics = metrics
+        self.__latency = latency
+        self.__id_to_row: Dict[UUID, Row] = {}
+        self.__login_to_row: Dict[str, Row] = {}
+        for user in default_users:
+            self.__insert(user.login, user.password, user.role)
+
+    def add_statement(self, name: str, query: str) -> None:
+        pass
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Any]:
+        start = perf_counter()
+        async with self.__connection_pool_factory().acquire() as connection:
+            self.__metrics.get_acquire_time().observe(perf_counter() - start)
+            yield connection
+
+    async def fetch(self, connection: Any, name: str, *args: Any) -> List[Any]:
+        start = perf_counter()
+        await sleep(self.__latency)
+        if name == "users.get_many_by_ids":
+            rows = [self.__id_to_row[id] for id in args[0] if id in self.__id_to_row]
+        elif name == "users.get_many_by_logins":
+            rows = [self.__login_to_row[login] for login in args[0] if login in self.__login_to_row]
+        else:
+            raise NotImplementedError(name)
+        self.__metrics.observe_query(name, perf_counter() - start, len(rows))
+        return rows
+
+    async def fetchrow(self, connection: Any, name: str, *args: Any) -> Optional[Any]:
+        start = perf_counter()
+        await sleep(self.__latency)
+        row: Optional[Row]
+        if name == "users.create":
+            login, password, role = args
+            if login in self.__login_to_row:
+                raise UniqueViolationError(f"duplicate login {login!r}")
+            row = self.__insert(login, password, role)
+        elif name == "users.update":
+            updated_at, login, password, role, id = args
+            row = self.__id_to_row.get(id)
+            if row is not None:
+                del self.__login_to_row[row["login"]]
+                row = dict(row, updated_at=updated_at, login=login, password=password, role=role)
+                self.__id_to_row[id] = self.__login_to_row[login] = row
+        elif name == "users.delete":
+            row = self.__id_to_row.pop(args[0], None)
+            if row is not None:
+                del self.__login_to_row[row["login"]]
+        else:
+            raise NotImplementedError(name)
+        self.__metrics.observe_query(name, perf_counter() - start, int(row is not None))
+        return row
+
+    def __insert(self, login: str, password: str, role: str) -> Row:
+        now = datetime.now()
+        row = {
+            "id": uuid4(),
+            "created_at": now,
+            "updated_at": now,
+            "login": login,
+            "password": password,
+            "role": role,
+        }
+        self.__id_to_row[row["id"]] = self.__login_to_row[login] = row
+        return row
+
+
+class StandInMessenger(Messenger):
+    def __init__(self, latency: float) -> None:
+        self.__latency = latency
+
+    def send_message(self, name: str, message: str) -> None:
+        time.sleep(self.__latency)
+
+
+def load_postgresql_stand_in(arguments: Namespace) -> None:
+    class StandInConnectionPoolFactory(ConnectionPoolFactory):
+        def __call__(self) -> Any:
+            return connection_pool
+
+    class StandInStatementExecutorFactory(StatementExecutorFactory):
+        def __call__(self) -> StatementExecutor:
+            return statement_executor
+
+    class StandInDatabaseMetricsFactory(DatabaseMetricsFactory):
+        def __call__(self) -> DatabaseMetrics:
+            return metrics
+
+    connection_pool = StandInConnectionPool(arguments.database_pool_size)
+    add_factory(ConnectionPoolFactory, StandInConnectionPoolFactory())
+    connection_pool_factory = get_factory(ConnectionPoolFactory)
+    metrics = DatabaseMetricsImpl()
+    statement_executor = StandInStatementExecutor(
+        connection_pool_factory, metrics, arguments.database_latency
+    )
+    add_factory(StatementExecutorFactory, StandInStatementExecutorFactory())
+    add_factory(DatabaseMetricsFactory, StandInDatabaseMetricsFactory())
+
+
+def load_messenger_stand_in(arguments: Namespace) -> None:
+    class StandInMessengerFactory(MessengerFactory):
+        def __call__(self) -> Messenger:
+            return messenger
+
+    messenger = StandInMessenger(arguments.messenger_latency)
+    add_factory(MessengerFactory, StandInMessengerFactory())
+
+
+stand_in_loaders: Dict[str, Callable[[Namespace], None]] = {
+    POSTGRESQL_MODULE_NAME: load_postgresql_stand_in,
+    MESSENGER_MODULE_NAME: load_messenger_stand_in,
+}
+
+
+def get_stand_in_codes() -> Set[CodeType]:
+    codes = {loader.__code__ for loader in stand_in_loaders.values()}
+    for stand_in_type in (StandInConnectionPool, StandInStatementExecutor, StandInMessenger):
+        for value in vars(stand_in_type).values():
+            function = getattr(value, "__wrapped__", value)
+            if isfunction(function):
+                codes.add(function.__code__)
+    return codes
+
+
+class PluginSampler:
+    def __init__(self, module_names: Sequence[str], interval: float) -> None:
+        self.__module_names = set(module_names)
+        self.__stand_in_codes = get_stand_in_codes()
+        self.__interval = interval
+        self.__main_thread_id = get_ident()
+        self.__stopped = ThreadEvent()
+        self.__thread = Thread(target=self.__run, name="plugin-sampler", daemon=True)
+        self.counts: "Counter[str]" = Counter()
+
+    def start(self) -> None:
+        self.__thread.start()
+
+    def stop(self) -> None:
+        self.__stopped.set()
+        self.__thread.join()
+
+    def __run(self) -> None:
+        own_thread_id = get_ident()
+        while not self.__stopped.wait(self.__interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread_id:
+                    continue
+                category = self.__classify(frame)
+                if frame.f_globals.get("__name__") in WAITING_MODULE_NAMES:
+                    if category is not None or thread_id == self.__main_thread_id:
+                        self.counts[IDLE] += 1
+                elif category is not None:
+                    self.counts[category] += 1
+                elif thread_id == self.__main_thread_id:
+                    self.counts[FRAMEWORK] += 1
+
+    def __classify(self, frame: Optional[FrameType]) -> Optional[str]:
+        while frame is not None:
+            if frame.f_code in self.__stand_in_codes:
+                return STAND_INS
+            module_name = frame.f_globals.get("__name__")
+            if module_name in self.__module_names:
+                return module_name
+            frame = frame.f_back
+        return None
+
+
+async def request(
+    app: FastAPI,
+    method: str,
+    path: str,
+    headers: Headers,
+    body: bytes = b"",
+) -> Response:
+    async def receive() -> Dict[str, Any]:
+        if not requested:
+            requested.append(True)
+            return {"type": "http.request", "body": body, "more_body": False}
+        await completed.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                completed.set()
+
+    requested: List[bool] = []
+    completed = Event()
+    statuses: List[int] = []
+    chunks: List[bytes] = []
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers + [(b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    await app(scope, receive, send)
+    return statuses[0], b"".join(chunks)
+
+
+class VirtualUser:
+    def __init__(self, app: FastAPI, number: int, uses_oauth2: bool, random: Random) -> None:
+        self.__app = app
+        self.__number = number
+        self.__uses_oauth2 = uses_oauth2
+        self.__random = random
+        self.__headers: Headers = []
+        self.__user_ids: List[str] = []
+        self.__login_count = 0
+
+    async def login(self) -> Response:
+        if not self.__uses_oauth2:
+            self.__headers = [(b"authorization", b"Basic " + b64encode(b"admin:admin"))]
+            return await self.whoami()
+        response = await request(
+            self.__app,
+            "POST",
+            "/login",
+            [(b"content-type", b"application/x-www-form-urlencoded")],
+            b"username=admin&password=admin",
+        )
+        if response[0] == 200:
+            token = response[1].split(b'"access_token":', 1)[1].split(b'"')[1]
+            self.__headers = [(b"authorization", b"Bearer " + token)]
+        return response
+
+    async def whoami(self) -> Response:
+        return await request(self.__app, "GET", "/whoami", self.__headers)
+
+    async def get_user(self) -> Response:
+        if not self.__user_ids:
+            return await self.create_user()
+        id = self.__random.choice(self.__user_ids)
+        return await request(self.__app, "GET", f"/users/{id}", self.__headers)
+
+    async def create_user(self) -> Response:
+        self.__login_count += 1
+        response = await request(
+            self.__app,
+            "POST",
+            "/users",
+            self.__headers + [(b"content-type", b"application/json")],
+            self.__get_user_body(),
+        )
+        if response[0] == 200:
+            self.__user_ids.append(response[1].split(b'"id":', 1)[1].split(b'"')[1].decode())
+        return response
+
+    async def update_user(self) -> Response:
+        if not self.__user_ids:
+            return await self.create_user()
+        self.__login_count += 1
+        id = self.__random.choice(self.__user_ids)
+        return await request(
+            self.__app,
+            "PUT",
+            f"/users/{id}",
+            self.__headers + [(b"content-type", b"application/json")],
+            self.__get_user_body(),
+        )
+
+    async def delete_user(self) -> Response:
+        if not self.__user_ids:
+            return await self.create_user()
+        id = self.__user_ids.pop(self.__random.randrange(len(self.__user_ids)))
+        return await request(self.__app, "DELETE", f"/users/{id}", self.__headers)
+
+    async def happy_birthday(self) -> Response:
+        return await request(
+            self.__app,
+            "POST",
+            "/happy_birthday",
+            self.__headers + [(b"content-type", b"application/json")],
+            b'{"name":"Maria"}',
+        )
+
+    def __get_user_body(self) -> bytes:
+        login = f"load-{self.__number}-{self.__login_count}"
+        return f'{{"login":"{login}","password":"password","role":"employee"}}'.encode()
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    operation_to_weight: Dict[str, int] = {}
+    for item in mix.split(","):
+        operation, weight = item.split("=")
+        if not hasattr(VirtualUser, operation.strip()):
+            raise ValueError(f"Invalid operation: operation={operation!r}.")
+        operation_to_weight[operation.strip()] = int(weight)
+    return operation_to_weight
+
+
+async def drive(app: FastAPI, arguments: Namespace) -> Dict[str, List[Tuple[int, float]]]:
+    operation_to_weight = parse_mix(arguments.mix)
+    operations = list(operation_to_weight.keys())
+    weights = list(operation_to_weight.values())
+    uses_oauth2 = any(getattr(route, "path", None) == "/login" for route in app.routes)
+    results: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+    deadline = perf_counter() + arguments.duration
+
+    async def run_virtual_user(number: int) -> None:
+        random = Random(number)
+        virtual_user = VirtualUser(app, number, uses_oauth2, random)
+        await virtual_user.login()
+        while perf_counter() < deadline:
+            operation = random.choices(operations, weights)[0]
+            start = perf_counter()
+            status, _ = await getattr(virtual_user, operation)()
+            results[operation].append((status, perf_counter() - start))
+
+    await gather(*(run_virtual_user(number) for number in range(arguments.concurrency)))
+    return results
+
+
+def report(
+    results: Dict[str, List[Tuple[int, float]]],
+    elapsed: float,
+    counts: "Counter[str]",
+) -> None:
+    total_count = sum(len(operation_results) for operation_results in results.values())
+    print(f"requests: {total_count}, elapsed: {elapsed:.1f} s, RPS: {total_count / elapsed:.0f}")
+    print(f"{'operation':<16}{'count':>8}{'errors':>8}{'p50, ms':>10}{'p99, ms':>10}")
+    for operation, operation_results in sorted(results.items()):
+        latencies = [latency for _, latency in operation_results]
+        error_count = sum(1 for status, _ in operation_results if status >= 400)
+        percentiles = quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        print(
+            f"{operation:<16}{len(operation_results):>8}{error_count:>8}"
+            f"{percentiles[49] * 1e3:>10.2f}{percentiles[98] * 1e3:>10.2f}"
+        )
+    sample_count = sum(counts.values())
+    if not sample_count:
+        return
+    print(f"{'time share':<64}{'share':>8}")
+    for category, count in counts.most_common():
+        print(f"{category:<64}{count / sample_count:>8.1%}")
+
+
+async def serve(module_names: Sequence[str], arguments: Namespace) -> None:
+    with FactoryContainerImpl():
+        for module_name in module_names:
+            stand_in_loader = stand_in_loaders.get(module_name)
+            if stand_in_loader is not None:
+                stand_in_loader(arguments)
+            else:
+                import_module(module_name).load()  # type: ignore
+        app = get_factory(AppFactory)()
+        await app.router.startup()
+        sampler = PluginSampler(module_names, arguments.sample_interval)
+        sampler.start()
+        start = perf_counter()
+        try:
+            results = await drive(app, arguments)
+        finally:
+            elapsed = perf_counter() - start
+            sampler.stop()
+            await app.router.shutdown()
+    report(results, elapsed, sampler.counts)
+
+
+def main() -> None:
+    parser = ArgumentParser()
+    parser.add_argument("--module-names-path", default="module_names.txt")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--database-latency", type=float, default=0.001)
+    parser.add_argument("--database-pool-size", type=int, default=16)
+    parser.add_argument("--messenger-latency", type=float, default=0.001)
+    parser.add_argument("--sample-interval", type=float, default=0.001)
+    arguments = parser.parse_args()
+
+    module_names = read_module_names(arguments.module_names_path)
+    os.environ.setdefault("LOGGING_LEVEL", "WARNING")
+    with TemporaryDirectory() as directory:
+        os.environ.setdefault("USER_REPOSITORY_DIRECTORY", directory)
+        run(serve(module_names, arguments))
+
+
+if __name__ == "__main__":
+    main()
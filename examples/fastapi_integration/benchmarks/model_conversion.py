@@ -0,0 +1,105 @@
+"""
+Measures per-row conversion cost of repository reads with and without re-validation of
+trusted data.
+
+Run: python benchmarks/model_conversion.py
+"""
+
+from asyncio import run
+from contextlib import asynccontextmanager
+from datetime import datetime
+from time import perf_counter
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List
+from uuid import uuid4
+
+from fastapi_integration.databases.postgresql.impl import (
+    DatabaseMetricsImpl,
+    StatementExecutorImpl,
+)
+from fastapi_integration.models import validate_trusted_models
+from fastapi_integration.users.repositories.in_memory import (
+    InMemoryUserRepository,
+    UserRecord,
+)
+from fastapi_integration.users.repositories.postgresql import PostgreSQLUserRepository
+
+ROW_COUNT = 10_000
+REPEAT_COUNT = 10
+
+
+class FakeStatement:
+    def __init__(self, rows: List[Dict[str, Any]]) -> None:
+        self.__rows = rows
+
+    async def fetch(self, limit: int) -> List[Dict[str, Any]]:
+        return self.__rows[:limit]
+
+
+class FakeConnection:
+    def __init__(self, rows: List[Dict[str, Any]]) -> None:
+        self.__rows = rows
+        self.prepared_statements: Dict[str, FakeStatement] = {}
+
+    async def prepare(self, query: str) -> FakeStatement:
+        return FakeStatement(self.__rows)
+
+
+class FakePool:
+    def __init__(self, rows: List[Dict[str, Any]]) -> None:
+        self.__connection = FakeConnection(rows)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[FakeConnection]:
+        yield self.__connection
+
+
+Read = Callable[[], Awaitable[Any]]
+
+
+async def measure(name: str, prepare: Callable[[], Read]) -> None:
+    for validate in (True, False):
+        token = validate_trusted_models.set(validate)
+        try:
+            elapsed = 0.0
+            for _ in range(REPEAT_COUNT):
+                read = prepare()
+                start = perf_counter()
+                await read()
+                elapsed += perf_counter() - start
+        finally:
+            validate_trusted_models.reset(token)
+        mode = "validated" if validate else "trusted"
+        print(f"{name} ({mode}): {elapsed / (ROW_COUNT * REPEAT_COUNT) * 1e6:.2f} us/row")
+
+
+async def main() -> None:
+    now = datetime.now()
+    rows = [
+        {
+            "id": uuid4(),
+            "created_at": now,
+            "updated_at": now,
+            "login": f"user-{i}",
+            "password": "password",
+            "role": "employee",
+        }
+        for i in range(ROW_COUNT)
+    ]
+
+    pool = FakePool(rows)
+    statement_executor = StatementExecutorImpl(lambda: pool, DatabaseMetricsImpl())  # type: ignore
+    postgresql_repository = PostgreSQLUserRepository(statement_executor)
+
+    def prepare_postgresql_read() -> Read:
+        return lambda: postgresql_repository.list(limit=ROW_COUNT)
+
+    def prepare_in_memory_read() -> Read:
+        in_memory_repository = InMemoryUserRepository(UserRecord(**row) for row in rows)
+        return lambda: in_memory_repository.list(limit=ROW_COUNT)
+
+    await measure("PostgreSQLUserRepository.list", prepare_postgresql_read)
+    await measure("InMemoryUserRepository.list, uncached", prepare_in_memory_read)
+
+
+if __name__ == "__main__":
+    run(main())
@@ -0,0 +1,53 @@
+"""
+Measures route role lookups of RoleCheckerImpl with a few thousand registered routes.
+
+Run: python benchmarks/role_checker.py
+"""
+
+from random import Random
+from timeit import timeit
+from typing import List, Tuple
+
+from fastapi_integration.current_user_resolvers.role_checkers.impl import (
+    RoleCheckerImpl,
+)
+
+RESOURCE_COUNT = 1000
+LOOKUP_COUNT = 100000
+
+
+def create_role_checker(cache_size: int) -> RoleCheckerImpl:
+    role_checker = RoleCheckerImpl(cache_size=cache_size)
+    for i in range(RESOURCE_COUNT):
+        role_checker.register_roles_for_route("GET", f"/resources{i}", ["admin", "employee"])
+        role_checker.register_roles_for_route("GET", f"/resources{i}/{{id}}", ["admin"])
+        role_checker.register_roles_for_route("PUT", f"/resources{i}/{{id}}", ["admin"])
+        role_checker.register_roles_for_route(
+            "GET", f"/resources{i}/{{id}}/items/{{item_id}}", ["admin"]
+        )
+    return role_checker
+
+
+def create_requests(hot_path_count: int) -> List[Tuple[str, str]]:
+    random = Random(0)
+    paths = [
+        f"/resources{random.randrange(RESOURCE_COUNT)}/{i}/items/{i}" for i in range(hot_path_count)
+    ]
+    return [("GET", random.choice(paths)) for _ in range(LOOKUP_COUNT)]
+
+
+def main() -> None:
+    requests = create_requests(hot_path_count=1000)
+    for cache_size in [0, 4096]:
+        role_checker = create_role_checker(cache_size)
+
+        def run() -> None:
+            for method, path in requests:
+                role_checker.find_roles(method, path)
+
+        duration = timeit(run, number=1)
+        print(f"cache_size={cache_size:>5}: {duration / LOOKUP_COUNT * 1e9:6.0f} ns/lookup")
+
+
+if __name__ == "__main__":
+    main()
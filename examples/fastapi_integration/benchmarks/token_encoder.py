@@ -0,0 +1,39 @@
+"""
+Measures token decoding cost per request with and without the verified-token cache.
+
+Run: python benchmarks/token_encoder.py
+"""
+
+from random import Random
+from timeit import timeit
+from uuid import uuid4
+
+from fastapi_integration.token_encoders import TokenEncoder
+from fastapi_integration.token_encoders.caching import CachingTokenEncoder
+from fastapi_integration.token_encoders.jwt import JwtTokenEncoder
+
+USER_COUNT = 100
+REQUEST_COUNT = 20000
+
+
+def main() -> None:
+    jwt_token_encoder = JwtTokenEncoder("secret")
+    tokens = [jwt_token_encoder.encode(uuid4()) for _ in range(USER_COUNT)]
+    random = Random(0)
+    requests = [random.choice(tokens) for _ in range(REQUEST_COUNT)]
+    caching_token_encoder = CachingTokenEncoder(jwt_token_encoder, max_size=1000, ttl=60.0)
+    token_encoder: TokenEncoder
+    for name, token_encoder in [("jwt", jwt_token_encoder), ("cached jwt", caching_token_encoder)]:
+
+        def run() -> None:
+            for token in requests:
+                token_encoder.decode(token)
+
+        duration = timeit(run, number=1)
+        print(f"{name:>10}: {duration / REQUEST_COUNT * 1e6:6.2f} us/request")
+    statistics = caching_token_encoder.get_statistics()
+    print(f"hit rate: {statistics.hit_rate:.2%}, cached tokens: {statistics.size}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Measures concurrent user lookups by id with one query per lookup and with batched lookups.
+
+Run: python benchmarks/user_lookups.py
+"""
+
+from asyncio import Semaphore, gather, run, sleep
+from contextlib import asynccontextmanager
+from datetime import datetime
+from statistics import quantiles
+from time import perf_counter
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List
+from uuid import UUID, uuid4
+
+from asyncpg.pool import Pool
+from fastapi_integration.databases.postgresql import ConnectionPoolFactory
+from fastapi_integration.databases.postgresql.impl import (
+    DatabaseMetricsImpl,
+    StatementExecutorImpl,
+)
+from fastapi_integration.users.repositories.postgresql import PostgreSQLUserRepository
+
+USER_COUNT = 1000
+CONCURRENCY = 2000
+POOL_SIZE = 10
+QUERY_LATENCY = 0.001
+
+
+class FakeStatement:
+    def __init__(self, id_to_record: Dict[UUID, Dict[str, Any]]) -> None:
+        self.__id_to_record = id_to_record
+
+    async def fetch(self, ids: List[UUID]) -> List[Any]:
+        await sleep(QUERY_LATENCY)
+        return [self.__id_to_record[id] for id in ids if id in self.__id_to_record]
+
+
+class FakeConnection:
+    def __init__(self, id_to_record: Dict[UUID, Dict[str, Any]]) -> None:
+        self.__id_to_record = id_to_record
+        self.prepared_statements: Dict[str, FakeStatement] = {}
+
+    async def prepare(self, query: str) -> FakeStatement:
+        return FakeStatement(self.__id_to_record)
+
+    async def fetchrow(self, query: str, id: UUID) -> Any:
+        await sleep(QUERY_LATENCY)
+        return self.__id_to_record.get(id)
+
+
+class FakePool:
+    def __init__(self, id_to_record: Dict[UUID, Dict[str, Any]]) -> None:
+        self.__semaphore = Semaphore(POOL_SIZE)
+        self.__connection = FakeConnection(id_to_record)
+        self.acquire_count = 0
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[FakeConnection]:
+        async with self.__semaphore:
+            self.acquire_count += 1
+            yield self.__connection
+
+
+class FakePoolFactory(ConnectionPoolFactory):
+    def __init__(self, pool: FakePool) -> None:
+        self.__pool = pool
+
+    def __call__(self) -> Pool:
+        return self.__pool  # type: ignore
+
+
+async def measure(name: str, ids: List[UUID], get: Callable[[UUID], Awaitable[Any]]) -> None:
+    latencies: List[float] = []
+
+    async def get_with_latency(id: UUID) -> None:
+        start = perf_counter()
+        await get(id)
+        latencies.append(perf_counter() - start)
+
+    await gather(*(get_with_latency(id) for id in ids))
+    percentiles = quantiles(latencies, n=100)
+    print(f"{name}: p50={percentiles[49] * 1e3:.2f} ms, p99={percentiles[98] * 1e3:.2f} ms")
+
+
+async def main() -> None:
+    now = datetime.now()
+    id_to_record = {
+        id: {"id": id, "created_at": now, "updated_at": now, "login": str(id), "role": "user"}
+        for id in (uuid4() for _ in range(USER_COUNT))
+    }
+    ids = list(id_to_record.keys())
+    ids = [ids[i % USER_COUNT] for i in range(CONCURRENCY)]
+
+    pool = FakePool(id_to_record)
+    statement_executor = StatementExecutorImpl(FakePoolFactory(pool), DatabaseMetricsImpl())
+    repository = PostgreSQLUserRepository(statement_executor)
+
+    async def get_by_id_with_fetchrow(id: UUID) -> Any:
+        async with pool.acquire() as connection:
+            return await connection.fetchrow("", id)
+
+    await measure("fetchrow per lookup", ids, get_by_id_with_fetchrow)
+    print(f"  acquires: {pool.acquire_count}")
+    pool.acquire_count = 0
+    await measure("batched lookups", ids, repository.get_by_id)
+    print(f"  acquires: {pool.acquire_count}")
+
+
+if __name__ == "__main__":
+    run(main())
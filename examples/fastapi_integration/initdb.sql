@@ -16,6 +16,9 @@ create table if not exists "users"
 );
 
 
+create index if not exists "users_created_at_id_idx" on "users" ("created_at", "id");
+
+
 insert into "users"
 (
     "login",
@@ -25,12 +28,12 @@ insert into "users"
 values
 (
     'admin',
-    'admin',
+    'scrypt$16384$8$1$1605bY7BsmfAaA+PE+B9zg==$/wQCyTz6YO1KmfMzdGnK+LcygvvDrbFjQoOdZ8Fr33/VJgVIGcRtubh+1h/ImlPEg0UGyMPKs7JpIEq+hqGXSA==',
     'admin'
 ),
 (
     'employee',
-    'employee',
+    'scrypt$16384$8$1$8+PtYl+DN+X10VX4cmDb7w==$b8y1pT49mqd32bnx3S8bfSGcpdsfnC0juARGNhBSHNgPWB46XQLFKKCMSqUray0UMsxDrFD4wKNvWgNFvYw4HQ==',
     'employee'
 );
 
@@ -14,4 +14,7 @@ setup(
         "PyJWT==2.3.0",
         "asyncpg==0.25.0",
     ],
+    extras_require={
+        "orjson": ["orjson==3.6.4"],
+    },
 )
@@ -0,0 +1,86 @@
+from asyncio import Future, Task, get_running_loop, shield
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Sequence,
+    Set,
+    TypeVar,
+    Union,
+)
+
+__all__ = [
+    "BatchLoadResultCountException",
+    "BatchLoader",
+]
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoadResultCountException(Exception):
+    def __init__(self, key_count: int, result_count: int) -> None:
+        super().__init__(
+            f"Batch load returned wrong number of results: "
+            f"key_count={key_count!r}, "
+            f"result_count={result_count!r}."
+        )
+
+
+class BatchLoader(Generic[K, V]):
+    def __init__(
+        self,
+        load_many: Callable[[List[K]], Awaitable[Sequence[Union[V, Exception]]]],
+        max_batch_size: int = 1000,
+    ) -> None:
+        self.__load_many = load_many
+        self.__max_batch_size = max_batch_size
+        self.__key_to_future: Dict[K, "Future[V]"] = {}
+        self.__tasks: Set["Task[None]"] = set()
+
+    async def load(self, key: K) -> V:
+        future = self.__key_to_future.get(key)
+        if future is None:
+            loop = get_running_loop()
+            if not self.__key_to_future:
+                loop.call_soon(self.__dispatch)
+            future = loop.create_future()
+            self.__key_to_future[key] = future
+        return await shield(future)
+
+    def __dispatch(self) -> None:
+        key_to_future = self.__key_to_future
+        self.__key_to_future = {}
+        keys = list(key_to_future.keys())
+        loop = get_running_loop()
+        for i in range(0, len(keys), self.__max_batch_size):
+            batch_keys = keys[i : i + self.__max_batch_size]
+            task = loop.create_task(self.__load_batch(batch_keys, key_to_future))
+            self.__tasks.add(task)
+            task.add_done_callback(self.__tasks.discard)
+
+    async def __load_batch(self, keys: List[K], key_to_future: Dict[K, "Future[V]"]) -> None:
+        try:
+            results = await self.__load_many(keys)
+            if len(results) != len(keys):
+                raise BatchLoadResultCountException(len(keys), len(results))
+        except Exception as e:
+            # Every key of the batch gets the same exception instance, so that exception
+            # handlers still see its type. Its traceback is shared by all waiters.
+            for key in keys:
+                key_to_future[key].set_exception(e)
+            return
+        except BaseException:
+            for key in keys:
+                key_to_future[key].cancel()
+            raise
+        for key, result in zip(keys, results):
+            future = key_to_future[key]
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
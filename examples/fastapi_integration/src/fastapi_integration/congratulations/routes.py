@@ -1,4 +1,6 @@
-from congratulations_app.congratulations_services import CongratulationsServiceFactory
+from congratulations_app.congratulations_services import (
+    AsyncCongratulationsServiceFactory,
+)
 from fastapi.param_functions import Depends
 from fastapi.routing import APIRouter
 from fastapi_integration.app import AppFactory
@@ -14,7 +16,7 @@ __all__ = [
 def load() -> None:
     app_factory = get_factory(AppFactory)
     app = app_factory()
-    congratulations_service_factory = get_factory(CongratulationsServiceFactory)
+    congratulations_service_factory = get_factory(AsyncCongratulationsServiceFactory)
     congratulations_service = congratulations_service_factory()
     current_user_resolver_factory = get_factory(CurrentUserResolverFactory)
     current_user_resolver = current_user_resolver_factory()
@@ -22,6 +24,6 @@ def load() -> None:
 
     @router.post("/happy_birthday")
     async def happy_birthday(request: CongratulationRequest) -> None:
-        congratulations_service.happy_birthday(request.name)
+        await congratulations_service.happy_birthday(request.name)
 
     app.include_router(router)
@@ -1,9 +1,20 @@
-from typing import Awaitable, Callable
+import os
+from collections import OrderedDict
+from hashlib import sha256
+from hmac import new as new_hmac
+from secrets import token_bytes
+from time import monotonic
+from typing import Awaitable, Callable, Tuple
 
 from fastapi.exceptions import HTTPException
 from fastapi.param_functions import Depends
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
+from fastapi_integration.app import AppFactory
 from fastapi_integration.current_user_resolvers import CurrentUserResolverFactory
+from fastapi_integration.password_hashers import (
+    DummyPasswordVerifier,
+    PasswordHasherFactory,
+)
 from fastapi_integration.users.models import User, convert_private_user_to_user
 from fastapi_integration.users.repositories import (
     UserNotFoundByLoginException,
@@ -12,22 +23,68 @@ from fastapi_integration.users.repositories import (
 from galo_ioc import add_factory, get_factory
 
 __all__ = [
+    "VerifiedCredentialCache",
     "load",
 ]
 
 
+class VerifiedCredentialCache:
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__secret_key = token_bytes(32)
+        self.__key_to_entry: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+
+    def get_key(self, username: str, password: str) -> bytes:
+        encoded_username = username.encode()
+        message = len(encoded_username).to_bytes(4, "big") + encoded_username + password.encode()
+        return new_hmac(self.__secret_key, message, sha256).digest()
+
+    def contains(self, key: bytes, password_hash: str) -> bool:
+        entry = self.__key_to_entry.get(key)
+        if entry is None:
+            return False
+        verified_password_hash, expiration_time = entry
+        if expiration_time <= monotonic() or verified_password_hash != password_hash:
+            del self.__key_to_entry[key]
+            return False
+        self.__key_to_entry.move_to_end(key)
+        return True
+
+    def add(self, key: bytes, password_hash: str) -> None:
+        self.__key_to_entry[key] = (password_hash, monotonic() + self.__ttl)
+        self.__key_to_entry.move_to_end(key)
+        if len(self.__key_to_entry) > self.__max_size:
+            self.__key_to_entry.popitem(last=False)
+
+
 def load() -> None:
+    app_factory = get_factory(AppFactory)
+    app = app_factory()
+
     user_repository_factory = get_factory(UserRepositoryFactory)
     user_repository = user_repository_factory()
+    password_hasher_factory = get_factory(PasswordHasherFactory)
+    password_hasher = password_hasher_factory()
+    dummy_password_verifier = DummyPasswordVerifier(password_hasher)
+    app.on_event("startup")(dummy_password_verifier.prepare)
     security = HTTPBasic()
+    verified_credential_cache = VerifiedCredentialCache(
+        max_size=int(os.getenv("BASIC_AUTH_CACHE_MAX_SIZE", "10000")),
+        ttl=float(os.getenv("BASIC_AUTH_CACHE_TTL", "60")),
+    )
 
     async def resolve_current_user(credentials: HTTPBasicCredentials = Depends(security)) -> User:
         try:
             private_user = await user_repository.get_by_login(credentials.username)
         except UserNotFoundByLoginException:
+            await dummy_password_verifier.verify(credentials.password)
             raise HTTPException(status_code=401, detail="Invalid username or password") from None
-        if not private_user.password == credentials.password:
-            raise HTTPException(status_code=401, detail="Invalid username or password")
+        key = verified_credential_cache.get_key(credentials.username, credentials.password)
+        if not verified_credential_cache.contains(key, private_user.password):
+            if not await password_hasher.verify(credentials.password, private_user.password):
+                raise HTTPException(status_code=401, detail="Invalid username or password")
+            verified_credential_cache.add(key, private_user.password)
         return convert_private_user_to_user(private_user)
 
     class CurrentUserResolverFactoryImpl(CurrentUserResolverFactory):
@@ -5,6 +5,10 @@ from fastapi.param_functions import Depends
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi_integration.app import AppFactory
 from fastapi_integration.current_user_resolvers import CurrentUserResolverFactory
+from fastapi_integration.password_hashers import (
+    DummyPasswordVerifier,
+    PasswordHasherFactory,
+)
 from fastapi_integration.token_encoders import TokenEncoderFactory
 from fastapi_integration.users.models import User
 from fastapi_integration.users.repositories import (
@@ -28,6 +32,11 @@ def load() -> None:
     user_repository_factory = get_factory(UserRepositoryFactory)
     user_repository = user_repository_factory()
 
+    password_hasher_factory = get_factory(PasswordHasherFactory)
+    password_hasher = password_hasher_factory()
+    dummy_password_verifier = DummyPasswordVerifier(password_hasher)
+    app.on_event("startup")(dummy_password_verifier.prepare)
+
     oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
     async def resolve_current_user(token: str = Depends(oauth2_scheme)) -> User:
@@ -46,8 +55,9 @@ def load() -> None:
         try:
             user = await user_repository.get_by_login(form_data.username)
         except UserNotFoundByLoginException:
+            await dummy_password_verifier.verify(form_data.password)
             raise HTTPException(status_code=401, detail="Invalid username or password") from None
-        if form_data.password != user.password:
+        if not await password_hasher.verify(form_data.password, user.password):
             raise HTTPException(status_code=401, detail="Invalid username or password")
         token = token_encoder.encode(user.id)
         return {"access_token": token, "token_type": "bearer"}
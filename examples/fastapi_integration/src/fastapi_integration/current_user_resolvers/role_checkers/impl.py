@@ -1,5 +1,14 @@
-from enum import Enum, auto
-from typing import Awaitable, Callable, Collection, Iterable, Optional
+from functools import lru_cache
+from typing import (
+    Awaitable,
+    Callable,
+    Collection,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Sequence,
+)
 
 from fastapi.exceptions import HTTPException
 from fastapi.param_functions import Depends
@@ -19,63 +28,79 @@ from galo_ioc import (
 )
 
 __all__ = [
+    "RouteNode",
     "RoleCheckerImpl",
     "load",
 ]
 
 
-class Keys(Enum):
-    PARAMETER = auto()
-    ROLES = auto()
-
+class RouteNode:
+    __slots__ = ("static_children", "parameter_children", "roles")
 
-class RoleCheckerImpl(RoleChecker):
     def __init__(self) -> None:
-        self.__role_info: dict = {}
+        self.static_children: Dict[str, "RouteNode"] = {}
+        self.parameter_children: Dict[str, "RouteNode"] = {}
+        self.roles: Optional[FrozenSet[str]] = None
 
-    def register_roles_for_route(self, method: str, path: str, roles: Collection[str]) -> None:
-        role_info = self.__get_role_info_by_method(method)
-        for path_item in self.__get_path_items(path):
+    def add_route(self, path_items: Sequence[str], roles: Collection[str]) -> None:
+        node = self
+        for path_item in path_items:
             if path_item.startswith("{") and path_item.endswith("}"):
-                role_info[Keys.PARAMETER] = {}
-                role_info = role_info[Keys.PARAMETER]
+                children = node.parameter_children
             else:
-                role_info[path_item] = {}
-                role_info = role_info[path_item]
-        role_info[Keys.ROLES] = roles
-
-    def check_role(self, request: Request, user: User) -> None:
-        method = request.method
-        path = request.url.path
-        role_info = self.__get_role_info_by_method(method)
-        for path_item in self.__get_path_items(path):
+                children = node.static_children
             try:
-                role_info = role_info[path_item]
+                node = children[path_item]
             except KeyError:
-                try:
-                    role_info = role_info[Keys.PARAMETER]
-                except KeyError:
-                    return
+                node = children[path_item] = RouteNode()
+        node.roles = frozenset(roles)
+
+    def find_roles(self, path_items: Sequence[str], index: int = 0) -> Optional[FrozenSet[str]]:
+        if index == len(path_items):
+            return self.roles
+        static_child = self.static_children.get(path_items[index])
+        if static_child is not None:
+            roles = static_child.find_roles(path_items, index + 1)
+            if roles is not None:
+                return roles
+        for parameter_child in self.parameter_children.values():
+            roles = parameter_child.find_roles(path_items, index + 1)
+            if roles is not None:
+                return roles
+        return None
+
+
+class RoleCheckerImpl(RoleChecker):
+    def __init__(self, cache_size: int = 4096) -> None:
+        self.__method_to_route_tree: Dict[str, RouteNode] = {}
+        self.__find_roles = lru_cache(maxsize=cache_size)(self.__find_roles_uncached)
+
+    def register_roles_for_route(self, method: str, path: str, roles: Collection[str]) -> None:
         try:
-            roles = role_info[Keys.ROLES]
+            route_tree = self.__method_to_route_tree[method]
         except KeyError:
-            return
-        if user.role not in roles:
+            route_tree = self.__method_to_route_tree[method] = RouteNode()
+        route_tree.add_route(self.__get_path_items(path), roles)
+        self.__find_roles.cache_clear()
+
+    def find_roles(self, method: str, path: str) -> Optional[FrozenSet[str]]:
+        return self.__find_roles(method, path)
+
+    def check_role(self, request: Request, user: User) -> None:
+        roles = self.__find_roles(request.method, request.url.path)
+        if roles is not None and user.role not in roles:
             raise HTTPException(status_code=403, detail="Invalid role")
 
-    def __get_role_info_by_method(self, method: str) -> dict:
+    def __find_roles_uncached(self, method: str, path: str) -> Optional[FrozenSet[str]]:
         try:
-            return self.__role_info[method]
+            route_tree = self.__method_to_route_tree[method]
         except KeyError:
-            self.__role_info[method] = {}
-            return self.__role_info[method]
+            return None
+        return route_tree.find_roles(self.__get_path_items(path))
 
     @staticmethod
-    def __get_path_items(path: str) -> Iterable[str]:
-        for path_item in path.split("/"):
-            if not path_item:
-                continue
-            yield path_item
+    def __get_path_items(path: str) -> List[str]:
+        return [path_item for path_item in path.split("/") if path_item]
 
 
 def load() -> None:
@@ -1,10 +1,86 @@
+from typing import Any, AsyncContextManager, Dict, List, NamedTuple, Optional
+
+from asyncpg import Connection, Record
 from asyncpg.pool import Pool
+from fastapi_integration.metrics import Histogram
 
 __all__ = [
+    "ConnectionPoolSaturatedException",
+    "ConnectionPoolSaturation",
+    "ConnectionPoolMonitor",
+    "ConnectionPoolMonitorFactory",
     "ConnectionPoolFactory",
+    "StatementExecutor",
+    "StatementExecutorFactory",
+    "DatabaseMetrics",
+    "DatabaseMetricsFactory",
 ]
 
 
+class ConnectionPoolSaturatedException(Exception):
+    def __init__(self, waiter_count: int) -> None:
+        super().__init__(f"Connection pool saturated: waiter_count={waiter_count!r}.")
+        self.waiter_count = waiter_count
+
+
+class ConnectionPoolSaturation(NamedTuple):
+    min_size: int
+    max_size: int
+    limit: int
+    used_count: int
+    peak_used_count: int
+    waiter_count: int
+    utilization: float
+    acquire_count: int
+    shed_count: int
+    timeout_count: int
+
+
+class ConnectionPoolMonitor:
+    def get_saturation(self) -> ConnectionPoolSaturation:
+        raise NotImplementedError()
+
+
+class ConnectionPoolMonitorFactory:
+    def __call__(self) -> ConnectionPoolMonitor:
+        raise NotImplementedError()
+
+
 class ConnectionPoolFactory:
     def __call__(self) -> Pool:
         raise NotImplementedError()
+
+
+class StatementExecutor:
+    def add_statement(self, name: str, query: str) -> None:
+        raise NotImplementedError()
+
+    def acquire(self) -> AsyncContextManager[Connection]:
+        raise NotImplementedError()
+
+    async def fetch(self, connection: Connection, name: str, *args: Any) -> List[Record]:
+        raise NotImplementedError()
+
+    async def fetchrow(self, connection: Connection, name: str, *args: Any) -> Optional[Record]:
+        raise NotImplementedError()
+
+
+class StatementExecutorFactory:
+    def __call__(self) -> StatementExecutor:
+        raise NotImplementedError()
+
+
+class DatabaseMetrics:
+    def get_acquire_time(self) -> Histogram:
+        raise NotImplementedError()
+
+    def get_query_times(self) -> Dict[str, Histogram]:
+        raise NotImplementedError()
+
+    def get_row_counts(self) -> Dict[str, Histogram]:
+        raise NotImplementedError()
+
+
+class DatabaseMetricsFactory:
+    def __call__(self) -> DatabaseMetrics:
+        raise NotImplementedError()
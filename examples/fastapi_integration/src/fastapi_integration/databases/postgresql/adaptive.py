@@ -0,0 +1,204 @@
+import os
+from asyncio import Future, get_running_loop
+from collections import deque
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import Any, AsyncIterator, Deque, Generator, Optional
+
+from asyncpg import Connection
+from asyncpg.pool import Pool
+from fastapi_integration.databases.postgresql import (
+    ConnectionPoolFactory,
+    ConnectionPoolMonitor,
+    ConnectionPoolMonitorFactory,
+    ConnectionPoolSaturatedException,
+    ConnectionPoolSaturation,
+)
+from galo_ioc import (
+    Factory,
+    FactoryType,
+    add_factory,
+    add_factory_decorator,
+    get_factory,
+)
+
+__all__ = [
+    "AdaptiveConnectionPool",
+    "load",
+]
+
+
+class AdaptiveConnectionPool(ConnectionPoolMonitor):
+    def __init__(
+        self,
+        wrappee: Pool,
+        min_size: int,
+        max_size: int,
+        acquire_timeout: float,
+        max_waiter_count: int,
+        shrink_interval: float,
+        grow_wait_time: float,
+    ) -> None:
+        self.__wrappee = wrappee
+        self.__min_size = min_size
+        self.__max_size = max_size
+        self.__acquire_timeout = acquire_timeout
+        self.__max_waiter_count = max_waiter_count
+        self.__shrink_interval = shrink_interval
+        self.__grow_wait_time = grow_wait_time
+        self.__grow_time = monotonic()
+        self.__limit = min_size
+        self.__used_count = 0
+        self.__peak_used_count = 0
+        self.__window_start = monotonic()
+        self.__waiters: Deque["Future[None]"] = deque()
+        self.__acquire_count = 0
+        self.__shed_count = 0
+        self.__timeout_count = 0
+
+    def __await__(self) -> Generator[Any, None, "AdaptiveConnectionPool"]:
+        yield from self.__wrappee.__await__()
+        return self
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__wrappee, name)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Connection]:
+        await self.__acquire_slot()
+        try:
+            async with self.__wrappee.acquire() as connection:
+                yield connection
+        finally:
+            self.__release_slot()
+
+    def get_saturation(self) -> ConnectionPoolSaturation:
+        return ConnectionPoolSaturation(
+            min_size=self.__min_size,
+            max_size=self.__max_size,
+            limit=self.__limit,
+            used_count=self.__used_count,
+            peak_used_count=self.__peak_used_count,
+            waiter_count=len(self.__waiters),
+            utilization=self.__used_count / self.__limit if self.__limit else 0.0,
+            acquire_count=self.__acquire_count,
+            shed_count=self.__shed_count,
+            timeout_count=self.__timeout_count,
+        )
+
+    async def __acquire_slot(self) -> None:
+        self.__acquire_count += 1
+        if not self.__waiters and self.__used_count < self.__limit:
+            self.__use_slot()
+            return
+        if len(self.__waiters) >= self.__max_waiter_count:
+            self.__shed_count += 1
+            raise ConnectionPoolSaturatedException(len(self.__waiters))
+
+        loop = get_running_loop()
+        future: "Future[None]" = loop.create_future()
+        self.__waiters.append(future)
+        grow_timer_handle = loop.call_later(self.__grow_wait_time, self.__grow, future)
+        timer_handle = loop.call_later(self.__acquire_timeout, self.__expire_waiter, future)
+        try:
+            await future
+        except BaseException:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self.__release_slot()
+            else:
+                self.__remove_waiter(future)
+            raise
+        finally:
+            grow_timer_handle.cancel()
+            timer_handle.cancel()
+
+    def __use_slot(self) -> None:
+        self.__used_count += 1
+        if self.__used_count > self.__peak_used_count:
+            self.__peak_used_count = self.__used_count
+
+    def __release_slot(self) -> None:
+        self.__used_count -= 1
+        now = monotonic()
+        if now - self.__window_start >= self.__shrink_interval:
+            if not self.__waiters:
+                self.__limit = max(self.__min_size, self.__peak_used_count)
+            self.__peak_used_count = self.__used_count
+            self.__window_start = now
+        self.__wake_waiters()
+
+    def __wake_waiters(self) -> None:
+        while self.__waiters and self.__used_count < self.__limit:
+            future = self.__waiters.popleft()
+            if future.done():
+                continue
+            self.__use_slot()
+            future.set_result(None)
+
+    def __grow(self, future: "Future[None]") -> None:
+        if future.done() or self.__limit >= self.__max_size:
+            return
+        now = monotonic()
+        delay = self.__grow_time + self.__grow_wait_time - now
+        if delay > 0:
+            get_running_loop().call_later(delay, self.__grow, future)
+            return
+        self.__grow_time = now
+        self.__limit += 1
+        self.__wake_waiters()
+
+    def __expire_waiter(self, future: "Future[None]") -> None:
+        if future.done():
+            return
+        self.__remove_waiter(future)
+        self.__timeout_count += 1
+        future.set_exception(ConnectionPoolSaturatedException(len(self.__waiters)))
+
+    def __remove_waiter(self, future: "Future[None]") -> None:
+        try:
+            self.__waiters.remove(future)
+        except ValueError:
+            pass
+
+
+def load() -> None:
+    def factory_decorator(
+        factory_type: FactoryType,
+        id: Optional[str],
+        factory: Factory,
+    ) -> Factory:
+        if not issubclass(factory_type, ConnectionPoolFactory):
+            return factory
+
+        connection_pool: Optional[AdaptiveConnectionPool] = None
+
+        class AdaptiveConnectionPoolFactory(ConnectionPoolFactory):
+            def __call__(self) -> Pool:
+                nonlocal connection_pool
+                if connection_pool is None:
+                    connection_pool = AdaptiveConnectionPool(
+                        factory(),
+                        min_size=min_size,
+                        max_size=max_size,
+                        acquire_timeout=acquire_timeout,
+                        max_waiter_count=max_waiter_count,
+                        shrink_interval=shrink_interval,
+                        grow_wait_time=grow_wait_time,
+                    )
+                return connection_pool
+
+        return AdaptiveConnectionPoolFactory()
+
+    class ConnectionPoolMonitorFactoryImpl(ConnectionPoolMonitorFactory):
+        def __call__(self) -> ConnectionPoolMonitor:
+            return connection_pool_factory()
+
+    min_size = int(os.getenv("POSTGRESQL_CONNECTION_POOL_MIN_SIZE", "4"))
+    max_size = int(os.getenv("POSTGRESQL_CONNECTION_POOL_MAX_SIZE", "16"))
+    acquire_timeout = float(os.getenv("POSTGRESQL_CONNECTION_POOL_ACQUIRE_TIMEOUT", "1"))
+    max_waiter_count = int(os.getenv("POSTGRESQL_CONNECTION_POOL_MAX_WAITER_COUNT", "1000"))
+    shrink_interval = float(os.getenv("POSTGRESQL_CONNECTION_POOL_SHRINK_INTERVAL", "10"))
+    grow_wait_time = float(os.getenv("POSTGRESQL_CONNECTION_POOL_GROW_WAIT_TIME", "0.01"))
+    add_factory_decorator(factory_decorator)
+    connection_pool_factory = get_factory(ConnectionPoolFactory)
+    add_factory(ConnectionPoolMonitorFactory, ConnectionPoolMonitorFactoryImpl())
@@ -0,0 +1,22 @@
+from typing import Any
+
+from fastapi_integration.databases.postgresql import ConnectionPoolSaturatedException
+from fastapi_integration.json_exception_handlers import JsonExceptionHandlerFactory
+from galo_ioc import get_factory
+
+__all__ = [
+    "load",
+]
+
+
+def load() -> None:
+    def get_detail_for_connection_pool_saturated_exception(
+        exception: ConnectionPoolSaturatedException,
+    ) -> Any:
+        return {"waiter_count": exception.waiter_count}
+
+    exception_handler_factory = get_factory(JsonExceptionHandlerFactory)
+    exception_handler = exception_handler_factory()
+    exception_handler.register_exception(
+        ConnectionPoolSaturatedException, 503, get_detail_for_connection_pool_saturated_exception
+    )
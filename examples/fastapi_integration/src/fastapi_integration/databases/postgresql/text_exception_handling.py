@@ -0,0 +1,20 @@
+from fastapi_integration.databases.postgresql import ConnectionPoolSaturatedException
+from fastapi_integration.text_exception_handlers import TextExceptionHandlerFactory
+from galo_ioc import get_factory
+
+__all__ = [
+    "load",
+]
+
+
+def load() -> None:
+    def get_message_for_connection_pool_saturated_exception(
+        exception: ConnectionPoolSaturatedException,
+    ) -> str:
+        return f"Database is overloaded: waiter_count={exception.waiter_count}"
+
+    exception_handler_factory = get_factory(TextExceptionHandlerFactory)
+    exception_handler = exception_handler_factory()
+    exception_handler.register_exception(
+        ConnectionPoolSaturatedException, 503, get_message_for_connection_pool_saturated_exception
+    )
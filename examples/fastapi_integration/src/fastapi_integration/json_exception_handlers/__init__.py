@@ -1,7 +1,7 @@
 from typing import Any, Callable, Type, TypeVar
 
 from fastapi.requests import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 
 __all__ = [
     "E",
@@ -22,7 +22,7 @@ class JsonExceptionHandler:
     ) -> None:
         raise NotImplementedError()
 
-    async def __call__(self, request: Request, exception: Exception) -> JSONResponse:
+    async def __call__(self, request: Request, exception: Exception) -> Response:
         raise NotImplementedError()
 
 
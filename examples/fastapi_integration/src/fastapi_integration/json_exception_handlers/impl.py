@@ -1,4 +1,5 @@
-from typing import Any, Callable, Dict, Type
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
 
 from fastapi.exception_handlers import (
     http_exception_handler,
@@ -6,13 +7,14 @@ from fastapi.exception_handlers import (
 )
 from fastapi.exceptions import HTTPException, RequestValidationError
 from fastapi.requests import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from fastapi_integration.app import AppFactory
 from fastapi_integration.json_exception_handlers import (
     E,
     JsonExceptionHandler,
     JsonExceptionHandlerFactory,
 )
+from fastapi_integration.json_renderers import JsonRenderer, JsonRendererFactory
 from galo_ioc import add_factory, get_factory
 
 __all__ = [
@@ -21,11 +23,16 @@ __all__ = [
 ]
 
 
+Registration = Tuple[int, Optional[Callable[[Exception], Any]]]
+ExceptionHandling = Callable[[Request, Exception], Awaitable[Response]]
+
+
 class JsonExceptionHandlerImpl(JsonExceptionHandler):
-    def __init__(self, default_status_code: int = 500) -> None:
+    def __init__(self, renderer: JsonRenderer, default_status_code: int = 500) -> None:
+        self.__renderer = renderer
         self.__default_status_code = default_status_code
-        self.__exception_type_to_status_code: Dict[Type[Exception], int] = {}
-        self.__exception_type_to_get_detail: Dict[Type[Exception], Callable[[Exception], Any]] = {}
+        self.__exception_type_to_registration: Dict[Type[Exception], Registration] = {}
+        self.__exception_type_to_handling: Dict[Type[Exception], ExceptionHandling] = {}
 
     def register_exception(
         self,
@@ -33,27 +40,43 @@ class JsonExceptionHandlerImpl(JsonExceptionHandler):
         status_code: int,
         get_detail: Callable[[E], Any],
     ) -> None:
-        self.__exception_type_to_status_code[exception_type] = status_code
-        self.__exception_type_to_get_detail[exception_type] = get_detail
-
-    async def __call__(self, request: Request, exception: Exception) -> JSONResponse:
-        if isinstance(exception, RequestValidationError):
-            return await request_validation_exception_handler(request, exception)
-
-        if isinstance(exception, HTTPException):
-            return await http_exception_handler(request, exception)
+        registration = (status_code, get_detail)
+        self.__exception_type_to_registration[exception_type] = registration  # type: ignore
+        self.__exception_type_to_handling.clear()
 
+    async def __call__(self, request: Request, exception: Exception) -> Response:
         exception_type = type(exception)
-        status_code = self.__exception_type_to_status_code.get(
-            exception_type, self.__default_status_code
-        )
         try:
-            get_detail = self.__exception_type_to_get_detail[exception_type]
+            handling = self.__exception_type_to_handling[exception_type]
         except KeyError:
-            return JSONResponse(status_code=status_code, content={"detail": None})
-        else:
-            detail = get_detail(exception)
-            return JSONResponse(status_code=status_code, content={"detail": detail})
+            handling = self.__resolve_handling(exception_type)
+            self.__exception_type_to_handling[exception_type] = handling
+        return await handling(request, exception)
+
+    def __resolve_handling(self, exception_type: Type[Exception]) -> ExceptionHandling:
+        if issubclass(exception_type, RequestValidationError):
+            return request_validation_exception_handler  # type: ignore
+        if issubclass(exception_type, HTTPException):
+            return http_exception_handler  # type: ignore
+        for base in exception_type.__mro__:
+            try:
+                status_code, get_detail = self.__exception_type_to_registration[base]
+            except KeyError:
+                continue
+            return partial(self.__handle, status_code, get_detail)
+        return partial(self.__handle, self.__default_status_code, None)
+
+    async def __handle(
+        self,
+        status_code: int,
+        get_detail: Optional[Callable[[Exception], Any]],
+        request: Request,
+        exception: Exception,
+    ) -> Response:
+        if get_detail is None:
+            return self.__renderer.render({"detail": None}, status_code)
+        detail = get_detail(exception)
+        return self.__renderer.render({"detail": detail}, status_code)
 
 
 def load() -> None:
@@ -61,7 +84,8 @@ def load() -> None:
         def __call__(self) -> JsonExceptionHandler:
             return exception_handler
 
-    exception_handler = JsonExceptionHandlerImpl()
+    renderer_factory = get_factory(JsonRendererFactory)
+    exception_handler = JsonExceptionHandlerImpl(renderer_factory())
     add_factory(JsonExceptionHandlerFactory, JsonExceptionHandlerFactoryImpl())
 
     app_factory = get_factory(AppFactory)
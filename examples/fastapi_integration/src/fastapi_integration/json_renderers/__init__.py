@@ -0,0 +1,24 @@
+from typing import Any, Type
+
+from fastapi.responses import Response
+
+__all__ = [
+    "JsonRenderer",
+    "JsonRendererFactory",
+]
+
+
+class JsonRenderer:
+    def get_response_class(self) -> Type[Response]:
+        raise NotImplementedError()
+
+    def dumps(self, content: Any) -> bytes:
+        raise NotImplementedError()
+
+    def render(self, content: Any, status_code: int = 200) -> Response:
+        raise NotImplementedError()
+
+
+class JsonRendererFactory:
+    def __call__(self) -> JsonRenderer:
+        raise NotImplementedError()
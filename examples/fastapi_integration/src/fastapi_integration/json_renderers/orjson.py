@@ -0,0 +1,53 @@
+from typing import Any, Dict, Type
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from fastapi_integration.app import AppFactory
+from fastapi_integration.json_renderers import JsonRenderer, JsonRendererFactory
+from galo_ioc import add_factory, get_factory
+from pydantic import BaseModel
+
+__all__ = [
+    "OrjsonResponse",
+    "OrjsonRenderer",
+    "load",
+]
+
+
+def encode_default(value: Any) -> Dict[str, Any]:
+    if isinstance(value, BaseModel):
+        return value.__dict__
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable.")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=encode_default)
+
+
+class OrjsonResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class OrjsonRenderer(JsonRenderer):
+    def get_response_class(self) -> Type[Response]:
+        return OrjsonResponse
+
+    def dumps(self, content: Any) -> bytes:
+        return dumps(content)
+
+    def render(self, content: Any, status_code: int = 200) -> Response:
+        return Response(dumps(content), status_code, media_type="application/json")
+
+
+def load() -> None:
+    class OrjsonRendererFactory(JsonRendererFactory):
+        def __call__(self) -> JsonRenderer:
+            return renderer
+
+    renderer = OrjsonRenderer()
+    add_factory(JsonRendererFactory, OrjsonRendererFactory())
+
+    app_factory = get_factory(AppFactory)
+    app = app_factory()
+    app.router.default_response_class = renderer.get_response_class()
@@ -0,0 +1,38 @@
+import json
+from typing import Any, Type
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from fastapi_integration.json_renderers import JsonRenderer, JsonRendererFactory
+from galo_ioc import add_factory
+
+__all__ = [
+    "StandardJsonRenderer",
+    "load",
+]
+
+
+class StandardJsonRenderer(JsonRenderer):
+    def get_response_class(self) -> Type[Response]:
+        return JSONResponse
+
+    def dumps(self, content: Any) -> bytes:
+        return json.dumps(
+            jsonable_encoder(content),
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode()
+
+    def render(self, content: Any, status_code: int = 200) -> Response:
+        return JSONResponse(jsonable_encoder(content), status_code)
+
+
+def load() -> None:
+    class StandardJsonRendererFactory(JsonRendererFactory):
+        def __call__(self) -> JsonRenderer:
+            return renderer
+
+    renderer = StandardJsonRenderer()
+    add_factory(JsonRendererFactory, StandardJsonRendererFactory())
@@ -0,0 +1,56 @@
+from bisect import bisect_left
+from typing import Any, Dict, List, Sequence, Tuple
+
+__all__ = [
+    "Histogram",
+    "get_exponential_bounds",
+]
+
+
+def get_exponential_bounds(start: float, factor: float, count: int) -> List[float]:
+    return [start * factor ** i for i in range(count)]
+
+
+class Histogram:
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.__bounds = list(bounds)
+        self.__counts = [0] * (len(self.__bounds) + 1)
+        self.__count = 0
+        self.__sum = 0.0
+
+    @property
+    def count(self) -> int:
+        return self.__count
+
+    @property
+    def sum(self) -> float:
+        return self.__sum
+
+    def observe(self, value: float) -> None:
+        self.__counts[bisect_left(self.__bounds, value)] += 1
+        self.__count += 1
+        self.__sum += value
+
+    def get_buckets(self) -> List[Tuple[float, int]]:
+        buckets: List[Tuple[float, int]] = []
+        cumulative_count = 0
+        for bound, count in zip(self.__bounds + [float("inf")], self.__counts):
+            cumulative_count += count
+            buckets.append((bound, cumulative_count))
+        return buckets
+
+    def get_quantile(self, quantile: float) -> float:
+        if self.__count == 0:
+            return 0.0
+        rank = quantile * self.__count
+        for bound, cumulative_count in self.get_buckets():
+            if cumulative_count >= rank:
+                return bound
+        return float("inf")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.__count,
+            "sum": self.__sum,
+            "buckets": [[bound, count] for bound, count in self.get_buckets()],
+        }
@@ -1,14 +1,37 @@
+import os
+from contextvars import ContextVar
 from datetime import datetime
+from typing import Any, Dict, Type, TypeVar
 from uuid import UUID
 
 from pydantic import BaseModel
 
 __all__ = [
     "Entity",
+    "validate_trusted_models",
+    "construct_trusted",
 ]
 
 
+TModel = TypeVar("TModel", bound=BaseModel)
+
+
+validate_trusted_models: ContextVar[bool] = ContextVar(
+    "validate_trusted_models",
+    default=os.getenv("VALIDATE_TRUSTED_MODELS", "0") == "1",
+)
+
+
 class Entity(BaseModel):
     id: UUID
     created_at: datetime
     updated_at: datetime
+
+
+def construct_trusted(model_type: Type[TModel], values: Dict[str, Any]) -> TModel:
+    if validate_trusted_models.get():
+        return model_type(**values)
+    model = model_type.__new__(model_type)
+    object.__setattr__(model, "__dict__", values)
+    object.__setattr__(model, "__fields_set__", set(values))
+    return model
@@ -0,0 +1,39 @@
+from secrets import token_hex
+from typing import Optional
+
+__all__ = [
+    "PasswordHasher",
+    "PasswordHasherFactory",
+    "DummyPasswordVerifier",
+]
+
+
+class PasswordHasher:
+    async def hash(self, password: str) -> str:
+        raise NotImplementedError()
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        raise NotImplementedError()
+
+
+class PasswordHasherFactory:
+    def __call__(self) -> PasswordHasher:
+        raise NotImplementedError()
+
+
+class DummyPasswordVerifier:
+    def __init__(self, password_hasher: PasswordHasher) -> None:
+        self.__password_hasher = password_hasher
+        self.__password_hash: Optional[str] = None
+
+    async def prepare(self) -> None:
+        await self.__get_password_hash()
+
+    async def verify(self, password: str) -> None:
+        await self.__password_hasher.verify(password, await self.__get_password_hash())
+
+    async def __get_password_hash(self) -> str:
+        password_hash = self.__password_hash
+        if password_hash is None:
+            password_hash = self.__password_hash = await self.__password_hasher.hash(token_hex(16))
+        return password_hash
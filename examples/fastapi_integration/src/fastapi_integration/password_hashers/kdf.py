@@ -0,0 +1,106 @@
+import os
+from asyncio import get_running_loop
+from base64 import b64decode, b64encode
+from concurrent.futures import Executor, ThreadPoolExecutor
+from hashlib import pbkdf2_hmac, scrypt
+from hmac import compare_digest
+from secrets import token_bytes
+
+from fastapi_integration.password_hashers import PasswordHasher, PasswordHasherFactory
+from galo_ioc import add_exit_callback, add_factory
+
+__all__ = [
+    "KdfPasswordHasher",
+    "load",
+]
+
+
+algorithms = ("pbkdf2_sha256", "scrypt")
+
+
+class KdfPasswordHasher(PasswordHasher):
+    def __init__(
+        self,
+        executor: Executor,
+        algorithm: str = "scrypt",
+        pbkdf2_iterations: int = 600000,
+        scrypt_n: int = 2 ** 14,
+        scrypt_r: int = 8,
+        scrypt_p: int = 1,
+    ) -> None:
+        if algorithm not in algorithms:
+            raise ValueError(f"Invalid algorithm: algorithm={algorithm!r}.")
+        self.__executor = executor
+        self.__algorithm = algorithm
+        self.__pbkdf2_iterations = pbkdf2_iterations
+        self.__scrypt_n = scrypt_n
+        self.__scrypt_r = scrypt_r
+        self.__scrypt_p = scrypt_p
+
+    async def hash(self, password: str) -> str:
+        return await get_running_loop().run_in_executor(self.__executor, self.hash_sync, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await get_running_loop().run_in_executor(
+            self.__executor, self.verify_sync, password, password_hash
+        )
+
+    def hash_sync(self, password: str) -> str:
+        salt = token_bytes(16)
+        if self.__algorithm == "pbkdf2_sha256":
+            key = pbkdf2_hmac("sha256", password.encode(), salt, self.__pbkdf2_iterations)
+            parameters = [str(self.__pbkdf2_iterations)]
+        else:
+            n, r, p = self.__scrypt_n, self.__scrypt_r, self.__scrypt_p
+            key = scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r)
+            parameters = [str(n), str(r), str(p)]
+        return "$".join(
+            [self.__algorithm, *parameters, b64encode(salt).decode(), b64encode(key).decode()]
+        )
+
+    def verify_sync(self, password: str, password_hash: str) -> bool:
+        try:
+            return self.__verify_sync(password, password_hash)
+        except ValueError:
+            return False
+
+    def __verify_sync(self, password: str, password_hash: str) -> bool:
+        algorithm, *parameters = password_hash.split("$")
+        if algorithm == "pbkdf2_sha256" and len(parameters) == 3:
+            iterations, salt, key = parameters
+            expected_key = b64decode(key)
+            actual_key = pbkdf2_hmac("sha256", password.encode(), b64decode(salt), int(iterations))
+        elif algorithm == "scrypt" and len(parameters) == 5:
+            n, r, p, salt, key = parameters
+            expected_key = b64decode(key)
+            actual_key = scrypt(
+                password.encode(),
+                salt=b64decode(salt),
+                n=int(n),
+                r=int(r),
+                p=int(p),
+                maxmem=256 * int(n) * int(r),
+                dklen=len(expected_key),
+            )
+        else:
+            return False
+        return compare_digest(actual_key, expected_key)
+
+
+def load() -> None:
+    class KdfPasswordHasherFactory(PasswordHasherFactory):
+        def __call__(self) -> PasswordHasher:
+            return password_hasher
+
+    max_workers = int(os.getenv("PASSWORD_HASHER_MAX_WORKERS", "4"))
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hasher")
+    password_hasher = KdfPasswordHasher(
+        executor,
+        algorithm=os.getenv("PASSWORD_HASHER_ALGORITHM", "scrypt"),
+        pbkdf2_iterations=int(os.getenv("PASSWORD_HASHER_PBKDF2_ITERATIONS", "600000")),
+        scrypt_n=int(os.getenv("PASSWORD_HASHER_SCRYPT_N", str(2 ** 14))),
+        scrypt_r=int(os.getenv("PASSWORD_HASHER_SCRYPT_R", "8")),
+        scrypt_p=int(os.getenv("PASSWORD_HASHER_SCRYPT_P", "1")),
+    )
+    add_factory(PasswordHasherFactory, KdfPasswordHasherFactory())
+    add_exit_callback(executor.shutdown)
@@ -1,4 +1,5 @@
-from typing import Any, Callable, Dict, Type
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
 
 from fastapi.exception_handlers import (
     http_exception_handler,
@@ -21,11 +22,15 @@ __all__ = [
 ]
 
 
+Registration = Tuple[int, Optional[Callable[[Exception], Any]]]
+ExceptionHandling = Callable[[Request, Exception], Awaitable[Response]]
+
+
 class TextExceptionHandlerImpl(TextExceptionHandler):
     def __init__(self, default_status_code: int = 500) -> None:
         self.__default_status_code = default_status_code
-        self.__exception_type_to_status_code: Dict[Type[Exception], int] = {}
-        self.__exception_type_to_get_message: Dict[Type[Exception], Callable[[Exception], Any]] = {}
+        self.__exception_type_to_registration: Dict[Type[Exception], Registration] = {}
+        self.__exception_type_to_handling: Dict[Type[Exception], ExceptionHandling] = {}
 
     def register_exception(
         self,
@@ -33,27 +38,43 @@ class TextExceptionHandlerImpl(TextExceptionHandler):
         status_code: int,
         get_message: Callable[[E], str],
     ) -> None:
-        self.__exception_type_to_status_code[exception_type] = status_code
-        self.__exception_type_to_get_message[exception_type] = get_message
+        registration = (status_code, get_message)
+        self.__exception_type_to_registration[exception_type] = registration  # type: ignore
+        self.__exception_type_to_handling.clear()
 
     async def __call__(self, request: Request, exception: Exception) -> Response:
-        if isinstance(exception, RequestValidationError):
-            return await request_validation_exception_handler(request, exception)
-
-        if isinstance(exception, HTTPException):
-            return await http_exception_handler(request, exception)
-
         exception_type = type(exception)
-        status_code = self.__exception_type_to_status_code.get(
-            exception_type, self.__default_status_code
-        )
         try:
-            get_message = self.__exception_type_to_get_message[exception_type]
+            handling = self.__exception_type_to_handling[exception_type]
         except KeyError:
+            handling = self.__resolve_handling(exception_type)
+            self.__exception_type_to_handling[exception_type] = handling
+        return await handling(request, exception)
+
+    def __resolve_handling(self, exception_type: Type[Exception]) -> ExceptionHandling:
+        if issubclass(exception_type, RequestValidationError):
+            return request_validation_exception_handler  # type: ignore
+        if issubclass(exception_type, HTTPException):
+            return http_exception_handler  # type: ignore
+        for base in exception_type.__mro__:
+            try:
+                status_code, get_message = self.__exception_type_to_registration[base]
+            except KeyError:
+                continue
+            return partial(self.__handle, status_code, get_message)
+        return partial(self.__handle, self.__default_status_code, None)
+
+    @staticmethod
+    async def __handle(
+        status_code: int,
+        get_message: Optional[Callable[[Exception], Any]],
+        request: Request,
+        exception: Exception,
+    ) -> Response:
+        if get_message is None:
             return PlainTextResponse(status_code=status_code)
-        else:
-            message = get_message(exception)
-            return PlainTextResponse(status_code=status_code, content=message)
+        message = get_message(exception)
+        return PlainTextResponse(status_code=status_code, content=message)
 
 
 def load() -> None:
@@ -1,3 +1,4 @@
+from typing import Optional, Tuple
 from uuid import UUID
 
 __all__ = [
@@ -13,6 +14,9 @@ class TokenEncoder:
     def decode(self, token: str) -> UUID:
         raise NotImplementedError()
 
+    def decode_with_expiration_time(self, token: str) -> Tuple[UUID, Optional[float]]:
+        return self.decode(token), None
+
 
 class TokenEncoderFactory:
     def __call__(self) -> TokenEncoder:
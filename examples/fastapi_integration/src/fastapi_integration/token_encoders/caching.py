@@ -0,0 +1,94 @@
+import os
+from collections import OrderedDict
+from hashlib import sha256
+from time import time
+from typing import NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from fastapi_integration.token_encoders import TokenEncoder, TokenEncoderFactory
+from galo_ioc import Factory, FactoryType, add_factory_decorator
+
+__all__ = [
+    "TokenCacheStatistics",
+    "CachingTokenEncoder",
+    "load",
+]
+
+
+class TokenCacheStatistics(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CachingTokenEncoder(TokenEncoder):
+    def __init__(self, wrappee: TokenEncoder, max_size: int, ttl: float) -> None:
+        self.__wrappee = wrappee
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__digest_to_entry: "OrderedDict[bytes, Tuple[UUID, Optional[float], float]]" = (
+            OrderedDict()
+        )
+        self.__hits = 0
+        self.__misses = 0
+
+    def encode(self, user_id: UUID) -> str:
+        return self.__wrappee.encode(user_id)
+
+    def decode(self, token: str) -> UUID:
+        return self.decode_with_expiration_time(token)[0]
+
+    def decode_with_expiration_time(self, token: str) -> Tuple[UUID, Optional[float]]:
+        digest = sha256(token.encode()).digest()
+        now = time()
+        entry = self.__digest_to_entry.get(digest)
+        if entry is not None:
+            user_id, token_expiration_time, expiration_time = entry
+            if expiration_time > now:
+                self.__hits += 1
+                self.__digest_to_entry.move_to_end(digest)
+                return user_id, token_expiration_time
+            del self.__digest_to_entry[digest]
+
+        self.__misses += 1
+        user_id, token_expiration_time = self.__wrappee.decode_with_expiration_time(token)
+        expiration_time = now + self.__ttl
+        if token_expiration_time is not None:
+            expiration_time = min(expiration_time, token_expiration_time)
+        self.__digest_to_entry[digest] = (user_id, token_expiration_time, expiration_time)
+        if len(self.__digest_to_entry) > self.__max_size:
+            self.__digest_to_entry.popitem(last=False)
+        return user_id, token_expiration_time
+
+    def get_statistics(self) -> TokenCacheStatistics:
+        return TokenCacheStatistics(self.__hits, self.__misses, len(self.__digest_to_entry))
+
+
+def load() -> None:
+    def factory_decorator(
+        factory_type: FactoryType,
+        id: Optional[str],
+        factory: Factory,
+    ) -> Factory:
+        if not issubclass(factory_type, TokenEncoderFactory):
+            return factory
+
+        token_encoder: Optional[CachingTokenEncoder] = None
+
+        class CachingTokenEncoderFactory(TokenEncoderFactory):
+            def __call__(self) -> TokenEncoder:
+                nonlocal token_encoder
+                if token_encoder is None:
+                    token_encoder = CachingTokenEncoder(factory(), max_size, ttl)
+                return token_encoder
+
+        return CachingTokenEncoderFactory()
+
+    max_size = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+    ttl = float(os.getenv("TOKEN_CACHE_TTL", "60"))
+    add_factory_decorator(factory_decorator)
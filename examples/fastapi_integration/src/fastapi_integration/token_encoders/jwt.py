@@ -1,4 +1,5 @@
 import os
+from typing import Optional, Tuple
 from uuid import UUID
 
 import jwt
@@ -22,6 +23,13 @@ class JwtTokenEncoder(TokenEncoder):
         payload = jwt.decode(token, self.__secret, algorithms=["HS256"])
         return UUID(payload["user_id"])
 
+    def decode_with_expiration_time(self, token: str) -> Tuple[UUID, Optional[float]]:
+        payload = jwt.decode(token, self.__secret, algorithms=["HS256"])
+        expiration_time = payload.get("exp")
+        if expiration_time is not None:
+            expiration_time = float(expiration_time)
+        return UUID(payload["user_id"]), expiration_time
+
 
 def load() -> None:
     class JwtTokenEncoderFactory(TokenEncoderFactory):
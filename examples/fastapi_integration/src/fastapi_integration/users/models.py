@@ -1,4 +1,6 @@
-from fastapi_integration.models import Entity
+from typing import Optional
+
+from fastapi_integration.models import Entity, construct_trusted
 from pydantic import BaseModel
 
 __all__ = [
@@ -7,6 +9,7 @@ __all__ = [
     "UserToUpdate",
     "User",
     "PrivateUser",
+    "UserCreationResult",
     "convert_private_user_to_user",
 ]
 
@@ -29,18 +32,29 @@ class UserToUpdate(BaseUser, HasPassword):
 
 
 class User(Entity, BaseUser):
-    pass
+    class Config:
+        allow_mutation = False
 
 
 class PrivateUser(Entity, BaseUser, HasPassword):
-    pass
+    class Config:
+        allow_mutation = False
+
+
+class UserCreationResult(BaseModel):
+    login: str
+    user: Optional[User] = None
+    already_exists: bool = False
 
 
 def convert_private_user_to_user(private_user: PrivateUser) -> User:
-    return User(
-        id=private_user.id,
-        created_at=private_user.created_at,
-        updated_at=private_user.updated_at,
-        login=private_user.login,
-        role=private_user.role,
+    return construct_trusted(
+        User,
+        {
+            "id": private_user.id,
+            "created_at": private_user.created_at,
+            "updated_at": private_user.updated_at,
+            "login": private_user.login,
+            "role": private_user.role,
+        },
     )
@@ -1,3 +1,5 @@
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Sequence, Tuple, Union
 from uuid import UUID
 
 from fastapi_integration.users.models import (
@@ -8,6 +10,7 @@ from fastapi_integration.users.models import (
 )
 
 __all__ = [
+    "UserCursor",
     "UserRepositoryException",
     "UserAlreadyExistsException",
     "UserNotFoundByIdException",
@@ -17,6 +20,9 @@ __all__ = [
 ]
 
 
+UserCursor = Tuple[datetime, UUID]
+
+
 class UserRepositoryException(Exception):
     pass
 
@@ -40,6 +46,12 @@ class UserRepository:
     async def create(self, user: UserToCreate) -> User:
         raise NotImplementedError()
 
+    async def create_many(
+        self,
+        users: Sequence[UserToCreate],
+    ) -> List[Union[User, UserAlreadyExistsException]]:
+        raise NotImplementedError()
+
     async def update(self, id: UUID, user: UserToUpdate) -> User:
         raise NotImplementedError()
 
@@ -52,6 +64,26 @@ class UserRepository:
     async def get_by_login(self, login: str) -> PrivateUser:
         raise NotImplementedError()
 
+    async def get_many_by_ids(
+        self,
+        ids: Sequence[UUID],
+    ) -> List[Union[User, UserNotFoundByIdException]]:
+        raise NotImplementedError()
+
+    async def get_many_by_logins(
+        self,
+        logins: Sequence[str],
+    ) -> List[Union[PrivateUser, UserNotFoundByLoginException]]:
+        raise NotImplementedError()
+
+    async def list(self, after: Optional[UserCursor] = None, limit: int = 100) -> List[User]:
+        raise NotImplementedError()
+
+    def iterate(
+        self, after: Optional[UserCursor] = None, batch_size: int = 100
+    ) -> AsyncIterator[User]:
+        raise NotImplementedError()
+
 
 class UserRepositoryFactory:
     def __call__(self) -> UserRepository:
@@ -0,0 +1,198 @@
+import os
+from asyncio import Task, create_task, shield
+from collections import OrderedDict
+from functools import partial
+from time import monotonic
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+from uuid import UUID
+
+from fastapi_integration.users.models import (
+    PrivateUser,
+    User,
+    UserToCreate,
+    UserToUpdate,
+)
+from fastapi_integration.users.repositories import (
+    UserAlreadyExistsException,
+    UserCursor,
+    UserNotFoundByIdException,
+    UserNotFoundByLoginException,
+    UserRepository,
+    UserRepositoryFactory,
+)
+from galo_ioc import Factory, FactoryType, add_factory_decorator
+
+__all__ = [
+    "ReadThroughCache",
+    "CachingUserRepository",
+    "load",
+]
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class ReadThroughCache(Generic[K, V]):
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__key_to_entry: "OrderedDict[K, Tuple[V, float]]" = OrderedDict()
+        self.__key_to_task: Dict[K, "Task[V]"] = {}
+        self.__version = 0
+
+    async def get(self, key: K, load: Callable[[], Coroutine[Any, Any, V]]) -> V:
+        entry = self.__key_to_entry.get(key)
+        if entry is not None:
+            value, expiration_time = entry
+            if expiration_time > monotonic():
+                self.__key_to_entry.move_to_end(key)
+                return value
+            del self.__key_to_entry[key]
+
+        task = self.__key_to_task.get(key)
+        if task is None:
+            task = create_task(load())
+            self.__key_to_task[key] = task
+            task.add_done_callback(partial(self.__on_load_done, key, self.__version))
+        return await shield(task)
+
+    def set(self, key: K, value: V) -> None:
+        self.__key_to_entry[key] = (value, monotonic() + self.__ttl)
+        self.__key_to_entry.move_to_end(key)
+        if len(self.__key_to_entry) > self.__max_size:
+            self.__key_to_entry.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        self.__version += 1
+        self.__key_to_entry.pop(key, None)
+
+    def __on_load_done(self, key: K, version: int, task: "Task[V]") -> None:
+        del self.__key_to_task[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        if version == self.__version:
+            self.set(key, task.result())
+
+
+class CachingUserRepository(UserRepository):
+    def __init__(self, wrappee: UserRepository, max_size: int, ttl: float) -> None:
+        self.__wrappee = wrappee
+        self.__id_to_user: ReadThroughCache[UUID, User] = ReadThroughCache(max_size, ttl)
+        self.__login_to_private_user: ReadThroughCache[str, PrivateUser] = ReadThroughCache(
+            max_size, ttl
+        )
+        self.__max_size = max_size
+        self.__id_to_login: "OrderedDict[UUID, str]" = OrderedDict()
+
+    async def create(self, user: UserToCreate) -> User:
+        created_user = await self.__wrappee.create(user)
+        self.__id_to_user.set(created_user.id, created_user)
+        return created_user
+
+    async def create_many(
+        self,
+        users: Sequence[UserToCreate],
+    ) -> List[Union[User, UserAlreadyExistsException]]:
+        results = await self.__wrappee.create_many(users)
+        for result in results:
+            if isinstance(result, User):
+                self.__id_to_user.set(result.id, result)
+        return results
+
+    async def update(self, id: UUID, user: UserToUpdate) -> User:
+        try:
+            updated_user = await self.__wrappee.update(id, user)
+        finally:
+            self.__invalidate(id)
+            self.__login_to_private_user.invalidate(user.login)
+        self.__id_to_user.set(updated_user.id, updated_user)
+        return updated_user
+
+    async def delete(self, id: UUID) -> User:
+        try:
+            deleted_user = await self.__wrappee.delete(id)
+        finally:
+            self.__invalidate(id)
+        self.__login_to_private_user.invalidate(deleted_user.login)
+        return deleted_user
+
+    async def get_by_id(self, id: UUID) -> User:
+        return await self.__id_to_user.get(id, lambda: self.__wrappee.get_by_id(id))
+
+    async def get_by_login(self, login: str) -> PrivateUser:
+        private_user = await self.__login_to_private_user.get(
+            login, lambda: self.__wrappee.get_by_login(login)
+        )
+        self.__id_to_login[private_user.id] = private_user.login
+        self.__id_to_login.move_to_end(private_user.id)
+        if len(self.__id_to_login) > self.__max_size:
+            self.__id_to_login.popitem(last=False)
+        return private_user
+
+    async def get_many_by_ids(
+        self,
+        ids: Sequence[UUID],
+    ) -> List[Union[User, UserNotFoundByIdException]]:
+        return await self.__wrappee.get_many_by_ids(ids)
+
+    async def get_many_by_logins(
+        self,
+        logins: Sequence[str],
+    ) -> List[Union[PrivateUser, UserNotFoundByLoginException]]:
+        return await self.__wrappee.get_many_by_logins(logins)
+
+    async def list(self, after: Optional[UserCursor] = None, limit: int = 100) -> List[User]:
+        return await self.__wrappee.list(after, limit)
+
+    def iterate(
+        self,
+        after: Optional[UserCursor] = None,
+        batch_size: int = 100,
+    ) -> AsyncIterator[User]:
+        return self.__wrappee.iterate(after, batch_size)
+
+    def __invalidate(self, id: UUID) -> None:
+        self.__id_to_user.invalidate(id)
+        login = self.__id_to_login.pop(id, None)
+        if login is not None:
+            self.__login_to_private_user.invalidate(login)
+
+
+def load() -> None:
+    def factory_decorator(
+        factory_type: FactoryType,
+        id: Optional[str],
+        factory: Factory,
+    ) -> Factory:
+        if not issubclass(factory_type, UserRepositoryFactory):
+            return factory
+
+        repository: Optional[CachingUserRepository] = None
+
+        class CachingUserRepositoryFactory(UserRepositoryFactory):
+            def __call__(self) -> UserRepository:
+                nonlocal repository
+                if repository is None:
+                    repository = CachingUserRepository(factory(), max_size, ttl)
+                return repository
+
+        return CachingUserRepositoryFactory()
+
+    max_size = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+    ttl = float(os.getenv("USER_CACHE_TTL", "30"))
+    add_factory_decorator(factory_decorator)
@@ -0,0 +1,570 @@
+import gc
+import os
+import re
+from asyncio import Event, Future, Task, get_running_loop
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from mmap import ACCESS_READ, mmap
+from struct import Struct
+from typing import (
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+from uuid import UUID, uuid4
+from zlib import crc32
+
+from fastapi_integration.app import AppFactory
+from fastapi_integration.users.models import (
+    PrivateUser,
+    User,
+    UserToCreate,
+    UserToUpdate,
+)
+from fastapi_integration.users.repositories import (
+    UserAlreadyExistsException,
+    UserCursor,
+    UserNotFoundByIdException,
+    UserNotFoundByLoginException,
+    UserRepository,
+    UserRepositoryFactory,
+)
+from fastapi_integration.users.repositories.in_memory import (
+    InMemoryUserRepository,
+    UserRecord,
+)
+from galo_ioc import add_factory, get_factory
+
+__all__ = [
+    "UserLogCorruptedException",
+    "encode_put_record",
+    "encode_delete_record",
+    "write_snapshot",
+    "read_snapshot",
+    "read_log",
+    "UserLog",
+    "DurableInMemoryUserRepository",
+    "open_durable_user_repository",
+    "load",
+]
+
+
+PUT = 1
+DELETE = 2
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+RECORD_HEADER = Struct("<B16sqqHHH")
+FRAME_HEADER = Struct("<II")
+SNAPSHOT_MAGIC = b"USRS"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = Struct("<4sHQQI")
+SNAPSHOT_FILE_NAME = "users.snapshot"
+LOG_FILE_NAME_PATTERN = re.compile(r"^users\.(\d{12})\.log$")
+sync_file = getattr(os, "fdatasync", os.fsync)
+
+
+class UserLogCorruptedException(Exception):
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+
+def get_log_path(directory: str, number: int) -> str:
+    return os.path.join(directory, f"users.{number:012d}.log")
+
+
+def get_log_numbers(directory: str) -> List[int]:
+    numbers = []
+    for file_name in os.listdir(directory):
+        match = LOG_FILE_NAME_PATTERN.match(file_name)
+        if match is not None:
+            numbers.append(int(match.group(1)))
+    return sorted(numbers)
+
+
+def encode_put_record(record: UserRecord) -> bytes:
+    login = record.login.encode()
+    password = record.password.encode()
+    role = record.role.encode()
+    return (
+        RECORD_HEADER.pack(
+            PUT,
+            record.id.bytes,
+            (record.created_at - EPOCH) // MICROSECOND,
+            (record.updated_at - EPOCH) // MICROSECOND,
+            len(login),
+            len(password),
+            len(role),
+        )
+        + login
+        + password
+        + role
+    )
+
+
+def encode_delete_record(id: UUID) -> bytes:
+    return RECORD_HEADER.pack(DELETE, id.bytes, 0, 0, 0, 0, 0)
+
+
+def decode_record(buffer: Union[bytes, mmap], offset: int) -> Tuple[int, UserRecord, int]:
+    (
+        op,
+        id,
+        created_at,
+        updated_at,
+        login_size,
+        password_size,
+        role_size,
+    ) = RECORD_HEADER.unpack_from(buffer, offset)
+    offset += RECORD_HEADER.size
+    login_end = offset + login_size
+    password_end = login_end + password_size
+    role_end = password_end + role_size
+    record = UserRecord(
+        id=UUID(bytes=id),
+        created_at=EPOCH + created_at * MICROSECOND,
+        updated_at=EPOCH + updated_at * MICROSECOND,
+        login=buffer[offset:login_end].decode(),
+        password=buffer[login_end:password_end].decode(),
+        role=buffer[password_end:role_end].decode(),
+    )
+    return op, record, role_end
+
+
+def create_record(user: UserToCreate, now: datetime) -> UserRecord:
+    return UserRecord(
+        id=uuid4(),
+        created_at=now,
+        updated_at=now,
+        login=user.login,
+        password=user.password,
+        role=user.role,
+    )
+
+
+def frame_record(record: bytes) -> bytes:
+    return FRAME_HEADER.pack(len(record), crc32(record)) + record
+
+
+def fsync_directory(directory: str) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_snapshot(
+    directory: str,
+    log_number: int,
+    records: Sequence[UserRecord],
+    fsync: bool = True,
+) -> None:
+    body = b"".join(map(encode_put_record, records))
+    header = SNAPSHOT_HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, log_number, len(records), crc32(body)
+    )
+    path = os.path.join(directory, SNAPSHOT_FILE_NAME)
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(header)
+        file.write(body)
+        file.flush()
+        if fsync:
+            os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+    if fsync:
+        fsync_directory(directory)
+
+
+def read_snapshot(directory: str) -> Tuple[int, List[UserRecord]]:
+    path = os.path.join(directory, SNAPSHOT_FILE_NAME)
+    with open(path, "rb") as file:
+        with mmap(file.fileno(), 0, access=ACCESS_READ) as buffer:
+            if len(buffer) < SNAPSHOT_HEADER.size:
+                raise UserLogCorruptedException(path)
+            magic, version, log_number, count, checksum = SNAPSHOT_HEADER.unpack_from(buffer)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                raise UserLogCorruptedException(path)
+            with memoryview(buffer) as view:
+                if crc32(view[SNAPSHOT_HEADER.size :]) != checksum:
+                    raise UserLogCorruptedException(path)
+            records = []
+            offset = SNAPSHOT_HEADER.size
+            for _ in range(count):
+                _, record, offset = decode_record(buffer, offset)
+                records.append(record)
+    return log_number, records
+
+
+def read_log(path: str, id_to_record: Dict[UUID, UserRecord]) -> int:
+    with open(path, "rb") as file:
+        buffer = file.read()
+    offset = 0
+    while offset + FRAME_HEADER.size <= len(buffer):
+        size, checksum = FRAME_HEADER.unpack_from(buffer, offset)
+        start = offset + FRAME_HEADER.size
+        end = start + size
+        if end > len(buffer) or crc32(buffer[start:end]) != checksum:
+            break
+        op, record, _ = decode_record(buffer, start)
+        if op == PUT:
+            id_to_record[record.id] = record
+        else:
+            id_to_record.pop(record.id, None)
+        offset = end
+    if offset != len(buffer):
+        os.truncate(path, offset)
+    return offset
+
+
+class LogBatch:
+    def __init__(self, number: int) -> None:
+        self.number = number
+        self.records: List[bytes] = []
+        self.futures: List["Future[None]"] = []
+        self.commits: List[Callable[[], None]] = []
+
+
+class UserLog:
+    def __init__(self, directory: str, number: int, fsync: bool = True) -> None:
+        self.__directory = directory
+        self.__number = number
+        self.__fsync = fsync
+        self.__size = 0
+        self.__batches: Deque[LogBatch] = deque()
+        self.__writer: Optional["Task[None]"] = None
+        self.__fd: Optional[int] = None
+        self.__fd_number = 0
+        self.__executor = ThreadPoolExecutor(1, thread_name_prefix="user-log")
+
+    @property
+    def number(self) -> int:
+        return self.__number
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    async def append(
+        self,
+        records: Iterable[bytes],
+        commit: Optional[Callable[[], None]] = None,
+    ) -> None:
+        if not self.__batches or self.__batches[-1].number != self.__number:
+            self.__batches.append(LogBatch(self.__number))
+        batch = self.__batches[-1]
+        for record in records:
+            record = frame_record(record)
+            batch.records.append(record)
+            self.__size += len(record)
+        loop = get_running_loop()
+        future: "Future[None]" = loop.create_future()
+        batch.futures.append(future)
+        if commit is not None:
+            batch.commits.append(commit)
+        if self.__writer is None:
+            self.__writer = loop.create_task(self.__write())
+        await future
+
+    def rotate(self) -> int:
+        self.__number += 1
+        self.__size = 0
+        return self.__number
+
+    async def flush(self) -> None:
+        if self.__batches or self.__writer is not None:
+            await self.append([])
+
+    def close(self) -> None:
+        self.__executor.shutdown()
+        if self.__fd is not None:
+            os.close(self.__fd)
+            self.__fd = None
+
+    async def __write(self) -> None:
+        loop = get_running_loop()
+        try:
+            while self.__batches:
+                batch = self.__batches.popleft()
+                try:
+                    await loop.run_in_executor(
+                        self.__executor, self.__write_sync, batch.number, b"".join(batch.records)
+                    )
+                except Exception as exception:
+                    for future in batch.futures:
+                        if not future.done():
+                            future.set_exception(exception)
+                else:
+                    for commit in batch.commits:
+                        commit()
+                    for future in batch.futures:
+                        if not future.done():
+                            future.set_result(None)
+        finally:
+            self.__writer = None
+
+    def __write_sync(self, number: int, data: bytes) -> None:
+        if self.__fd is None or self.__fd_number != number:
+            if self.__fd is not None:
+                os.close(self.__fd)
+            self.__fd = os.open(
+                get_log_path(self.__directory, number),
+                os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+                0o600,
+            )
+            self.__fd_number = number
+            if self.__fsync:
+                fsync_directory(self.__directory)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.__fd, view) :]
+        if self.__fsync:
+            sync_file(self.__fd)
+
+
+class DurableInMemoryUserRepository(UserRepository):
+    def __init__(
+        self,
+        wrappee: InMemoryUserRepository,
+        log: UserLog,
+        directory: str,
+        fsync: bool = True,
+        snapshot_log_size: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.__wrappee = wrappee
+        self.__log = log
+        self.__directory = directory
+        self.__fsync = fsync
+        self.__snapshot_log_size = snapshot_log_size
+        self.__snapshot_task: Optional["Task[None]"] = None
+        self.__snapshot_executor = ThreadPoolExecutor(1, thread_name_prefix="user-snapshot")
+        self.__id_to_pending_write: Dict[UUID, Event] = {}
+        self.__pending_logins: Set[str] = set()
+
+    async def create(self, user: UserToCreate) -> User:
+        if self.__login_exists(user.login):
+            raise UserAlreadyExistsException(user.login)
+        record = create_record(user, datetime.now())
+        await self.__put([record])
+        return record.get_user()
+
+    async def create_many(
+        self,
+        users: Sequence[UserToCreate],
+    ) -> List[Union[User, UserAlreadyExistsException]]:
+        now = datetime.now()
+        logins: Set[str] = set()
+        records: List[UserRecord] = []
+        results: List[Union[User, UserAlreadyExistsException]] = []
+        for user in users:
+            if user.login in logins or self.__login_exists(user.login):
+                results.append(UserAlreadyExistsException(user.login))
+                continue
+            record = create_record(user, now)
+            logins.add(record.login)
+            records.append(record)
+            results.append(record.get_user())
+        if records:
+            await self.__put(records)
+        return results
+
+    async def update(self, id: UUID, user: UserToUpdate) -> User:
+        await self.__wait_for_pending_write(id)
+        record = self.__wrappee.get_record_by_id(id)
+        if user.login != record.login and self.__login_exists(user.login):
+            raise UserAlreadyExistsException(user.login)
+        updated_record = UserRecord(
+            id=record.id,
+            created_at=record.created_at,
+            updated_at=datetime.now(),
+            login=user.login,
+            password=user.password,
+            role=user.role,
+        )
+        await self.__put([updated_record])
+        return updated_record.get_user()
+
+    async def delete(self, id: UUID) -> User:
+        await self.__wait_for_pending_write(id)
+        record = self.__wrappee.get_record_by_id(id)
+
+        def commit() -> None:
+            self.__wrappee.delete_record(id)
+
+        await self.__write([record], [encode_delete_record(id)], commit)
+        return record.get_user()
+
+    async def get_by_id(self, id: UUID) -> User:
+        return await self.__wrappee.get_by_id(id)
+
+    async def get_by_login(self, login: str) -> PrivateUser:
+        return await self.__wrappee.get_by_login(login)
+
+    async def get_many_by_ids(
+        self,
+        ids: Sequence[UUID],
+    ) -> List[Union[User, UserNotFoundByIdException]]:
+        return await self.__wrappee.get_many_by_ids(ids)
+
+    async def get_many_by_logins(
+        self,
+        logins: Sequence[str],
+    ) -> List[Union[PrivateUser, UserNotFoundByLoginException]]:
+        return await self.__wrappee.get_many_by_logins(logins)
+
+    async def list(self, after: Optional[UserCursor] = None, limit: int = 100) -> List[User]:
+        return await self.__wrappee.list(after, limit)
+
+    def iterate(
+        self,
+        after: Optional[UserCursor] = None,
+        batch_size: int = 100,
+    ) -> AsyncIterator[User]:
+        return self.__wrappee.iterate(after, batch_size)
+
+    async def snapshot(self) -> None:
+        while self.__snapshot_task is not None:
+            await self.__snapshot_task
+        await self.__start_snapshot()
+
+    async def close(self) -> None:
+        await self.__log.flush()
+        await self.snapshot()
+        self.__snapshot_executor.shutdown()
+        self.__log.close()
+
+    def __login_exists(self, login: str) -> bool:
+        if login in self.__pending_logins:
+            return True
+        try:
+            self.__wrappee.get_record_by_login(login)
+        except UserNotFoundByLoginException:
+            return False
+        return True
+
+    async def __wait_for_pending_write(self, id: UUID) -> None:
+        pending_write = self.__id_to_pending_write.get(id)
+        while pending_write is not None:
+            await pending_write.wait()
+            pending_write = self.__id_to_pending_write.get(id)
+
+    async def __put(self, records: List[UserRecord]) -> None:
+        def commit() -> None:
+            for record in records:
+                self.__wrappee.put_record(record)
+
+        await self.__write(records, [encode_put_record(record) for record in records], commit)
+
+    async def __write(
+        self,
+        records: List[UserRecord],
+        encoded_records: List[bytes],
+        commit: Callable[[], None],
+    ) -> None:
+        pending_write = Event()
+        for record in records:
+            self.__id_to_pending_write[record.id] = pending_write
+            self.__pending_logins.add(record.login)
+        try:
+            await self.__log.append(encoded_records, commit)
+        finally:
+            for record in records:
+                del self.__id_to_pending_write[record.id]
+                self.__pending_logins.discard(record.login)
+            pending_write.set()
+        self.__check_log_size()
+
+    def __check_log_size(self) -> None:
+        if self.__snapshot_task is None and self.__log.size >= self.__snapshot_log_size:
+            self.__start_snapshot()
+
+    def __start_snapshot(self) -> "Task[None]":
+        log_number = self.__log.number
+        self.__log.rotate()
+        self.__snapshot_task = get_running_loop().create_task(self.__write_snapshot(log_number))
+        return self.__snapshot_task
+
+    async def __write_snapshot(self, log_number: int) -> None:
+        try:
+            await self.__log.flush()
+            records = self.__wrappee.get_records()
+            await get_running_loop().run_in_executor(
+                self.__snapshot_executor,
+                write_snapshot,
+                self.__directory,
+                log_number,
+                records,
+                self.__fsync,
+            )
+            for number in get_log_numbers(self.__directory):
+                if number <= log_number:
+                    os.remove(get_log_path(self.__directory, number))
+        finally:
+            self.__snapshot_task = None
+
+
+def read_users(directory: str, fsync: bool) -> Tuple[InMemoryUserRepository, int]:
+    log_number = 0
+    records: List[UserRecord] = []
+    snapshot_exists = os.path.exists(os.path.join(directory, SNAPSHOT_FILE_NAME))
+    if snapshot_exists:
+        log_number, records = read_snapshot(directory)
+    log_numbers = [number for number in get_log_numbers(directory) if number > log_number]
+    if not snapshot_exists and not log_numbers:
+        wrappee = InMemoryUserRepository()
+        write_snapshot(directory, 0, wrappee.get_records(), fsync)
+    else:
+        id_to_record = {record.id: record for record in records}
+        for number in log_numbers:
+            read_log(get_log_path(directory, number), id_to_record)
+        wrappee = InMemoryUserRepository(id_to_record.values())
+    return wrappee, max([log_number, *log_numbers])
+
+
+def open_durable_user_repository(
+    directory: str,
+    fsync: bool = True,
+    snapshot_log_size: int = 64 * 1024 * 1024,
+    freeze_gc: bool = False,
+) -> DurableInMemoryUserRepository:
+    os.makedirs(directory, exist_ok=True)
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        wrappee, log_number = read_users(directory, fsync)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    if freeze_gc:
+        gc.freeze()
+    log = UserLog(directory, log_number + 1, fsync)
+    return DurableInMemoryUserRepository(wrappee, log, directory, fsync, snapshot_log_size)
+
+
+def load() -> None:
+    class DurableInMemoryUserRepositoryFactory(UserRepositoryFactory):
+        def __call__(self) -> UserRepository:
+            return repository
+
+    directory = os.getenv("USER_REPOSITORY_DIRECTORY", "data/users")
+    fsync = os.getenv("USER_REPOSITORY_FSYNC", "1") != "0"
+    snapshot_log_size = int(os.getenv("USER_REPOSITORY_SNAPSHOT_LOG_SIZE", str(64 * 1024 * 1024)))
+    freeze_gc = os.getenv("USER_REPOSITORY_FREEZE_GC", "0") == "1"
+    repository = open_durable_user_repository(directory, fsync, snapshot_log_size, freeze_gc)
+    add_factory(UserRepositoryFactory, DurableInMemoryUserRepositoryFactory())
+
+    app_factory = get_factory(AppFactory)
+    app = app_factory()
+
+    @app.on_event("shutdown")
+    async def close_repository() -> None:
+        await repository.close()
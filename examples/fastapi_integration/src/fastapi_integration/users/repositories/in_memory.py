@@ -1,16 +1,19 @@
+import sys
+from bisect import bisect_left, bisect_right, insort
 from datetime import datetime
-from typing import Dict
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence, Union
 from uuid import UUID, uuid4
 
+from fastapi_integration.models import construct_trusted
 from fastapi_integration.users.models import (
     PrivateUser,
     User,
     UserToCreate,
     UserToUpdate,
-    convert_private_user_to_user,
 )
 from fastapi_integration.users.repositories import (
     UserAlreadyExistsException,
+    UserCursor,
     UserNotFoundByIdException,
     UserNotFoundByLoginException,
     UserRepository,
@@ -19,38 +22,133 @@ from fastapi_integration.users.repositories import (
 from galo_ioc import add_factory
 
 __all__ = [
+    "UserRecord",
     "InMemoryUserRepository",
+    "default_users",
 ]
 
 
-class InMemoryUserRepository(UserRepository):
-    def __init__(self) -> None:
-        self.__id_to_user: Dict[UUID, PrivateUser] = {}
-        self.__login_to_user: Dict[str, PrivateUser] = {}
-        self.__create_sync(
-            UserToCreate(
-                login="admin",
-                password="admin",
-                role="admin",
+default_users = [
+    UserToCreate(
+        login="admin",
+        password=(
+            "scrypt$16384$8$1$1605bY7BsmfAaA+PE+B9zg==$/wQCyTz6YO1KmfMzdGnK+LcygvvDrbFjQoOdZ8Fr33/"
+            "VJgVIGcRtubh+1h/ImlPEg0UGyMPKs7JpIEq+hqGXSA=="
+        ),
+        role="admin",
+    ),
+    UserToCreate(
+        login="employee",
+        password=(
+            "scrypt$16384$8$1$8+PtYl+DN+X10VX4cmDb7w==$b8y1pT49mqd32bnx3S8bfSGcpdsfnC0juARGNhBSHNg"
+            "PWB46XQLFKKCMSqUray0UMsxDrFD4wKNvWgNFvYw4HQ=="
+        ),
+        role="employee",
+    ),
+]
+
+
+class UserRecord:
+    __slots__ = (
+        "id",
+        "created_at",
+        "updated_at",
+        "login",
+        "password",
+        "role",
+        "__user",
+        "__private_user",
+    )
+
+    def __init__(
+        self,
+        id: UUID,
+        created_at: datetime,
+        updated_at: datetime,
+        login: str,
+        password: str,
+        role: str,
+    ) -> None:
+        self.id = id
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.login = login
+        self.password = password
+        self.role = sys.intern(role)
+        self.__user: Optional[User] = None
+        self.__private_user: Optional[PrivateUser] = None
+
+    def get_user(self) -> User:
+        user = self.__user
+        if user is None:
+            user = self.__user = construct_trusted(
+                User,
+                {
+                    "id": self.id,
+                    "created_at": self.created_at,
+                    "updated_at": self.updated_at,
+                    "login": self.login,
+                    "role": self.role,
+                },
             )
-        )
-        self.__create_sync(
-            UserToCreate(
-                login="employee",
-                password="employee",
-                role="employee",
+        return user
+
+    def get_private_user(self) -> PrivateUser:
+        private_user = self.__private_user
+        if private_user is None:
+            private_user = self.__private_user = construct_trusted(
+                PrivateUser,
+                {
+                    "id": self.id,
+                    "created_at": self.created_at,
+                    "updated_at": self.updated_at,
+                    "login": self.login,
+                    "password": self.password,
+                    "role": self.role,
+                },
             )
-        )
+        return private_user
+
+
+class InMemoryUserRepository(UserRepository):
+    def __init__(self, records: Optional[Iterable[UserRecord]] = None) -> None:
+        self.__id_to_record: Dict[UUID, UserRecord] = {}
+        self.__login_to_record: Dict[str, UserRecord] = {}
+        self.__cursors: List[UserCursor] = []
+        if records is not None:
+            for record in records:
+                self.__id_to_record[record.id] = record
+                self.__login_to_record[record.login] = record
+            self.__cursors = sorted(
+                (record.created_at, record.id) for record in self.__id_to_record.values()
+            )
+            return
+        for user in default_users:
+            self.__create_sync(user)
 
     async def create(self, user: UserToCreate) -> User:
         return self.__create_sync(user)
 
-    def __create_sync(self, user: UserToCreate) -> User:
-        if user.login in self.__login_to_user:
+    async def create_many(
+        self,
+        users: Sequence[UserToCreate],
+    ) -> List[Union[User, UserAlreadyExistsException]]:
+        now = datetime.now()
+        results: List[Union[User, UserAlreadyExistsException]] = []
+        for user in users:
+            if user.login in self.__login_to_record:
+                results.append(UserAlreadyExistsException(user.login))
+            else:
+                results.append(self.__create_sync(user, now))
+        return results
+
+    def __create_sync(self, user: UserToCreate, now: Optional[datetime] = None) -> User:
+        if user.login in self.__login_to_record:
             raise UserAlreadyExistsException(user.login)
 
-        now = datetime.now()
-        private_user = PrivateUser(
+        if now is None:
+            now = datetime.now()
+        record = UserRecord(
             id=uuid4(),
             created_at=now,
             updated_at=now,
@@ -58,46 +156,116 @@ class InMemoryUserRepository(UserRepository):
             password=user.password,
             role=user.role,
         )
-        self.__id_to_user[private_user.id] = private_user
-        self.__login_to_user[private_user.login] = private_user
-        return convert_private_user_to_user(private_user)
+        self.__id_to_record[record.id] = record
+        self.__login_to_record[record.login] = record
+        insort(self.__cursors, (record.created_at, record.id))
+        return record.get_user()
 
     async def update(self, id: UUID, user: UserToUpdate) -> User:
         try:
-            private_user = self.__id_to_user[id]
+            record = self.__id_to_record[id]
         except KeyError:
             raise UserNotFoundByIdException(id) from None
 
-        if user.login != private_user.login:
-            del self.__login_to_user[private_user.login]
-            self.__login_to_user[user.login] = private_user
-
-        private_user.updated_at = datetime.now()
-        private_user.login = user.login
-        private_user.password = user.password
-        private_user.role = user.role
-        return convert_private_user_to_user(private_user)
+        updated_record = UserRecord(
+            id=record.id,
+            created_at=record.created_at,
+            updated_at=datetime.now(),
+            login=user.login,
+            password=user.password,
+            role=user.role,
+        )
+        del self.__login_to_record[record.login]
+        self.__login_to_record[updated_record.login] = updated_record
+        self.__id_to_record[id] = updated_record
+        return updated_record.get_user()
 
     async def delete(self, id: UUID) -> User:
+        return self.delete_record(id).get_user()
+
+    def get_records(self) -> List[UserRecord]:
+        return list(self.__id_to_record.values())
+
+    def get_record_by_id(self, id: UUID) -> UserRecord:
         try:
-            private_user = self.__id_to_user.pop(id)
+            return self.__id_to_record[id]
         except KeyError:
             raise UserNotFoundByIdException(id) from None
-        del self.__login_to_user[private_user.login]
-        return convert_private_user_to_user(private_user)
 
-    async def get_by_id(self, id: UUID) -> User:
+    def get_record_by_login(self, login: str) -> UserRecord:
         try:
-            private_user = self.__id_to_user[id]
+            return self.__login_to_record[login]
         except KeyError:
-            raise UserNotFoundByIdException(id) from None
-        return convert_private_user_to_user(private_user)
+            raise UserNotFoundByLoginException(login) from None
 
-    async def get_by_login(self, login: str) -> PrivateUser:
+    def put_record(self, record: UserRecord) -> None:
+        previous_record = self.__id_to_record.get(record.id)
+        if previous_record is None:
+            insort(self.__cursors, (record.created_at, record.id))
+        else:
+            del self.__login_to_record[previous_record.login]
+        self.__id_to_record[record.id] = record
+        self.__login_to_record[record.login] = record
+
+    def delete_record(self, id: UUID) -> UserRecord:
         try:
-            return self.__login_to_user[login]
+            record = self.__id_to_record.pop(id)
         except KeyError:
-            raise UserNotFoundByLoginException(login) from None
+            raise UserNotFoundByIdException(id) from None
+        del self.__login_to_record[record.login]
+        del self.__cursors[bisect_left(self.__cursors, (record.created_at, record.id))]
+        return record
+
+    async def get_by_id(self, id: UUID) -> User:
+        return self.get_record_by_id(id).get_user()
+
+    async def get_by_login(self, login: str) -> PrivateUser:
+        return self.get_record_by_login(login).get_private_user()
+
+    async def get_many_by_ids(
+        self,
+        ids: Sequence[UUID],
+    ) -> List[Union[User, UserNotFoundByIdException]]:
+        results: List[Union[User, UserNotFoundByIdException]] = []
+        for id in ids:
+            record = self.__id_to_record.get(id)
+            if record is None:
+                results.append(UserNotFoundByIdException(id))
+            else:
+                results.append(record.get_user())
+        return results
+
+    async def get_many_by_logins(
+        self,
+        logins: Sequence[str],
+    ) -> List[Union[PrivateUser, UserNotFoundByLoginException]]:
+        results: List[Union[PrivateUser, UserNotFoundByLoginException]] = []
+        for login in logins:
+            record = self.__login_to_record.get(login)
+            if record is None:
+                results.append(UserNotFoundByLoginException(login))
+            else:
+                results.append(record.get_private_user())
+        return results
+
+    async def list(self, after: Optional[UserCursor] = None, limit: int = 100) -> List[User]:
+        start = 0 if after is None else bisect_right(self.__cursors, after)
+        return [
+            self.__id_to_record[id].get_user() for _, id in self.__cursors[start : start + limit]
+        ]
+
+    async def iterate(
+        self,
+        after: Optional[UserCursor] = None,
+        batch_size: int = 100,
+    ) -> AsyncIterator[User]:
+        while True:
+            users = await self.list(after, batch_size)
+            for user in users:
+                yield user
+            if len(users) < batch_size:
+                return
+            after = (users[-1].created_at, users[-1].id)
 
 
 def load() -> None:
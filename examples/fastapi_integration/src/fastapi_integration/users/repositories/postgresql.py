@@ -1,10 +1,15 @@
 from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
 from uuid import UUID
 
 from asyncpg import Record
 from asyncpg.exceptions import UniqueViolationError
-from asyncpg.pool import Pool
-from fastapi_integration.databases.postgresql import ConnectionPoolFactory
+from fastapi_integration.batch_loader import BatchLoader
+from fastapi_integration.databases.postgresql import (
+    StatementExecutor,
+    StatementExecutorFactory,
+)
+from fastapi_integration.models import construct_trusted
 from fastapi_integration.users.models import (
     PrivateUser,
     User,
@@ -13,6 +18,7 @@ from fastapi_integration.users.models import (
 )
 from fastapi_integration.users.repositories import (
     UserAlreadyExistsException,
+    UserCursor,
     UserNotFoundByIdException,
     UserNotFoundByLoginException,
     UserRepository,
@@ -26,90 +32,238 @@ __all__ = [
 
 
 class PostgreSQLUserRepository(UserRepository):
-    def __init__(self, connection_pool: Pool) -> None:
-        self.__connection_pool = connection_pool
-
-    async def create(self, user: UserToCreate) -> User:
-        query = """
+    def __init__(self, statement_executor: StatementExecutor, max_batch_size: int = 1000) -> None:
+        self.__statement_executor = statement_executor
+        self.__id_loader: BatchLoader[UUID, User] = BatchLoader(
+            self.get_many_by_ids, max_batch_size
+        )
+        self.__login_loader: BatchLoader[str, PrivateUser] = BatchLoader(
+            self.get_many_by_logins, max_batch_size
+        )
+        statement_executor.add_statement(
+            "users.create",
+            """
             insert into "users" ("login", "password", "role")
             values ($1, $2, $3)
             returning "id", "created_at", "updated_at", "login", "role"
-        """
-        async with self.__connection_pool.acquire() as connection:
+            """,
+        )
+        statement_executor.add_statement(
+            "users.update",
+            """
+            update "users"
+            set "updated_at" = $1, "login" = $2, "password" = $3, "role" = $4
+            where "id" = $5
+            returning "id", "created_at", "updated_at", "login", "role"
+            """,
+        )
+        statement_executor.add_statement(
+            "users.delete",
+            """
+            delete from "users"
+            where "id" = $1
+            returning "id", "created_at", "updated_at", "login", "role"
+            """,
+        )
+        statement_executor.add_statement(
+            "users.get_many_by_ids",
+            """
+            select "id", "created_at", "updated_at", "login", "role" from "users"
+            where "id" = any($1::uuid[])
+            """,
+        )
+        statement_executor.add_statement(
+            "users.get_many_by_logins",
+            """
+            select "id", "created_at", "updated_at", "login", "password", "role" from "users"
+            where "login" = any($1::varchar[])
+            """,
+        )
+        statement_executor.add_statement(
+            "users.list",
+            """
+            select "id", "created_at", "updated_at", "login", "role" from "users"
+            order by "created_at", "id"
+            limit $1
+            """,
+        )
+        statement_executor.add_statement(
+            "users.list_after",
+            """
+            select "id", "created_at", "updated_at", "login", "role" from "users"
+            where ("created_at", "id") > ($1, $2)
+            order by "created_at", "id"
+            limit $3
+            """,
+        )
+
+    async def create(self, user: UserToCreate) -> User:
+        async with self.__statement_executor.acquire() as connection:
             try:
-                record = await connection.fetchrow(query, user.login, user.password, user.role)
+                record = await self.__statement_executor.fetchrow(
+                    connection, "users.create", user.login, user.password, user.role
+                )
             except UniqueViolationError:
                 raise UserAlreadyExistsException(user.login) from None
         return self.__record_to_user(record)
 
-    async def update(self, id: UUID, user: UserToUpdate) -> User:
-        query = """
-            update "users"
-            set "updated_at" = $1, "login" = $2, "password" = $3, "role" = $4
-            where "id" = $5
+    async def create_many(
+        self,
+        users: Sequence[UserToCreate],
+    ) -> List[Union[User, UserAlreadyExistsException]]:
+        create_staging_table_query = """
+            create temporary table "users_to_create"
+            (
+                "ordinal" integer not null,
+                "login" varchar not null,
+                "password" varchar not null,
+                "role" varchar not null
+            )
+            on commit drop
+        """
+        merge_query = """
+            insert into "users" ("login", "password", "role")
+            select distinct on ("login") "login", "password", "role" from "users_to_create"
+            order by "login", "ordinal"
+            on conflict ("login") do nothing
             returning "id", "created_at", "updated_at", "login", "role"
         """
-        async with self.__connection_pool.acquire() as connection:
-            record = await connection.fetchrow(
-                query, datetime.now(), user.login, user.password, user.role, id
+        records = [(i, user.login, user.password, user.role) for i, user in enumerate(users)]
+        async with self.__statement_executor.acquire() as connection:
+            async with connection.transaction():
+                await connection.execute(create_staging_table_query)
+                await connection.copy_records_to_table(
+                    "users_to_create",
+                    records=records,
+                    columns=["ordinal", "login", "password", "role"],
+                )
+                created_records = await connection.fetch(merge_query)
+        login_to_user: Dict[str, User] = {}
+        for record in created_records:
+            created_user = self.__record_to_user(record)
+            login_to_user[created_user.login] = created_user
+        results: List[Union[User, UserAlreadyExistsException]] = []
+        for user in users:
+            if user.login in login_to_user:
+                results.append(login_to_user.pop(user.login))
+            else:
+                results.append(UserAlreadyExistsException(user.login))
+        return results
+
+    async def update(self, id: UUID, user: UserToUpdate) -> User:
+        async with self.__statement_executor.acquire() as connection:
+            record = await self.__statement_executor.fetchrow(
+                connection,
+                "users.update",
+                datetime.now(),
+                user.login,
+                user.password,
+                user.role,
+                id,
             )
         if record is None:
             raise UserNotFoundByIdException(id)
         return self.__record_to_user(record)
 
     async def delete(self, id: UUID) -> User:
-        query = """
-            delete from "users"
-            where "id" = $1
-            returning "id", "created_at", "updated_at", "login", "role"
-        """
-        async with self.__connection_pool.acquire() as connection:
-            record = await connection.fetchrow(query, id)
+        async with self.__statement_executor.acquire() as connection:
+            record = await self.__statement_executor.fetchrow(connection, "users.delete", id)
         if record is None:
             raise UserNotFoundByIdException(id)
         return self.__record_to_user(record)
 
     async def get_by_id(self, id: UUID) -> User:
-        query = """
-            select "id", "created_at", "updated_at", "login", "role" from "users"
-            where "id" = $1
-        """
-        async with self.__connection_pool.acquire() as connection:
-            record = await connection.fetchrow(query, id)
-        if record is None:
-            raise UserNotFoundByIdException(id)
-        return self.__record_to_user(record)
+        return await self.__id_loader.load(id)
 
     async def get_by_login(self, login: str) -> PrivateUser:
-        query = """
-            select "id", "created_at", "updated_at", "login", "password", "role" from "users"
-            where "login" = $1
-        """
-        async with self.__connection_pool.acquire() as connection:
-            record = await connection.fetchrow(query, login)
-        if record is None:
-            raise UserNotFoundByLoginException(login)
-        return self.__record_to_private_user(record)
+        return await self.__login_loader.load(login)
+
+    async def get_many_by_ids(
+        self,
+        ids: Sequence[UUID],
+    ) -> List[Union[User, UserNotFoundByIdException]]:
+        async with self.__statement_executor.acquire() as connection:
+            records = await self.__statement_executor.fetch(
+                connection, "users.get_many_by_ids", list(ids)
+            )
+        id_to_user: Dict[UUID, User] = {}
+        for record in records:
+            user = self.__record_to_user(record)
+            id_to_user[user.id] = user
+        return [id_to_user.get(id) or UserNotFoundByIdException(id) for id in ids]
+
+    async def get_many_by_logins(
+        self,
+        logins: Sequence[str],
+    ) -> List[Union[PrivateUser, UserNotFoundByLoginException]]:
+        async with self.__statement_executor.acquire() as connection:
+            records = await self.__statement_executor.fetch(
+                connection, "users.get_many_by_logins", list(logins)
+            )
+        login_to_user: Dict[str, PrivateUser] = {}
+        for record in records:
+            private_user = self.__record_to_private_user(record)
+            login_to_user[private_user.login] = private_user
+        return [login_to_user.get(login) or UserNotFoundByLoginException(login) for login in logins]
+
+    async def list(self, after: Optional[UserCursor] = None, limit: int = 100) -> List[User]:
+        async with self.__statement_executor.acquire() as connection:
+            if after is None:
+                records = await self.__statement_executor.fetch(connection, "users.list", limit)
+            else:
+                records = await self.__statement_executor.fetch(
+                    connection, "users.list_after", *after, limit
+                )
+        return [self.__record_to_user(record) for record in records]
+
+    async def iterate(
+        self,
+        after: Optional[UserCursor] = None,
+        batch_size: int = 100,
+    ) -> AsyncIterator[User]:
+        if after is None:
+            query = """
+                select "id", "created_at", "updated_at", "login", "role" from "users"
+                order by "created_at", "id"
+            """
+            args: Tuple[Any, ...] = ()
+        else:
+            query = """
+                select "id", "created_at", "updated_at", "login", "role" from "users"
+                where ("created_at", "id") > ($1, $2)
+                order by "created_at", "id"
+            """
+            args = after
+        async with self.__statement_executor.acquire() as connection:
+            async with connection.transaction():
+                async for record in connection.cursor(query, *args, prefetch=batch_size):
+                    yield self.__record_to_user(record)
 
     @staticmethod
     def __record_to_user(record: Record) -> User:
-        return User(
-            id=record["id"],
-            created_at=record["created_at"],
-            updated_at=record["updated_at"],
-            login=record["login"],
-            role=record["role"],
+        return construct_trusted(
+            User,
+            {
+                "id": record["id"],
+                "created_at": record["created_at"],
+                "updated_at": record["updated_at"],
+                "login": record["login"],
+                "role": record["role"],
+            },
         )
 
     @staticmethod
     def __record_to_private_user(record: Record) -> PrivateUser:
-        return PrivateUser(
-            id=record["id"],
-            created_at=record["created_at"],
-            updated_at=record["updated_at"],
-            login=record["login"],
-            password=record["password"],
-            role=record["role"],
+        return construct_trusted(
+            PrivateUser,
+            {
+                "id": record["id"],
+                "created_at": record["created_at"],
+                "updated_at": record["updated_at"],
+                "login": record["login"],
+                "password": record["password"],
+                "role": record["role"],
+            },
         )
 
 
@@ -118,8 +272,8 @@ def load() -> None:
         def __call__(self) -> UserRepository:
             return repository
 
-    connection_pool_factory = get_factory(ConnectionPoolFactory)
-    connection_pool = connection_pool_factory()
+    statement_executor_factory = get_factory(StatementExecutorFactory)
+    statement_executor = statement_executor_factory()
 
-    repository = PostgreSQLUserRepository(connection_pool)
+    repository = PostgreSQLUserRepository(statement_executor)
     add_factory(UserRepositoryFactory, PostgreSQLUserRepositoryFactory())
@@ -1,9 +1,13 @@
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
 from uuid import UUID
 
-from fastapi.param_functions import Depends
+from fastapi.param_functions import Depends, Query
+from fastapi.responses import Response, StreamingResponse
 from fastapi.routing import APIRouter
 from fastapi_integration.app import AppFactory
 from fastapi_integration.current_user_resolvers import CurrentUserResolverFactory
+from fastapi_integration.json_renderers import JsonRendererFactory
 from fastapi_integration.users.models import User, UserToCreate, UserToUpdate
 from fastapi_integration.users.services import UserServiceFactory
 from galo_ioc import get_factory
@@ -20,26 +24,54 @@ def load() -> None:
     current_user_resolver = current_user_resolver_factory()
     service_factory = get_factory(UserServiceFactory)
     service = service_factory()
+    renderer_factory = get_factory(JsonRendererFactory)
+    renderer = renderer_factory()
     router = APIRouter(dependencies=[Depends(current_user_resolver)])
 
     @router.post("/users")
-    async def create_user(user: UserToCreate) -> User:
-        return await service.create(user)
+    async def create_user(user: UserToCreate) -> Response:
+        return renderer.render(await service.create(user))
+
+    @router.post("/users:bulk")
+    async def create_users(users: List[UserToCreate]) -> Response:
+        return renderer.render(await service.create_many(users))
 
     @router.put("/users/{id}")
-    async def update_user(id: UUID, user: UserToUpdate) -> User:
-        return await service.update(id, user)
+    async def update_user(id: UUID, user: UserToUpdate) -> Response:
+        return renderer.render(await service.update(id, user))
 
     @router.delete("/users/{id}")
-    async def delete_user(id: UUID) -> User:
-        return await service.delete(id)
+    async def delete_user(id: UUID) -> Response:
+        return renderer.render(await service.delete(id))
 
     @router.get("/users/{id}")
-    async def get_user_by_id(id: UUID) -> User:
-        return await service.get_by_id(id)
+    async def get_user_by_id(id: UUID) -> Response:
+        return renderer.render(await service.get_by_id(id))
+
+    @router.get("/users")
+    async def get_users(
+        after_created_at: Optional[datetime] = None,
+        after_id: Optional[UUID] = None,
+        batch_size: int = Query(100, ge=1, le=10000),
+    ) -> StreamingResponse:
+        after = None
+        if after_created_at is not None and after_id is not None:
+            after = (after_created_at, after_id)
+
+        async def generate_chunks() -> AsyncIterator[bytes]:
+            lines: List[bytes] = []
+            async for user in service.iterate(after, batch_size):
+                lines.append(renderer.dumps(user))
+                if len(lines) >= batch_size:
+                    yield b"\n".join(lines) + b"\n"
+                    lines.clear()
+            if lines:
+                yield b"\n".join(lines) + b"\n"
+
+        return StreamingResponse(generate_chunks(), media_type="application/x-ndjson")
 
     @router.get("/whoami")
-    async def get_current_user(user: User = Depends(current_user_resolver)) -> User:
-        return user
+    async def get_current_user(user: User = Depends(current_user_resolver)) -> Response:
+        return renderer.render(user)
 
     app.include_router(router)
@@ -1,6 +1,13 @@
+from typing import AsyncIterator, List, Optional, Sequence
 from uuid import UUID
 
-from fastapi_integration.users.models import User, UserToCreate, UserToUpdate
+from fastapi_integration.users.models import (
+    User,
+    UserCreationResult,
+    UserToCreate,
+    UserToUpdate,
+)
+from fastapi_integration.users.repositories import UserCursor
 
 __all__ = [
     "UserServiceException",
@@ -17,6 +24,9 @@ class UserService:
     async def create(self, user: UserToCreate) -> User:
         raise NotImplementedError()
 
+    async def create_many(self, users: Sequence[UserToCreate]) -> List[UserCreationResult]:
+        raise NotImplementedError()
+
     async def update(self, id: UUID, user: UserToUpdate) -> User:
         raise NotImplementedError()
 
@@ -26,6 +36,14 @@ class UserService:
     async def get_by_id(self, id: UUID) -> User:
         raise NotImplementedError()
 
+    async def list(self, after: Optional[UserCursor] = None, limit: int = 100) -> List[User]:
+        raise NotImplementedError()
+
+    def iterate(
+        self, after: Optional[UserCursor] = None, batch_size: int = 100
+    ) -> AsyncIterator[User]:
+        raise NotImplementedError()
+
 
 class UserServiceFactory:
     def __call__(self) -> UserService:
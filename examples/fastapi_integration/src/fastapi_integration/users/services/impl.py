@@ -1,7 +1,21 @@
+from asyncio import gather
+from typing import AsyncIterator, List, Optional, Sequence, Union
 from uuid import UUID
 
-from fastapi_integration.users.models import User, UserToCreate, UserToUpdate
-from fastapi_integration.users.repositories import UserRepository, UserRepositoryFactory
+from fastapi_integration.password_hashers import PasswordHasher, PasswordHasherFactory
+from fastapi_integration.users.models import (
+    User,
+    UserCreationResult,
+    UserToCreate,
+    UserToUpdate,
+)
+from fastapi_integration.users.repositories import (
+    UserAlreadyExistsException,
+    UserCursor,
+    UserNotFoundByLoginException,
+    UserRepository,
+    UserRepositoryFactory,
+)
 from fastapi_integration.users.services import UserService, UserServiceFactory
 from galo_ioc import add_factory, get_factory
 
@@ -12,14 +26,49 @@ __all__ = [
 
 
 class UserServiceImpl(UserService):
-    def __init__(self, repository: UserRepository) -> None:
+    def __init__(self, repository: UserRepository, password_hasher: PasswordHasher) -> None:
         self.__repository = repository
+        self.__password_hasher = password_hasher
 
     async def create(self, user: UserToCreate) -> User:
-        return await self.__repository.create(user)
+        password_hash = await self.__password_hasher.hash(user.password)
+        return await self.__repository.create(user.copy(update={"password": password_hash}))
+
+    async def create_many(self, users: Sequence[UserToCreate]) -> List[UserCreationResult]:
+        existing_users = await self.__repository.get_many_by_logins([user.login for user in users])
+        logins = {
+            existing_user.login
+            for existing_user in existing_users
+            if not isinstance(existing_user, UserNotFoundByLoginException)
+        }
+        indexes: List[int] = []
+        for index, user in enumerate(users):
+            if user.login not in logins:
+                logins.add(user.login)
+                indexes.append(index)
+
+        password_hashes = await gather(
+            *(self.__password_hasher.hash(users[index].password) for index in indexes)
+        )
+        results: List[Union[User, UserAlreadyExistsException, None]] = [None] * len(users)
+        created_users = await self.__repository.create_many(
+            [
+                users[index].copy(update={"password": password_hash})
+                for index, password_hash in zip(indexes, password_hashes)
+            ]
+        )
+        for index, created_user in zip(indexes, created_users):
+            results[index] = created_user
+        return [
+            UserCreationResult(login=user.login, user=result)
+            if isinstance(result, User)
+            else UserCreationResult(login=user.login, already_exists=True)
+            for user, result in zip(users, results)
+        ]
 
     async def update(self, id: UUID, user: UserToUpdate) -> User:
-        return await self.__repository.update(id, user)
+        password_hash = await self.__password_hasher.hash(user.password)
+        return await self.__repository.update(id, user.copy(update={"password": password_hash}))
 
     async def delete(self, id: UUID) -> User:
         return await self.__repository.delete(id)
@@ -27,6 +76,16 @@ class UserServiceImpl(UserService):
     async def get_by_id(self, id: UUID) -> User:
         return await self.__repository.get_by_id(id)
 
+    async def list(self, after: Optional[UserCursor] = None, limit: int = 100) -> List[User]:
+        return await self.__repository.list(after, limit)
+
+    def iterate(
+        self,
+        after: Optional[UserCursor] = None,
+        batch_size: int = 100,
+    ) -> AsyncIterator[User]:
+        return self.__repository.iterate(after, batch_size)
+
 
 def load() -> None:
     class UserServiceFactoryImpl(UserServiceFactory):
@@ -35,5 +94,7 @@ def load() -> None:
 
     repository_factory = get_factory(UserRepositoryFactory)
     repository = repository_factory()
-    service = UserServiceImpl(repository)
+    password_hasher_factory = get_factory(PasswordHasherFactory)
+    password_hasher = password_hasher_factory()
+    service = UserServiceImpl(repository, password_hasher)
     add_factory(UserServiceFactory, UserServiceFactoryImpl())
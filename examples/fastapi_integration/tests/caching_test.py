@@ -0,0 +1,64 @@
+from asyncio import CancelledError, Event, create_task, gather, run, sleep
+
+import pytest
+from fastapi_integration.users.repositories.caching import ReadThroughCache
+
+
+def test_concurrent_gets_share_one_load() -> None:
+    async def main() -> None:
+        cache: ReadThroughCache[str, int] = ReadThroughCache(max_size=10, ttl=60.0)
+        loads = 0
+
+        async def load() -> int:
+            nonlocal loads
+            loads += 1
+            await sleep(0)
+            return 42
+
+        assert await gather(*(cache.get("key", load) for _ in range(3))) == [42, 42, 42]
+        assert await cache.get("key", load) == 42
+        assert loads == 1
+
+    run(main())
+
+
+def test_leader_cancellation_does_not_cancel_followers() -> None:
+    async def main() -> None:
+        cache: ReadThroughCache[str, int] = ReadThroughCache(max_size=10, ttl=60.0)
+        started = Event()
+        release = Event()
+
+        async def load() -> int:
+            started.set()
+            await release.wait()
+            return 42
+
+        leader = create_task(cache.get("key", load))
+        await started.wait()
+        follower = create_task(cache.get("key", load))
+        await sleep(0)
+        leader.cancel()
+        with pytest.raises(CancelledError):
+            await leader
+        release.set()
+        assert await follower == 42
+        assert await cache.get("key", load) == 42
+
+    run(main())
+
+
+def test_failed_load_is_not_cached() -> None:
+    async def main() -> None:
+        cache: ReadThroughCache[str, int] = ReadThroughCache(max_size=10, ttl=60.0)
+
+        async def fail() -> int:
+            raise ValueError()
+
+        async def load() -> int:
+            return 42
+
+        with pytest.raises(ValueError):
+            await cache.get("key", fail)
+        assert await cache.get("key", load) == 42
+
+    run(main())
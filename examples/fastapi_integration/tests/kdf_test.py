@@ -0,0 +1,29 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi_integration.password_hashers.kdf import KdfPasswordHasher
+from fastapi_integration.users.repositories.in_memory import default_users
+
+
+@pytest.mark.parametrize("algorithm", ["pbkdf2_sha256", "scrypt"])
+def test_verify(algorithm: str) -> None:
+    with ThreadPoolExecutor() as executor:
+        password_hasher = KdfPasswordHasher(executor, algorithm, pbkdf2_iterations=1000)
+        password_hash = password_hasher.hash_sync("password")
+        assert password_hasher.verify_sync("password", password_hash)
+        assert not password_hasher.verify_sync("wrong password", password_hash)
+
+
+@pytest.mark.parametrize("password_hash", ["password", "md5$password", "scrypt$1$2$3"])
+def test_unknown_format_fails_verification(password_hash: str) -> None:
+    with ThreadPoolExecutor() as executor:
+        password_hasher = KdfPasswordHasher(executor)
+        assert not password_hasher.verify_sync("password", password_hash)
+        assert not password_hasher.verify_sync(password_hash, password_hash)
+
+
+def test_default_users_have_password_hashes() -> None:
+    with ThreadPoolExecutor() as executor:
+        password_hasher = KdfPasswordHasher(executor)
+        for user in default_users:
+            assert password_hasher.verify_sync(user.login, user.password)
@@ -0,0 +1,170 @@
+import logging
+import os
+from logging import Handler, LogRecord, StreamHandler
+from logging.handlers import QueueHandler
+from queue import Empty, Full, Queue
+from threading import Event, Lock, Thread
+from typing import List, Optional, Sequence
+
+from galo_ioc import add_exit_callback
+
+__all__ = [
+    "BoundedQueueHandler",
+    "BatchingQueueListener",
+    "load",
+]
+
+
+overflow_policies = ("drop_new", "drop_old", "block")
+
+
+class BoundedQueueHandler(QueueHandler):
+    def __init__(
+        self,
+        queue: "Queue[Optional[LogRecord]]",
+        overflow_policy: str = "drop_new",
+        enqueue_timeout: Optional[float] = None,
+    ) -> None:
+        if overflow_policy not in overflow_policies:
+            raise ValueError(f"Invalid overflow policy: overflow_policy={overflow_policy!r}.")
+        super().__init__(queue)
+        self.__queue = queue
+        self.__overflow_policy = overflow_policy
+        self.__enqueue_timeout = enqueue_timeout
+        self.__dropped_count_lock = Lock()
+        self.__dropped_count = 0
+
+    @property
+    def dropped_count(self) -> int:
+        return self.__dropped_count
+
+    def enqueue(self, record: LogRecord) -> None:
+        try:
+            if self.__overflow_policy == "block":
+                self.__queue.put(record, timeout=self.__enqueue_timeout)
+                return
+            try:
+                self.__queue.put_nowait(record)
+                return
+            except Full:
+                if self.__overflow_policy == "drop_new":
+                    raise
+            try:
+                self.__queue.get_nowait()
+            except Empty:
+                pass
+            self.__increment_dropped_count()
+            self.__queue.put_nowait(record)
+        except Full:
+            self.__increment_dropped_count()
+
+    def __increment_dropped_count(self) -> None:
+        with self.__dropped_count_lock:
+            self.__dropped_count += 1
+
+
+class BatchingQueueListener:
+    def __init__(
+        self,
+        queue: "Queue[Optional[LogRecord]]",
+        handlers: Sequence[Handler],
+        batch_size: int = 100,
+    ) -> None:
+        self.__queue = queue
+        self.__handlers = list(handlers)
+        self.__batch_size = batch_size
+        self.__thread: Optional[Thread] = None
+        self.__stopped = Event()
+
+    def start(self) -> None:
+        self.__stopped.clear()
+        self.__thread = Thread(target=self.__run, name="queued-logging-listener", daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        if self.__thread is None:
+            return
+        self.__stopped.set()
+        try:
+            self.__queue.put_nowait(None)
+        except Full:
+            pass
+        self.__thread.join()
+        self.__thread = None
+
+    def __run(self) -> None:
+        while not self.__stopped.is_set():
+            record = self.__queue.get()
+            self.__handle_records(self.__get_records([record], self.__batch_size))
+        self.__handle_records(self.__get_records([], self.__queue.qsize()))
+
+    def __get_records(
+        self,
+        records: List[Optional[LogRecord]],
+        max_count: int,
+    ) -> List[LogRecord]:
+        while len(records) < max_count:
+            try:
+                records.append(self.__queue.get_nowait())
+            except Empty:
+                break
+        return [record for record in records if record is not None]
+
+    def __handle_records(self, records: List[LogRecord]) -> None:
+        for handler in self.__handlers:
+            self.__handle(handler, records)
+
+    @staticmethod
+    def __handle(handler: Handler, records: List[LogRecord]) -> None:
+        records = [
+            record
+            for record in records
+            if record.levelno >= handler.level and handler.filter(record)
+        ]
+        if not records:
+            return
+        if not isinstance(handler, StreamHandler) or handler.stream is None:
+            for record in records:
+                handler.handle(record)
+            return
+        try:
+            text = "".join(handler.format(record) + handler.terminator for record in records)
+        except Exception:
+            handler.handleError(records[0])
+            return
+        handler.acquire()
+        try:
+            handler.stream.write(text)
+            handler.flush()
+        except Exception:
+            handler.handleError(records[0])
+        finally:
+            handler.release()
+
+
+def load() -> None:
+    def stop_listener() -> None:
+        listener.stop()
+        root_logger.removeHandler(queue_handler)
+        for handler in handlers:
+            root_logger.addHandler(handler)
+
+    max_queue_size = int(os.getenv("LOGGING_QUEUE_MAX_SIZE", "10000"))
+    overflow_policy = os.getenv("LOGGING_QUEUE_OVERFLOW_POLICY", "drop_new")
+    enqueue_timeout = os.getenv("LOGGING_QUEUE_ENQUEUE_TIMEOUT")
+    batch_size = int(os.getenv("LOGGING_QUEUE_BATCH_SIZE", "100"))
+
+    root_logger = logging.getLogger()
+    handlers = list(root_logger.handlers)
+    queue: "Queue[Optional[LogRecord]]" = Queue(max_queue_size)
+    queue_handler = BoundedQueueHandler(
+        queue,
+        overflow_policy=overflow_policy,
+        enqueue_timeout=None if enqueue_timeout is None else float(enqueue_timeout),
+    )
+    listener = BatchingQueueListener(queue, handlers, batch_size)
+    for handler in handlers:
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(queue_handler)
+    listener.start()
+    add_exit_callback(stop_listener)
@@ -0,0 +1,91 @@
+from logging import INFO, Handler, LogRecord
+from queue import Queue
+from threading import Event, Thread
+from time import sleep
+from typing import List, Optional
+
+import pytest
+from loggers.queued import BatchingQueueListener, BoundedQueueHandler
+
+
+class RecordingHandler(Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: List[LogRecord] = []
+
+    def emit(self, record: LogRecord) -> None:
+        self.records.append(record)
+
+
+def make_record(message: str) -> LogRecord:
+    return LogRecord("test", INFO, __file__, 0, message, None, None)
+
+
+def test_listener_handles_queued_records() -> None:
+    queue: "Queue[Optional[LogRecord]]" = Queue(10)
+    handler = RecordingHandler()
+    queue_handler = BoundedQueueHandler(queue)
+    listener = BatchingQueueListener(queue, [handler], batch_size=3)
+    listener.start()
+    for i in range(5):
+        queue_handler.handle(make_record(str(i)))
+    listener.stop()
+    assert [record.msg for record in handler.records] == ["0", "1", "2", "3", "4"]
+
+
+class BlockingHandler(RecordingHandler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.entered = Event()
+        self.released = Event()
+
+    def emit(self, record: LogRecord) -> None:
+        self.entered.set()
+        self.released.wait()
+        super().emit(record)
+
+
+def test_stop_survives_dropping_oldest_records() -> None:
+    queue: "Queue[Optional[LogRecord]]" = Queue(2)
+    handler = BlockingHandler()
+    queue_handler = BoundedQueueHandler(queue, "drop_old")
+    listener = BatchingQueueListener(queue, [handler], batch_size=1)
+    listener.start()
+    queue_handler.handle(make_record("0"))
+    handler.entered.wait()
+    queue_handler.handle(make_record("1"))
+    stopping_thread = Thread(target=listener.stop, daemon=True)
+    stopping_thread.start()
+    while queue.qsize() < 2:
+        sleep(0.001)
+    queue_handler.handle(make_record("2"))
+    queue_handler.handle(make_record("3"))
+    handler.released.set()
+    stopping_thread.join(timeout=5)
+    assert not stopping_thread.is_alive()
+    assert [record.msg for record in handler.records] == ["0", "2", "3"]
+
+
+@pytest.mark.parametrize("overflow_policy", ["drop_new", "drop_old", "block"])
+def test_stop_while_logging_concurrently(overflow_policy: str) -> None:
+    def log() -> None:
+        while not logging_stopped.is_set():
+            queue_handler.handle(make_record("message"))
+
+    for _ in range(20):
+        queue: "Queue[Optional[LogRecord]]" = Queue(2)
+        handler = RecordingHandler()
+        queue_handler = BoundedQueueHandler(queue, overflow_policy, enqueue_timeout=0.01)
+        listener = BatchingQueueListener(queue, [handler], batch_size=1)
+        listener.start()
+        logging_stopped = Event()
+        threads = [Thread(target=log, daemon=True) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        stopping_thread = Thread(target=listener.stop, daemon=True)
+        stopping_thread.start()
+        stopping_thread.join(timeout=5)
+        logging_stopped.set()
+        for thread in threads:
+            thread.join()
+        assert not stopping_thread.is_alive()
@@ -2,21 +2,29 @@
 A lightweight Inversion of Control library implementing the Service Locator pattern.
 """
 
+from asyncio import Task, create_task, gather
 from contextvars import ContextVar, Token
+from inspect import Parameter, Signature
+from inspect import signature as inspect_signature
+from time import perf_counter
 from types import TracebackType
 from typing import (
     Any,
+    AsyncContextManager,
     Callable,
+    Coroutine,
     Dict,
     List,
     NamedTuple,
     Optional,
     Protocol,
+    Sequence,
     Set,
     Tuple,
     Type,
     TypeVar,
 )
+from weakref import WeakKeyDictionary
 
 __all__ = [
     "Args",
@@ -24,21 +32,28 @@ __all__ = [
     "Factory",
     "FactoryType",
     "T",
+    "AsyncHook",
+    "ExitCallback",
     "check_factory_type",
     "FactoryAlreadyAddedException",
     "FactoryNotFoundException",
     "FactoryDecorator",
     "FactoryContainer",
+    "ResolutionTracer",
     "NoFactoryContainerInContextException",
     "FactoryContainerContextManager",
     "add_factory",
     "add_factory_decorator",
+    "add_async_hook",
+    "add_exit_callback",
     "get_factory",
+    "get_factory_containers",
+    "create_task_with_factory_containers",
     "FactoryContainerImpl",
 ]
 
 
-__version__ = "0.15.0"
+__version__ = "0.16.0"
 
 
 Args = tuple
@@ -46,6 +61,8 @@ KwArgs = Dict[str, Any]
 FactoryType = type
 Factory = Callable
 T = TypeVar("T")
+AsyncHook = Callable[[], AsyncContextManager[Any]]
+ExitCallback = Callable[[], None]
 
 
 def check_factory_type(factory_type: FactoryType) -> None:
@@ -105,6 +122,12 @@ class FactoryContainer:
     def add_factory_decorator(self, factory_decorator: FactoryDecorator) -> None:
         raise NotImplementedError()
 
+    def add_async_hook(self, async_hook: AsyncHook, concurrent: bool = False) -> None:
+        raise NotImplementedError()
+
+    def add_exit_callback(self, exit_callback: ExitCallback) -> None:
+        raise NotImplementedError()
+
     def call_factory(
         self,
         factory_type: FactoryType,
@@ -114,6 +137,47 @@ class FactoryContainer:
     ) -> Any:
         raise NotImplementedError()
 
+    def resolve_factory(self, factory_type: FactoryType, id: Optional[str]) -> Factory:
+        return lambda *args, **kwargs: self.call_factory(factory_type, id, args, kwargs)
+
+    def get_factory_decorators(
+        self,
+        factory_type: FactoryType,
+        id: Optional[str],
+    ) -> Sequence[FactoryDecorator]:
+        return ()
+
+
+class ResolutionTracer:
+    def start_resolution(self, factory_type: FactoryType, id: Optional[str]) -> Any:
+        raise NotImplementedError()
+
+    def record_probe(
+        self,
+        resolution: Any,
+        factory_container: FactoryContainer,
+        found: bool,
+        duration: float,
+    ) -> None:
+        raise NotImplementedError()
+
+    def finish_resolution(self, resolution: Any, exception: Optional[BaseException]) -> None:
+        raise NotImplementedError()
+
+    def record_decoration(
+        self,
+        factory_type: FactoryType,
+        id: Optional[str],
+        factory_decorator: FactoryDecorator,
+        duration: float,
+    ) -> None:
+        raise NotImplementedError()
+
+
+resolution_tracer_var: ContextVar[Optional[ResolutionTracer]] = ContextVar(
+    "resolution_tracer", default=None
+)
+
 
 factory_containers_var: ContextVar[Tuple[FactoryContainer, ...]] = ContextVar(
     "factory_containers", default=()
@@ -128,6 +192,11 @@ class NoFactoryContainerInContextException(Exception):
 class FactoryContainerContextManager(FactoryContainer):
     def __init__(self) -> None:
         self.__token: Optional[Token[Tuple[FactoryContainer, ...]]] = None
+        self.__async_hooks: List[AsyncHook] = []
+        self.__concurrent_async_hooks: List[AsyncHook] = []
+        self.__entered_async_context_managers: List[AsyncContextManager[Any]] = []
+        self.__entered_concurrent_async_context_managers: List[AsyncContextManager[Any]] = []
+        self.__exit_callbacks: List[ExitCallback] = []
 
     def __enter__(self) -> None:
         self.__token = factory_containers_var.set((*factory_containers_var.get(), self))
@@ -138,8 +207,86 @@ class FactoryContainerContextManager(FactoryContainer):
         exception: Optional[BaseException],
         traceback: Optional[TracebackType],
     ) -> None:
+        exit_callbacks = self.__exit_callbacks
+        self.__exit_callbacks = []
+        first_exception: Optional[BaseException] = None
+        for exit_callback in reversed(exit_callbacks):
+            try:
+                exit_callback()
+            except BaseException as e:
+                if first_exception is None:
+                    first_exception = e
         if self.__token is not None:
             factory_containers_var.reset(self.__token)
+        if first_exception is not None:
+            raise first_exception
+
+    async def __aenter__(self) -> None:
+        self.__enter__()
+        try:
+            for async_hook in self.__async_hooks:
+                async_context_manager = async_hook()
+                await async_context_manager.__aenter__()
+                self.__entered_async_context_managers.append(async_context_manager)
+            async_context_managers = [async_hook() for async_hook in self.__concurrent_async_hooks]
+        except BaseException as e:
+            await self.__aexit__(type(e), e, e.__traceback__)
+            raise
+        results = await gather(
+            *(m.__aenter__() for m in async_context_managers),
+            return_exceptions=True,
+        )
+        self.__entered_concurrent_async_context_managers = [
+            async_context_manager
+            for async_context_manager, result in zip(async_context_managers, results)
+            if not isinstance(result, BaseException)
+        ]
+        for result in results:
+            if isinstance(result, BaseException):
+                await self.__aexit__(type(result), result, result.__traceback__)
+                raise result
+
+    async def __aexit__(
+        self,
+        exception_type: Optional[Type[BaseException]],
+        exception: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        concurrent_async_context_managers = self.__entered_concurrent_async_context_managers
+        self.__entered_concurrent_async_context_managers = []
+        async_context_managers = self.__entered_async_context_managers
+        self.__entered_async_context_managers = []
+        first_exception: Optional[BaseException] = None
+        try:
+            results = await gather(
+                *(
+                    m.__aexit__(exception_type, exception, traceback)
+                    for m in concurrent_async_context_managers
+                ),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException) and first_exception is None:
+                    first_exception = result
+            for async_context_manager in reversed(async_context_managers):
+                try:
+                    await async_context_manager.__aexit__(exception_type, exception, traceback)
+                except BaseException as e:
+                    if first_exception is None:
+                        first_exception = e
+        finally:
+            self.__exit__(exception_type, exception, traceback)
+        if first_exception is not None:
+            raise first_exception
+
+    def add_async_hook(self, async_hook: AsyncHook, concurrent: bool = False) -> None:
+        if concurrent:
+            self.__concurrent_async_hooks.append(async_hook)
+        else:
+            self.__async_hooks.append(async_hook)
+
+    def add_exit_callback(self, exit_callback: ExitCallback) -> None:
+        self.__exit_callbacks.append(exit_callback)
 
 
 def get_last_factory_container() -> FactoryContainer:
@@ -158,52 +305,349 @@ def add_factory_decorator(factory_decorator: FactoryDecorator) -> None:
     get_last_factory_container().add_factory_decorator(factory_decorator)
 
 
-def call_factory(factory_type: FactoryType, id: Optional[str], args: Args, kwargs: KwArgs) -> Any:
+def add_async_hook(async_hook: AsyncHook, concurrent: bool = False) -> None:
+    get_last_factory_container().add_async_hook(async_hook, concurrent)
+
+
+def add_exit_callback(exit_callback: ExitCallback) -> None:
+    get_last_factory_container().add_exit_callback(exit_callback)
+
+
+def get_factory_containers() -> Tuple[FactoryContainer, ...]:
+    return factory_containers_var.get()
+
+
+def create_task_with_factory_containers(
+    coroutine: Coroutine[Any, Any, T],
+    factory_containers: Tuple[FactoryContainer, ...],
+) -> "Task[T]":
+    async def run() -> T:
+        factory_containers_var.set(factory_containers)
+        return await coroutine
+
+    return create_task(run())
+
+
+def resolve_factory(factory_type: FactoryType, id: Optional[str]) -> Factory:
     factory_containers = factory_containers_var.get()
     if not factory_containers:
         raise NoFactoryContainerInContextException() from None
 
-    for factory_container in reversed(factory_containers):
+    resolution_tracer = resolution_tracer_var.get()
+    if resolution_tracer is not None:
+        return resolve_factory_with_tracing(resolution_tracer, factory_containers, factory_type, id)
+
+    for index in range(len(factory_containers) - 1, -1, -1):
+        factory_container = factory_containers[index]
+        if not overrides_resolve_factory(factory_container):
+            return make_call_factory(factory_containers[: index + 1], factory_type, id)
         try:
-            return factory_container.call_factory(factory_type, id, args, kwargs)
+            return factory_container.resolve_factory(factory_type, id)
         except FactoryNotFoundException:
             continue
     raise FactoryNotFoundException(factory_type, id) from None
 
 
+def overrides_resolve_factory(factory_container: FactoryContainer) -> bool:
+    return type(factory_container).resolve_factory is not FactoryContainer.resolve_factory
+
+
+def make_call_factory(
+    factory_containers: Tuple[FactoryContainer, ...],
+    factory_type: FactoryType,
+    id: Optional[str],
+) -> Factory:
+    def factory(*args: Any, **kwargs: Any) -> Any:
+        for factory_container in reversed(factory_containers):
+            try:
+                return factory_container.call_factory(factory_type, id, args, kwargs)
+            except FactoryNotFoundException:
+                continue
+        raise FactoryNotFoundException(factory_type, id) from None
+
+    return factory
+
+
+def resolve_factory_with_tracing(
+    resolution_tracer: ResolutionTracer,
+    factory_containers: Tuple[FactoryContainer, ...],
+    factory_type: FactoryType,
+    id: Optional[str],
+) -> Factory:
+    resolution = resolution_tracer.start_resolution(factory_type, id)
+    try:
+        for index in range(len(factory_containers) - 1, -1, -1):
+            factory_container = factory_containers[index]
+            start = perf_counter()
+            if not overrides_resolve_factory(factory_container):
+                factory = make_call_factory(factory_containers[: index + 1], factory_type, id)
+                duration = perf_counter() - start
+                resolution_tracer.record_probe(resolution, factory_container, True, duration)
+                break
+            try:
+                factory = factory_container.resolve_factory(factory_type, id)
+            except FactoryNotFoundException:
+                duration = perf_counter() - start
+                resolution_tracer.record_probe(resolution, factory_container, False, duration)
+                continue
+            duration = perf_counter() - start
+            resolution_tracer.record_probe(resolution, factory_container, True, duration)
+            break
+        else:
+            raise FactoryNotFoundException(factory_type, id) from None
+    except BaseException as e:
+        resolution_tracer.finish_resolution(resolution, e)
+        raise
+
+    def traced_factory(*args: Any, **kwargs: Any) -> Any:
+        exception: Optional[BaseException] = None
+        try:
+            return factory(*args, **kwargs)
+        except BaseException as e:
+            exception = e
+            raise
+        finally:
+            resolution_tracer.finish_resolution(resolution, exception)
+
+    return traced_factory
+
+
+def call_factory(factory_type: FactoryType, id: Optional[str], args: Args, kwargs: KwArgs) -> Any:
+    return resolve_factory(factory_type, id)(*args, **kwargs)
+
+
+class Missing:
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+missing = Missing()
+
+
+def call_factory_with_optional_arguments(
+    factory: Factory,
+    args: Args,
+    kwargs: KwArgs,
+    optional_arguments: Tuple[Tuple[str, Any, bool], ...],
+) -> Any:
+    positional_args = list(args)
+    can_pass_positionally = True
+    for name, value, is_positional in optional_arguments:
+        if value is missing:
+            if is_positional:
+                can_pass_positionally = False
+        elif is_positional and can_pass_positionally:
+            positional_args.append(value)
+        else:
+            kwargs[name] = value
+    return factory(*positional_args, **kwargs)
+
+
+FactoryProxyCallMaker = Callable[[FactoryType, Optional[str]], Callable[..., Any]]
+
+factory_proxy_call_internal_names = frozenset(
+    {
+        "galo_ioc_self",
+        "galo_ioc_factory_type",
+        "galo_ioc_id",
+        "galo_ioc_resolve_factory",
+        "galo_ioc_call_factory_with_optional_arguments",
+        "galo_ioc_missing",
+    }
+)
+factory_proxy_call_makers_by_source: Dict[str, FactoryProxyCallMaker] = {}
+factory_proxy_call_makers: "WeakKeyDictionary[FactoryType, FactoryProxyCallMaker]" = (
+    WeakKeyDictionary()
+)
+
+
+def make_generic_factory_proxy_call(
+    factory_type: FactoryType,
+    id: Optional[str],
+) -> Callable[..., Any]:
+    def __call__(self: Any, *args: Any, **kwargs: Any) -> Any:
+        return call_factory(factory_type, id, args, kwargs)
+
+    return __call__
+
+
+def generate_factory_proxy_call_source(signature: Signature) -> Optional[str]:
+    parameters = list(signature.parameters.values())[1:]
+    definitions: List[str] = ["galo_ioc_self"]
+    arguments: List[str] = []
+    positional_arguments: List[str] = []
+    keyword_arguments: List[str] = []
+    optional_arguments: List[str] = []
+    missing_conditions: List[str] = []
+    for index, parameter in enumerate(parameters):
+        name = parameter.name
+        kind = parameter.kind
+        if name in factory_proxy_call_internal_names:
+            return None
+        if kind in (Parameter.VAR_POSITIONAL, Parameter.VAR_KEYWORD):
+            return None
+        if kind == Parameter.KEYWORD_ONLY and "*" not in definitions:
+            definitions.append("*")
+        if parameter.default is Parameter.empty:
+            definitions.append(name)
+            if kind == Parameter.KEYWORD_ONLY:
+                arguments.append(f"{name}={name}")
+                keyword_arguments.append(f"{name!r}: {name}")
+            else:
+                arguments.append(name)
+                positional_arguments.append(f"{name}, ")
+        else:
+            definitions.append(f"{name}=galo_ioc_missing")
+            optional_arguments.append(f"({name!r}, {name}, {kind != Parameter.KEYWORD_ONLY}), ")
+            missing_conditions.append(f"{name} is galo_ioc_missing")
+        if kind == Parameter.POSITIONAL_ONLY and (
+            index + 1 == len(parameters) or parameters[index + 1].kind != Parameter.POSITIONAL_ONLY
+        ):
+            definitions.append("/")
+
+    factory = "galo_ioc_resolve_factory(galo_ioc_factory_type, galo_ioc_id)"
+    lines = [
+        "def make(galo_ioc_factory_type, galo_ioc_id):",
+        f"    def __call__({', '.join(definitions)}):",
+    ]
+    if missing_conditions:
+        lines += [
+            f"        if {' and '.join(missing_conditions)}:",
+            f"            return {factory}({', '.join(arguments)})",
+            "        return galo_ioc_call_factory_with_optional_arguments(",
+            f"            {factory},",
+            f"            ({''.join(positional_arguments)}),",
+            f"            {{{', '.join(keyword_arguments)}}},",
+            f"            ({''.join(optional_arguments)}),",
+            "        )",
+        ]
+    else:
+        lines.append(f"        return {factory}({', '.join(arguments)})")
+    lines.append("    return __call__")
+    return "\n".join(lines)
+
+
+def get_factory_proxy_call_maker(factory_type: FactoryType) -> FactoryProxyCallMaker:
+    try:
+        return factory_proxy_call_makers[factory_type]
+    except KeyError:
+        pass
+
+    try:
+        signature = inspect_signature(factory_type.__call__)
+    except (TypeError, ValueError):
+        source = None
+    else:
+        source = generate_factory_proxy_call_source(signature)
+
+    maker: FactoryProxyCallMaker
+    if source is None:
+        maker = make_generic_factory_proxy_call
+    else:
+        try:
+            maker = factory_proxy_call_makers_by_source[source]
+        except KeyError:
+            namespace: Dict[str, Any] = {
+                "galo_ioc_resolve_factory": resolve_factory,
+                "galo_ioc_call_factory_with_optional_arguments": (
+                    call_factory_with_optional_arguments
+                ),
+                "galo_ioc_missing": missing,
+            }
+            exec(compile(source, "<galo_ioc factory proxy>", "exec"), namespace)  # nosec
+            maker = namespace["make"]
+            factory_proxy_call_makers_by_source[source] = maker
+    factory_proxy_call_makers[factory_type] = maker
+    return maker
+
+
 def get_factory(factory_type: Type[T], id: Optional[str] = None) -> T:
     class Factory(factory_type):  # type: ignore
-        def __call__(self, *args: Any, **kwargs: Any) -> Any:
-            return call_factory(factory_type, id, args, kwargs)
+        __call__ = get_factory_proxy_call_maker(factory_type)(factory_type, id)
 
     return Factory()
 
 
+def decorate_factory(
+    factory_decorator: FactoryDecorator,
+    factory_type: FactoryType,
+    id: Optional[str],
+    factory: Factory,
+) -> Factory:
+    resolution_tracer = resolution_tracer_var.get()
+    if resolution_tracer is None:
+        return factory_decorator(factory_type, id, factory)
+    start = perf_counter()
+    factory = factory_decorator(factory_type, id, factory)
+    duration = perf_counter() - start
+    resolution_tracer.record_decoration(factory_type, id, factory_decorator, duration)
+    return factory
+
+
 class FactoryKey(NamedTuple):
     factory_type: FactoryType
     id: Optional[str]
 
 
 class FactoryContainerImpl(FactoryContainerContextManager):
-    def __init__(self) -> None:
+    def __init__(self, resolve_subclasses: bool = False) -> None:
         super().__init__()
         self.__factories: Dict[FactoryKey, Factory] = {}
         self.__factory_decorators: List[FactoryDecorator] = []
+        self.__applied_factory_decorators: Dict[FactoryKey, List[FactoryDecorator]] = {}
+        self.__resolve_subclasses = resolve_subclasses
+        self.__factory_index: Dict[FactoryKey, Optional[FactoryKey]] = {}
+        self.__shared = False
+
+    def fork(self) -> "FactoryContainerImpl":
+        factory_container = FactoryContainerImpl(self.__resolve_subclasses)
+        factory_container.__factories = self.__factories
+        factory_container.__factory_decorators = self.__factory_decorators
+        factory_container.__applied_factory_decorators = self.__applied_factory_decorators
+        factory_container.__factory_index = self.__factory_index
+        factory_container.__shared = True
+        self.__shared = True
+        return factory_container
+
+    def __unshare(self) -> None:
+        if not self.__shared:
+            return
+        self.__factories = dict(self.__factories)
+        self.__factory_decorators = list(self.__factory_decorators)
+        self.__applied_factory_decorators = {
+            factory_key: list(applied_factory_decorators)
+            for factory_key, applied_factory_decorators in self.__applied_factory_decorators.items()
+        }
+        self.__factory_index = {}
+        self.__shared = False
 
     def add_factory(self, factory_type: Type[T], factory: T, id: Optional[str] = None) -> None:
         factory_key = FactoryKey(factory_type, id)
         if factory_key in self.__factories:
             raise FactoryAlreadyAddedException(factory_type, id)
         check_factory_type(factory_type)
+        self.__unshare()
+        applied_factory_decorators: List[FactoryDecorator] = []
         for factory_decorator in self.__factory_decorators:
-            factory = factory_decorator(factory_type, id, factory)  # type: ignore
+            decorated_factory = decorate_factory(
+                factory_decorator, factory_type, id, factory  # type: ignore
+            )
+            if decorated_factory is not factory:
+                applied_factory_decorators.append(factory_decorator)
+            factory = decorated_factory  # type: ignore
         self.__factories[factory_key] = factory  # type: ignore
+        self.__applied_factory_decorators[factory_key] = applied_factory_decorators
+        self.__factory_index.clear()
 
     def add_factory_decorator(self, factory_decorator: FactoryDecorator) -> None:
+        self.__unshare()
         for factory_key in self.__factories.keys():
             factory_type, id = factory_key
             factory = self.__factories[factory_key]
-            self.__factories[factory_key] = factory_decorator(factory_type, id, factory)
+            decorated_factory = decorate_factory(factory_decorator, factory_type, id, factory)
+            if decorated_factory is not factory:
+                self.__applied_factory_decorators[factory_key].append(factory_decorator)
+            self.__factories[factory_key] = decorated_factory
         self.__factory_decorators.append(factory_decorator)
 
     def call_factory(
@@ -213,9 +657,54 @@ class FactoryContainerImpl(FactoryContainerContextManager):
         args: Args,
         kwargs: KwArgs,
     ) -> Any:
-        factory_key = FactoryKey(factory_type, id)
+        return self.resolve_factory(factory_type, id)(*args, **kwargs)
+
+    def resolve_factory(self, factory_type: FactoryType, id: Optional[str]) -> Factory:
+        if not self.__resolve_subclasses:
+            try:
+                return self.__factories[(factory_type, id)]  # type: ignore
+            except KeyError:
+                raise FactoryNotFoundException(factory_type, id) from None
+
+        return self.__factories[self.__resolve_factory_key(factory_type, id)]
+
+    def get_factory_decorators(
+        self,
+        factory_type: FactoryType,
+        id: Optional[str],
+    ) -> Sequence[FactoryDecorator]:
+        factory_key = self.__resolve_factory_key(factory_type, id)
+        return tuple(self.__applied_factory_decorators[factory_key])
+
+    def __resolve_factory_key(self, factory_type: FactoryType, id: Optional[str]) -> FactoryKey:
         try:
-            factory = self.__factories[factory_key]
+            factory_key = self.__factory_index[(factory_type, id)]  # type: ignore
         except KeyError:
-            raise FactoryNotFoundException(factory_type, id) from None
-        return factory(*args, **kwargs)
+            factory_key = self.__find_factory_key(factory_type, id)
+            self.__factory_index[FactoryKey(factory_type, id)] = factory_key
+        if factory_key is None:
+            raise FactoryNotFoundException(factory_type, id)
+        return factory_key
+
+    def __find_factory_key(
+        self,
+        factory_type: FactoryType,
+        id: Optional[str],
+    ) -> Optional[FactoryKey]:
+        factory_key = FactoryKey(factory_type, id)
+        if factory_key in self.__factories:
+            return factory_key
+        if not self.__resolve_subclasses:
+            return None
+
+        best_factory_key: Optional[FactoryKey] = None
+        best_distance = 0
+        for registered_factory_key in self.__factories.keys():
+            registered_factory_type, registered_id = registered_factory_key
+            if registered_id != id or not issubclass(registered_factory_type, factory_type):
+                continue
+            distance = registered_factory_type.__mro__.index(factory_type)
+            if best_factory_key is None or distance <= best_distance:
+                best_factory_key = registered_factory_key
+                best_distance = distance
+        return best_factory_key
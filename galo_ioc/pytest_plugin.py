@@ -0,0 +1,40 @@
+"""
+Pytest fixtures giving each test an isolated fork of a factory container loaded once per session.
+"""
+
+from typing import Callable, Iterator
+
+import pytest
+from galo_ioc import FactoryContainerImpl
+
+__all__ = [
+    "Loader",
+    "factory_container_loader",
+    "session_factory_container",
+    "factory_container",
+]
+
+
+Loader = Callable[[], None]
+
+
+@pytest.fixture(scope="session")
+def factory_container_loader() -> Loader:
+    return lambda: None
+
+
+@pytest.fixture(scope="session")
+def session_factory_container(factory_container_loader: Loader) -> Iterator[FactoryContainerImpl]:
+    session_factory_container = FactoryContainerImpl()
+    with session_factory_container:
+        factory_container_loader()
+        yield session_factory_container
+
+
+@pytest.fixture
+def factory_container(
+    session_factory_container: FactoryContainerImpl,
+) -> Iterator[FactoryContainerImpl]:
+    factory_container = session_factory_container.fork()
+    with factory_container:
+        yield factory_container
@@ -0,0 +1,156 @@
+"""
+Factory containers with per-tenant overrides over a shared set of factories.
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Type
+
+from galo_ioc import (
+    Args,
+    Factory,
+    FactoryAlreadyAddedException,
+    FactoryContainerContextManager,
+    FactoryContainerImpl,
+    FactoryDecorator,
+    FactoryKey,
+    FactoryNotFoundException,
+    FactoryType,
+    KwArgs,
+    T,
+    check_factory_type,
+    decorate_factory,
+)
+
+__all__ = [
+    "TenantFactoryContainerOverlay",
+    "TenantFactoryContainer",
+    "get_tenant_id",
+    "use_tenant",
+]
+
+
+tenant_id_var: ContextVar[Optional[str]] = ContextVar("tenant_id", default=None)
+
+
+def get_tenant_id() -> Optional[str]:
+    return tenant_id_var.get()
+
+
+@contextmanager
+def use_tenant(tenant_id: Optional[str]) -> Iterator[None]:
+    token = tenant_id_var.set(tenant_id)
+    try:
+        yield
+    finally:
+        tenant_id_var.reset(token)
+
+
+class TenantFactoryContainerOverlay(FactoryContainerContextManager):
+    def __init__(self, factory_decorators: Sequence[FactoryDecorator]) -> None:
+        super().__init__()
+        self.__factories: Dict[FactoryKey, Factory] = {}
+        self.__factory_decorators: List[FactoryDecorator] = list(factory_decorators)
+
+    def __len__(self) -> int:
+        return len(self.__factories)
+
+    def add_factory(self, factory_type: Type[T], factory: T, id: Optional[str] = None) -> None:
+        factory_key = FactoryKey(factory_type, id)
+        if factory_key in self.__factories:
+            raise FactoryAlreadyAddedException(factory_type, id)
+        check_factory_type(factory_type)
+        for factory_decorator in self.__factory_decorators:
+            factory = decorate_factory(factory_decorator, factory_type, id, factory)  # type: ignore
+        self.__factories[factory_key] = factory  # type: ignore
+
+    def add_factory_decorator(self, factory_decorator: FactoryDecorator) -> None:
+        for factory_key, factory in self.__factories.items():
+            factory_type, id = factory_key
+            self.__factories[factory_key] = decorate_factory(
+                factory_decorator, factory_type, id, factory
+            )
+        self.__factory_decorators.append(factory_decorator)
+
+    def call_factory(
+        self,
+        factory_type: FactoryType,
+        id: Optional[str],
+        args: Args,
+        kwargs: KwArgs,
+    ) -> Any:
+        return self.resolve_factory(factory_type, id)(*args, **kwargs)
+
+    def resolve_factory(self, factory_type: FactoryType, id: Optional[str]) -> Factory:
+        try:
+            return self.__factories[(factory_type, id)]  # type: ignore
+        except KeyError:
+            raise FactoryNotFoundException(factory_type, id) from None
+
+    def find_factory(self, factory_type: FactoryType, id: Optional[str]) -> Optional[Factory]:
+        return self.__factories.get((factory_type, id))  # type: ignore
+
+
+class TenantFactoryContainer(FactoryContainerImpl):
+    def __init__(
+        self,
+        load_tenant: Callable[[str], None],
+        max_overlay_factories: int = 100000,
+    ) -> None:
+        super().__init__()
+        self.__load_tenant = load_tenant
+        self.__max_overlay_factories = max_overlay_factories
+        self.__factory_decorators: List[FactoryDecorator] = []
+        self.__overlays: "OrderedDict[str, TenantFactoryContainerOverlay]" = OrderedDict()
+        self.__overlay_factory_count = 0
+
+    @property
+    def overlay_factory_count(self) -> int:
+        return self.__overlay_factory_count
+
+    def get_loaded_tenant_ids(self) -> List[str]:
+        return list(self.__overlays.keys())
+
+    def add_factory_decorator(self, factory_decorator: FactoryDecorator) -> None:
+        super().add_factory_decorator(factory_decorator)
+        self.__factory_decorators.append(factory_decorator)
+        for overlay in self.__overlays.values():
+            overlay.add_factory_decorator(factory_decorator)
+
+    def resolve_factory(self, factory_type: FactoryType, id: Optional[str]) -> Factory:
+        tenant_id = tenant_id_var.get()
+        if tenant_id is not None:
+            factory = self.__get_overlay(tenant_id).find_factory(factory_type, id)
+            if factory is not None:
+                return factory
+        return super().resolve_factory(factory_type, id)
+
+    def evict_tenant(self, tenant_id: str) -> None:
+        try:
+            overlay = self.__overlays.pop(tenant_id)
+        except KeyError:
+            return
+        self.__overlay_factory_count -= len(overlay)
+
+    def __get_overlay(self, tenant_id: str) -> TenantFactoryContainerOverlay:
+        try:
+            overlay = self.__overlays[tenant_id]
+        except KeyError:
+            overlay = self.__create_overlay(tenant_id)
+        else:
+            self.__overlays.move_to_end(tenant_id)
+        return overlay
+
+    def __create_overlay(self, tenant_id: str) -> TenantFactoryContainerOverlay:
+        overlay = TenantFactoryContainerOverlay(self.__factory_decorators)
+        with use_tenant(None), overlay:
+            self.__load_tenant(tenant_id)
+        self.__overlays[tenant_id] = overlay
+        self.__overlay_factory_count += len(overlay)
+        while self.__overlay_factory_count > self.__max_overlay_factories:
+            evicted_tenant_id = next(iter(self.__overlays))
+            if evicted_tenant_id == tenant_id:
+                break
+            self.evict_tenant(evicted_tenant_id)
+        return overlay
@@ -0,0 +1,273 @@
+"""
+Opt-in recording of factory resolutions for diagnosing slow lookups and startup.
+"""
+
+import json
+import os
+from contextvars import ContextVar, Token
+from random import random
+from threading import get_ident
+from time import perf_counter
+from types import TracebackType
+from typing import Any, Dict, List, NamedTuple, Optional, Type
+
+from galo_ioc import (
+    FactoryContainer,
+    FactoryDecorator,
+    FactoryType,
+    ResolutionTracer,
+    resolution_tracer_var,
+)
+
+__all__ = [
+    "TraceProbe",
+    "TraceDecoration",
+    "TraceNode",
+    "TraceRecorder",
+]
+
+
+def get_qualified_name(value: Any) -> str:
+    qualified_name = getattr(value, "__qualname__", None)
+    if qualified_name is None:
+        return get_qualified_name(type(value))
+    return f"{getattr(value, '__module__', None)}.{qualified_name}"
+
+
+def get_factory_container_name(factory_container: FactoryContainer) -> str:
+    return f"{type(factory_container).__qualname__}@{id(factory_container):#x}"
+
+
+class TraceProbe(NamedTuple):
+    factory_container: str
+    found: bool
+    duration: float
+
+
+class TraceDecoration(NamedTuple):
+    factory_type: str
+    id: Optional[str]
+    factory_decorator: str
+    start: float
+    duration: float
+    thread_id: int
+
+
+class TraceNode:
+    __slots__ = (
+        "factory_type",
+        "id",
+        "start",
+        "duration",
+        "thread_id",
+        "probes",
+        "factory_decorators",
+        "exception",
+        "children",
+    )
+
+    def __init__(self, factory_type: str, id: Optional[str], start: float) -> None:
+        self.factory_type = factory_type
+        self.id = id
+        self.start = start
+        self.duration = 0.0
+        self.thread_id = get_ident()
+        self.probes: List[TraceProbe] = []
+        self.factory_decorators: List[str] = []
+        self.exception: Optional[str] = None
+        self.children: List["TraceNode"] = []
+
+    @property
+    def misses(self) -> int:
+        return sum(1 for probe in self.probes if not probe.found)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "factory_type": self.factory_type,
+            "id": self.id,
+            "start": self.start,
+            "duration": self.duration,
+            "thread_id": self.thread_id,
+            "misses": self.misses,
+            "probes": [probe._asdict() for probe in self.probes],
+            "factory_decorators": list(self.factory_decorators),
+            "exception": self.exception,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+unsampled_trace_node = TraceNode("<unsampled>", None, 0.0)
+
+
+class Resolution(NamedTuple):
+    factory_type: FactoryType
+    node: TraceNode
+    token: Token
+
+
+class TraceRecorder(ResolutionTracer):
+    def __init__(self, sample_rate: float = 1.0, max_traces: int = 10000) -> None:
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError(f"Invalid sample rate: sample_rate={sample_rate!r}.")
+        self.__sample_rate = sample_rate
+        self.__max_traces = max_traces
+        self.__origin = perf_counter()
+        self.__current_node_var: ContextVar[Optional[TraceNode]] = ContextVar(
+            "trace_recorder_current_node", default=None
+        )
+        self.__token: Optional[Token[Optional[ResolutionTracer]]] = None
+        self.traces: List[TraceNode] = []
+        self.decorations: List[TraceDecoration] = []
+        self.dropped_traces = 0
+        self.dropped_decorations = 0
+
+    def __enter__(self) -> "TraceRecorder":
+        self.__token = resolution_tracer_var.set(self)
+        return self
+
+    def __exit__(
+        self,
+        exception_type: Optional[Type[BaseException]],
+        exception: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if self.__token is not None:
+            resolution_tracer_var.reset(self.__token)
+            self.__token = None
+
+    def start_resolution(self, factory_type: FactoryType, id: Optional[str]) -> Resolution:
+        parent = self.__current_node_var.get()
+        if parent is unsampled_trace_node:
+            node = unsampled_trace_node
+        elif parent is not None:
+            node = TraceNode(get_qualified_name(factory_type), id, self.__now())
+            parent.children.append(node)
+        elif random() >= self.__sample_rate:  # nosec
+            node = unsampled_trace_node
+        elif len(self.traces) >= self.__max_traces:
+            self.dropped_traces += 1
+            node = unsampled_trace_node
+        else:
+            node = TraceNode(get_qualified_name(factory_type), id, self.__now())
+            self.traces.append(node)
+        return Resolution(factory_type, node, self.__current_node_var.set(node))
+
+    def record_probe(
+        self,
+        resolution: Resolution,
+        factory_container: FactoryContainer,
+        found: bool,
+        duration: float,
+    ) -> None:
+        node = resolution.node
+        if node is unsampled_trace_node:
+            return
+        node.probes.append(
+            TraceProbe(get_factory_container_name(factory_container), found, duration)
+        )
+        if found:
+            try:
+                factory_decorators = factory_container.get_factory_decorators(
+                    resolution.factory_type, node.id
+                )
+            except Exception:
+                return
+            node.factory_decorators = [get_qualified_name(d) for d in factory_decorators]
+
+    def finish_resolution(
+        self,
+        resolution: Resolution,
+        exception: Optional[BaseException],
+    ) -> None:
+        self.__current_node_var.reset(resolution.token)
+        node = resolution.node
+        if node is unsampled_trace_node:
+            return
+        node.duration = self.__now() - node.start
+        if exception is not None:
+            node.exception = repr(exception)
+
+    def record_decoration(
+        self,
+        factory_type: FactoryType,
+        id: Optional[str],
+        factory_decorator: FactoryDecorator,
+        duration: float,
+    ) -> None:
+        if random() >= self.__sample_rate:  # nosec
+            return
+        if len(self.decorations) >= self.__max_traces:
+            self.dropped_decorations += 1
+            return
+        self.decorations.append(
+            TraceDecoration(
+                factory_type=get_qualified_name(factory_type),
+                id=id,
+                factory_decorator=get_qualified_name(factory_decorator),
+                start=self.__now() - duration,
+                duration=duration,
+                thread_id=get_ident(),
+            )
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "traces": [node.to_dict() for node in self.traces],
+            "decorations": [decoration._asdict() for decoration in self.decorations],
+            "dropped_traces": self.dropped_traces,
+            "dropped_decorations": self.dropped_decorations,
+        }
+
+    def to_chrome_trace_events(self) -> List[Dict[str, Any]]:
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+
+        def add_node_events(node: TraceNode) -> None:
+            events.append(
+                {
+                    "name": node.factory_type,
+                    "cat": "resolution",
+                    "ph": "X",
+                    "ts": node.start * 1e6,
+                    "dur": node.duration * 1e6,
+                    "pid": pid,
+                    "tid": node.thread_id,
+                    "args": {
+                        "id": node.id,
+                        "misses": node.misses,
+                        "probes": [probe._asdict() for probe in node.probes],
+                        "factory_decorators": node.factory_decorators,
+                        "exception": node.exception,
+                    },
+                }
+            )
+            for child in node.children:
+                add_node_events(child)
+
+        for node in self.traces:
+            add_node_events(node)
+        for decoration in self.decorations:
+            events.append(
+                {
+                    "name": decoration.factory_decorator,
+                    "cat": "decoration",
+                    "ph": "X",
+                    "ts": decoration.start * 1e6,
+                    "dur": decoration.duration * 1e6,
+                    "pid": pid,
+                    "tid": decoration.thread_id,
+                    "args": {"factory_type": decoration.factory_type, "id": decoration.id},
+                }
+            )
+        return events
+
+    def export_json(self, path: str) -> None:
+        with open(path, mode="w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def export_chrome_trace(self, path: str) -> None:
+        with open(path, mode="w") as file:
+            json.dump({"traceEvents": self.to_chrome_trace_events()}, file)
+
+    def __now(self) -> float:
+        return perf_counter() - self.__origin
@@ -2,6 +2,6 @@
 
 set -x
 
-autoflake --remove-all-unused-imports --recursive --remove-unused-variables --in-place galo_ioc examples tests
-black galo_ioc examples tests
-isort galo_ioc examples tests
+autoflake --remove-all-unused-imports --recursive --remove-unused-variables --in-place galo_ioc examples tests benchmarks
+black galo_ioc examples tests benchmarks
+isort galo_ioc examples tests benchmarks
@@ -4,7 +4,7 @@ set -x
 set -e
 
 mypy galo_ioc tests
-flake8 galo_ioc examples tests
-black galo_ioc examples tests --check
-isort galo_ioc examples tests --check-only
+flake8 galo_ioc examples tests benchmarks
+black galo_ioc examples tests benchmarks --check
+isort galo_ioc examples tests benchmarks --check-only
 bandit galo_ioc -r
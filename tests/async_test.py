@@ -0,0 +1,150 @@
+from asyncio import gather, run, sleep
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, List, Optional
+
+import pytest
+from galo_ioc import (
+    AsyncHook,
+    FactoryContainerImpl,
+    add_async_hook,
+    add_factory,
+    create_task_with_factory_containers,
+    get_factory,
+    get_factory_containers,
+)
+
+
+class NameFactory:
+    def __call__(self) -> str:
+        raise NotImplementedError()
+
+
+class ConstantNameFactory(NameFactory):
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __call__(self) -> str:
+        return self.name
+
+
+def test_async_hooks_run_concurrently() -> None:
+    events: List[str] = []
+
+    def create_async_hook(name: str, delay: float) -> AsyncHook:
+        @asynccontextmanager
+        async def async_hook() -> AsyncIterator[None]:
+            events.append(f"enter {name} {get_factory(NameFactory)()}")
+            await sleep(delay)
+            yield
+            events.append(f"exit {name}")
+
+        return async_hook
+
+    async def main() -> None:
+        container = FactoryContainerImpl()
+        with container:
+            add_factory(NameFactory, ConstantNameFactory("Maria"))
+            add_async_hook(create_async_hook("slow", 0.02), concurrent=True)
+            add_async_hook(create_async_hook("fast", 0.0), concurrent=True)
+        async with container:
+            events.append("body")
+            assert get_factory(NameFactory)() == "Maria"
+        assert get_factory_containers() == ()
+
+    run(main())
+    assert events == [
+        "enter slow Maria",
+        "enter fast Maria",
+        "body",
+        "exit slow",
+        "exit fast",
+    ]
+
+
+def test_async_hooks_run_sequentially_in_caller_context() -> None:
+    events: List[str] = []
+    name_var: ContextVar[Optional[str]] = ContextVar("name", default=None)
+
+    def create_async_hook(name: str) -> AsyncHook:
+        @asynccontextmanager
+        async def async_hook() -> AsyncIterator[None]:
+            events.append(f"enter {name} {name_var.get()}")
+            token = name_var.set(name)
+            try:
+                yield
+            finally:
+                name_var.reset(token)
+                events.append(f"exit {name}")
+
+        return async_hook
+
+    async def main() -> None:
+        container = FactoryContainerImpl()
+        container.add_async_hook(create_async_hook("first"))
+        container.add_async_hook(create_async_hook("second"))
+        async with container:
+            events.append(f"body {name_var.get()}")
+        assert name_var.get() is None
+
+    run(main())
+    assert events == [
+        "enter first None",
+        "enter second first",
+        "body second",
+        "exit second",
+        "exit first",
+    ]
+
+
+def test_failed_async_hook_exits_entered_hooks() -> None:
+    events: List[str] = []
+
+    @asynccontextmanager
+    async def async_hook() -> AsyncIterator[None]:
+        events.append("enter")
+        try:
+            yield
+        finally:
+            events.append("exit")
+
+    @asynccontextmanager
+    async def failing_async_hook() -> AsyncIterator[None]:
+        raise RuntimeError()
+        yield
+
+    async def main() -> None:
+        container = FactoryContainerImpl()
+        container.add_async_hook(async_hook)
+        container.add_async_hook(failing_async_hook)
+        with pytest.raises(RuntimeError):
+            async with container:
+                events.append("body")
+        assert get_factory_containers() == ()
+
+    run(main())
+    assert events == ["enter", "exit"]
+
+
+def test_create_task_with_factory_containers() -> None:
+    async def get_name() -> str:
+        return get_factory(NameFactory)()
+
+    async def main() -> None:
+        with FactoryContainerImpl():
+            add_factory(NameFactory, ConstantNameFactory("Maria"))
+            base_factory_containers = get_factory_containers()
+            container = FactoryContainerImpl()
+            with container:
+                add_factory(NameFactory, ConstantNameFactory("Ivan"))
+            factory_containers = (*base_factory_containers, container)
+
+        assert get_factory_containers() == ()
+        names = await gather(
+            create_task_with_factory_containers(get_name(), base_factory_containers),
+            create_task_with_factory_containers(get_name(), factory_containers),
+        )
+        assert names == ["Maria", "Ivan"]
+        assert get_factory_containers() == ()
+
+    run(main())
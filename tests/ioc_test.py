@@ -5,13 +5,16 @@ import pytest
 from galo_ioc import (
     Factory,
     FactoryAlreadyAddedException,
+    FactoryContainerContextManager,
     FactoryContainerImpl,
     FactoryNotFoundException,
     FactoryType,
     NoFactoryContainerInContextException,
+    add_exit_callback,
     add_factory,
     add_factory_decorator,
     get_factory,
+    get_factory_containers,
 )
 
 
@@ -154,3 +157,171 @@ def test_factory_type_with_illegal_attributes() -> None:
     with FactoryContainerImpl():
         with pytest.raises(Exception):
             add_factory(FactoryWithIllegalAttributes, FactoryWithIllegalAttributes())
+
+
+def test_factory_proxy_forwards_arguments() -> None:
+    class OptionalArgumentsFactory:
+        def __call__(self, a: int, /, b: int, c: int = 3, *, d: int, e: int = 5) -> Any:
+            raise NotImplementedError()
+
+    class OptionalArgumentsFactoryImpl(OptionalArgumentsFactory):
+        def __init__(self) -> None:
+            self.mock = Mock()
+
+        def __call__(self, a: int, /, b: int, c: int = 30, *, d: int, e: int = 50) -> Any:
+            self.mock(a, b, c, d=d, e=e)
+
+    factory = OptionalArgumentsFactoryImpl()
+    with FactoryContainerImpl():
+        add_factory(OptionalArgumentsFactory, factory)
+        proxy = get_factory(OptionalArgumentsFactory)
+        proxy(1, 2, d=4)
+        proxy(1, b=2, d=4)
+        proxy(1, 2, 3, d=4)
+        proxy(1, 2, c=3, d=4, e=5)
+        proxy(1, 2, d=4, e=5)
+        with pytest.raises(TypeError):
+            proxy(1, 2)  # type: ignore
+
+    assert factory.mock.call_args_list == [
+        call(1, 2, 30, d=4, e=50),
+        call(1, 2, 30, d=4, e=50),
+        call(1, 2, 3, d=4, e=50),
+        call(1, 2, 3, d=4, e=5),
+        call(1, 2, 30, d=4, e=5),
+    ]
+
+
+def test_factory_proxy_with_variadic_arguments() -> None:
+    class VariadicFactory:
+        def __call__(self, *args: int, **kwargs: int) -> Any:
+            raise NotImplementedError()
+
+    class IdFactory:
+        def __call__(self, id: str, galo_ioc_id: str) -> Any:
+            raise NotImplementedError()
+
+    variadic_factory = Mock()
+    id_factory = Mock()
+    with FactoryContainerImpl():
+        add_factory(VariadicFactory, variadic_factory)
+        add_factory(IdFactory, id_factory)
+        get_factory(VariadicFactory)(1, 2, a=3)
+        get_factory(IdFactory)("a", galo_ioc_id="b")
+
+    variadic_factory.assert_called_once_with(1, 2, a=3)
+    id_factory.assert_called_once_with("a", galo_ioc_id="b")
+
+
+def test_factory_proxy_with_id() -> None:
+    test_factory1 = TestFactoryImpl()
+    test_factory2 = TestFactoryImpl(Mock(side_effect=lambda a, b: a * b))
+    with FactoryContainerImpl():
+        add_factory(TestFactory, test_factory1)
+        add_factory(TestFactory, test_factory2, "product")
+        assert get_factory(TestFactory)(2, 3) == 5
+        assert get_factory(TestFactory, "product")(2, 3) == 6
+        assert isinstance(get_factory(TestFactory), TestFactory)
+
+
+def test_resolve_subclasses() -> None:
+    class SpecificTestFactory(TestFactory):
+        def __call__(self, a: int, b: int) -> int:
+            raise NotImplementedError()
+
+    class MoreSpecificTestFactory(SpecificTestFactory):
+        def __call__(self, a: int, b: int) -> int:
+            raise NotImplementedError()
+
+    specific_factory = TestFactoryImpl()
+    more_specific_factory = TestFactoryImpl(Mock(side_effect=lambda a, b: a * b))
+
+    with FactoryContainerImpl():
+        add_factory(SpecificTestFactory, specific_factory)
+        with pytest.raises(FactoryNotFoundException):
+            get_factory(TestFactory)(2, 3)
+
+    with FactoryContainerImpl(resolve_subclasses=True):
+        with pytest.raises(FactoryNotFoundException):
+            get_factory(TestFactory)(2, 3)
+        add_factory(MoreSpecificTestFactory, more_specific_factory)
+        assert get_factory(TestFactory)(2, 3) == 6
+        add_factory(SpecificTestFactory, specific_factory)
+        assert get_factory(TestFactory)(2, 3) == 5
+        assert get_factory(SpecificTestFactory)(2, 3) == 5
+        assert get_factory(MoreSpecificTestFactory)(2, 3) == 6
+        with pytest.raises(FactoryNotFoundException):
+            get_factory(TestFactory, "product")(2, 3)
+
+
+def test_exit_callbacks() -> None:
+    mock = Mock()
+    with pytest.raises(ValueError):
+        with FactoryContainerImpl():
+            add_exit_callback(lambda: mock("first"))
+            add_exit_callback(Mock(side_effect=ValueError()))
+            add_exit_callback(lambda: mock("last"))
+    assert mock.call_args_list == [call("last"), call("first")]
+    assert get_factory_containers() == ()
+
+
+def test_fork() -> None:
+    test_factory1 = TestFactoryImpl()
+    test_factory2 = TestFactoryImpl(Mock(side_effect=lambda a, b: a * b))
+    mock = Mock()
+    factory_container = FactoryContainerImpl()
+    with factory_container:
+        add_factory(TestFactory, test_factory1)
+        add_exit_callback(lambda: mock("factory_container"))
+
+    with factory_container.fork():
+        assert get_factory(TestFactory)(2, 3) == 5
+        add_factory(TestFactory, test_factory2, "product")
+        add_factory_decorator(lambda factory_type, id, factory: lambda a, b: factory(a, b) + 1)
+        add_exit_callback(lambda: mock("fork"))
+        assert get_factory(TestFactory)(2, 3) == 6
+        assert get_factory(TestFactory, "product")(2, 3) == 7
+    assert mock.call_args_list == [call("factory_container"), call("fork")]
+
+    with factory_container:
+        assert get_factory(TestFactory)(2, 3) == 5
+        with pytest.raises(FactoryNotFoundException):
+            get_factory(TestFactory, "product")(2, 3)
+        assert factory_container.get_factory_decorators(TestFactory, None) == ()
+
+
+def test_factory_container_with_call_factory_only() -> None:
+    class CallFactoryContainer(FactoryContainerContextManager):
+        def call_factory(
+            self,
+            factory_type: FactoryType,
+            id: Optional[str],
+            args: Any,
+            kwargs: Any,
+        ) -> Any:
+            return sum(args) * 10
+
+    with CallFactoryContainer():
+        assert get_factory(TestFactory)(2, 3) == 50
+
+
+def test_call_factory_only_container_falls_through_to_outer_container() -> None:
+    class CallFactoryContainer(FactoryContainerContextManager):
+        def call_factory(
+            self,
+            factory_type: FactoryType,
+            id: Optional[str],
+            args: Any,
+            kwargs: Any,
+        ) -> Any:
+            if id != "product":
+                raise FactoryNotFoundException(factory_type, id)
+            return args[0] * args[1]
+
+    with FactoryContainerImpl():
+        add_factory(TestFactory, TestFactoryImpl())
+        with CallFactoryContainer():
+            assert get_factory(TestFactory)(2, 3) == 5
+            assert get_factory(TestFactory, "product")(2, 3) == 6
+            with pytest.raises(FactoryNotFoundException):
+                get_factory(TestFactory, "other")(2, 3)
@@ -0,0 +1,62 @@
+import pytest
+
+pytest_plugins = ["pytester"]
+
+
+def test_factory_container_fixtures(pytester: pytest.Pytester) -> None:
+    pytester.makeconftest(
+        """
+        from typing import List
+
+        import pytest
+        from galo_ioc import add_exit_callback, add_factory
+        from galo_ioc.pytest_plugin import Loader
+
+        loads: List[str] = []
+
+
+        class NameFactory:
+            def __call__(self) -> str:
+                raise NotImplementedError()
+
+
+        class ConstantNameFactory(NameFactory):
+            def __init__(self, name: str) -> None:
+                self.name = name
+
+            def __call__(self) -> str:
+                return self.name
+
+
+        @pytest.fixture(scope="session")
+        def factory_container_loader() -> Loader:
+            def load() -> None:
+                loads.append("load")
+                add_factory(NameFactory, ConstantNameFactory("Maria"))
+                add_exit_callback(lambda: loads.append("exit"))
+
+            return load
+        """
+    )
+    pytester.makepyfile(
+        """
+        import pytest
+        from conftest import ConstantNameFactory, NameFactory, loads
+        from galo_ioc import FactoryAlreadyAddedException, add_factory, get_factory
+
+
+        def test_first(factory_container) -> None:
+            assert get_factory(NameFactory)() == "Maria"
+            add_factory(NameFactory, ConstantNameFactory("Olga"), "other")
+
+
+        def test_second(factory_container) -> None:
+            assert get_factory(NameFactory)() == "Maria"
+            add_factory(NameFactory, ConstantNameFactory("Olga"), "other")
+            with pytest.raises(FactoryAlreadyAddedException):
+                add_factory(NameFactory, ConstantNameFactory("Olga"))
+            assert loads == ["load"]
+        """
+    )
+    result = pytester.runpytest("-p", "no:galo_ioc", "-p", "galo_ioc.pytest_plugin")
+    result.assert_outcomes(passed=2)
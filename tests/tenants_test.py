@@ -0,0 +1,97 @@
+from typing import List, Optional
+
+from galo_ioc import (
+    Factory,
+    FactoryType,
+    add_factory,
+    add_factory_decorator,
+    get_factory,
+)
+from galo_ioc.tenants import TenantFactoryContainer, get_tenant_id, use_tenant
+
+
+class GreetingFactory:
+    def __call__(self) -> str:
+        raise NotImplementedError()
+
+
+class NameFactory:
+    def __call__(self) -> str:
+        raise NotImplementedError()
+
+
+class ConstantGreetingFactory(GreetingFactory):
+    def __init__(self, greeting: str) -> None:
+        self.greeting = greeting
+
+    def __call__(self) -> str:
+        return self.greeting
+
+
+class ConstantNameFactory(NameFactory):
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __call__(self) -> str:
+        return self.name
+
+
+def create_container(loaded_tenant_ids: List[str], **kwargs: int) -> TenantFactoryContainer:
+    def load_tenant(tenant_id: str) -> None:
+        loaded_tenant_ids.append(tenant_id)
+        if tenant_id.startswith("russian"):
+            name = get_factory(NameFactory)()
+            add_factory(GreetingFactory, ConstantGreetingFactory(f"С днем рождения, {name}!"))
+
+    return TenantFactoryContainer(load_tenant, **kwargs)
+
+
+def test_tenant_overrides_base_factories() -> None:
+    loaded_tenant_ids: List[str] = []
+    with create_container(loaded_tenant_ids):
+        add_factory(GreetingFactory, ConstantGreetingFactory("Happy birthday!"))
+        add_factory(NameFactory, ConstantNameFactory("Maria"))
+        assert get_factory(GreetingFactory)() == "Happy birthday!"
+        with use_tenant("russian"):
+            assert get_tenant_id() == "russian"
+            assert get_factory(GreetingFactory)() == "С днем рождения, Maria!"
+            assert get_factory(NameFactory)() == "Maria"
+        with use_tenant("english"):
+            assert get_factory(GreetingFactory)() == "Happy birthday!"
+        with use_tenant("russian"):
+            get_factory(GreetingFactory)()
+        assert get_tenant_id() is None
+
+    assert loaded_tenant_ids == ["russian", "english"]
+
+
+def test_tenant_overlays_are_evicted() -> None:
+    loaded_tenant_ids: List[str] = []
+    container = create_container(loaded_tenant_ids, max_overlay_factories=2)
+    with container:
+        add_factory(GreetingFactory, ConstantGreetingFactory("Happy birthday!"))
+        add_factory(NameFactory, ConstantNameFactory("Maria"))
+        for tenant_id in ["russian-1", "russian-2", "russian-1", "russian-3", "russian-2"]:
+            with use_tenant(tenant_id):
+                get_factory(GreetingFactory)()
+
+    assert loaded_tenant_ids == ["russian-1", "russian-2", "russian-3", "russian-2"]
+    assert container.get_loaded_tenant_ids() == ["russian-3", "russian-2"]
+    assert container.overlay_factory_count == 2
+
+
+def test_base_factory_decorators_apply_to_tenant_factories() -> None:
+    def factory_decorator(
+        factory_type: FactoryType,
+        id: Optional[str],
+        factory: Factory,
+    ) -> Factory:
+        if not issubclass(factory_type, GreetingFactory):
+            return factory
+        return lambda: factory().upper()
+
+    with create_container([]):
+        add_factory(NameFactory, ConstantNameFactory("Maria"))
+        add_factory_decorator(factory_decorator)
+        with use_tenant("russian"):
+            assert get_factory(GreetingFactory)() == "С ДНЕМ РОЖДЕНИЯ, MARIA!"
@@ -0,0 +1,163 @@
+import json
+from pathlib import Path
+from typing import Optional
+
+from galo_ioc import (
+    Factory,
+    FactoryContainerImpl,
+    FactoryNotFoundException,
+    FactoryType,
+    add_factory,
+    add_factory_decorator,
+    get_factory,
+)
+from galo_ioc.tracing import TraceRecorder
+
+
+class NumberFactory:
+    def __call__(self) -> int:
+        raise NotImplementedError()
+
+
+class SumFactory:
+    def __call__(self, a: int, b: int) -> int:
+        raise NotImplementedError()
+
+
+class NumberFactoryImpl(NumberFactory):
+    def __call__(self) -> int:
+        return 1
+
+
+class SumFactoryImpl(SumFactory):
+    def __call__(self, a: int, b: int) -> int:
+        return a + b + get_factory(NumberFactory)()
+
+
+def identity_decorator(factory_type: FactoryType, id: Optional[str], factory: Factory) -> Factory:
+    if not issubclass(factory_type, SumFactory):
+        return factory
+
+    def wrapper(a: int, b: int) -> int:
+        return factory(a, b)
+
+    return wrapper
+
+
+def test_records_nested_resolutions() -> None:
+    with FactoryContainerImpl():
+        add_factory(NumberFactory, NumberFactoryImpl())
+        with FactoryContainerImpl():
+            add_factory(SumFactory, SumFactoryImpl())
+            with TraceRecorder() as recorder:
+                assert get_factory(SumFactory)(1, 2) == 4
+
+    assert len(recorder.traces) == 1
+    root = recorder.traces[0]
+    assert root.factory_type.endswith("SumFactory")
+    assert root.misses == 0
+    assert [probe.found for probe in root.probes] == [True]
+    assert len(root.children) == 1
+    child = root.children[0]
+    assert child.factory_type.endswith("NumberFactory")
+    assert child.misses == 1
+    assert [probe.found for probe in child.probes] == [False, True]
+    assert root.start <= child.start
+    assert child.duration <= root.duration
+
+
+def test_records_factory_not_found() -> None:
+    with FactoryContainerImpl(), TraceRecorder() as recorder:
+        try:
+            get_factory(NumberFactory)()
+        except FactoryNotFoundException:
+            pass
+
+    assert len(recorder.traces) == 1
+    assert recorder.traces[0].misses == 1
+    assert recorder.traces[0].exception is not None
+
+
+def test_records_factory_decorators() -> None:
+    with FactoryContainerImpl(), TraceRecorder() as recorder:
+        add_factory(SumFactory, SumFactoryImpl())
+        add_factory(NumberFactory, NumberFactoryImpl())
+        add_factory_decorator(identity_decorator)
+        get_factory(SumFactory)(1, 2)
+        get_factory(NumberFactory)()
+
+    assert len(recorder.decorations) == 2
+    assert recorder.decorations[0].factory_decorator.endswith("identity_decorator")
+    sum_trace, number_trace = recorder.traces
+    assert sum_trace.factory_decorators == [recorder.decorations[0].factory_decorator]
+    assert number_trace.factory_decorators == []
+
+
+def test_records_factory_decorators_of_resolved_subclass() -> None:
+    class SumFactorySubclass(SumFactory):
+        pass
+
+    with FactoryContainerImpl(resolve_subclasses=True), TraceRecorder() as recorder:
+        add_factory(SumFactorySubclass, SumFactoryImpl())
+        add_factory(NumberFactory, NumberFactoryImpl())
+        add_factory_decorator(identity_decorator)
+        get_factory(SumFactory)(1, 2)
+
+    assert recorder.traces[0].factory_decorators == [recorder.decorations[0].factory_decorator]
+
+
+def test_decorations_are_bounded() -> None:
+    with FactoryContainerImpl():
+        with TraceRecorder(sample_rate=0.0) as recorder:
+            add_factory(SumFactory, SumFactoryImpl())
+            add_factory_decorator(identity_decorator)
+        assert recorder.decorations == []
+
+        with TraceRecorder(max_traces=1) as recorder:
+            add_factory_decorator(identity_decorator)
+            add_factory_decorator(identity_decorator)
+        assert len(recorder.decorations) == 1
+        assert recorder.dropped_decorations == 1
+
+
+def test_sampling() -> None:
+    with FactoryContainerImpl():
+        add_factory(NumberFactory, NumberFactoryImpl())
+        add_factory(SumFactory, SumFactoryImpl())
+        with TraceRecorder(sample_rate=0.0) as recorder:
+            get_factory(SumFactory)(1, 2)
+        assert recorder.traces == []
+
+        with TraceRecorder(max_traces=1) as recorder:
+            get_factory(SumFactory)(1, 2)
+            get_factory(SumFactory)(1, 2)
+        assert len(recorder.traces) == 1
+        assert len(recorder.traces[0].children) == 1
+        assert recorder.dropped_traces == 1
+
+
+def test_recorder_is_inactive_after_exit() -> None:
+    with FactoryContainerImpl():
+        add_factory(NumberFactory, NumberFactoryImpl())
+        with TraceRecorder() as recorder:
+            pass
+        get_factory(NumberFactory)()
+    assert recorder.traces == []
+
+
+def test_export(tmp_path: Path) -> None:
+    with FactoryContainerImpl():
+        add_factory(NumberFactory, NumberFactoryImpl())
+        add_factory(SumFactory, SumFactoryImpl())
+        with TraceRecorder() as recorder:
+            get_factory(SumFactory)(1, 2)
+
+    json_path = tmp_path / "trace.json"
+    recorder.export_json(str(json_path))
+    content = json.loads(json_path.read_text())
+    assert len(content["traces"][0]["children"]) == 1
+
+    chrome_trace_path = tmp_path / "chrome_trace.json"
+    recorder.export_chrome_trace(str(chrome_trace_path))
+    events = json.loads(chrome_trace_path.read_text())["traceEvents"]
+    assert [event["ph"] for event in events] == ["X", "X"]